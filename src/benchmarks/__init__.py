@@ -0,0 +1,4 @@
+"""Benchmarks of the format, split and send pipeline.
+
+Run `python -m benchmarks` from the `src` directory. See `benchmarks/__main__.py` for options.
+"""
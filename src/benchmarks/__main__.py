@@ -0,0 +1,98 @@
+"""Run the benchmark suite.
+
+Run from the `src` directory:
+
+```bash
+python -m benchmarks --output results.json
+python -m benchmarks --compare baseline.json
+python -m benchmarks --compare baseline.json results.json
+```
+
+Options:
+- `--quick` - fewer input sizes and calls, for a smoke check;
+- `--filter` - run only the benchmarks whose name contains the substring;
+- `--repeat` - the number of measured samples of each benchmark;
+- `--threshold` - the relative slowdown reported as a regression by `--compare`.
+
+With `--compare`, the exit code is `1` if any benchmark regressed.
+"""
+
+import argparse
+from contextlib import ExitStack
+import sys
+from typing import Any
+
+from . import escapers, formatters, pipeline, splitters
+from .runner import compare_results, format_results, load_results, measure, save_results
+
+
+SUITES = {
+    'escapers': escapers.suite,
+    'formatters': formatters.suite,
+    'splitters': splitters.suite,
+    'pipeline': pipeline.suite,
+}
+
+
+def run(quick: bool, repeat: int, name_filter: str | None) -> list[dict[str, Any]]:
+    """Run all benchmarks matching the filter and print the progress."""
+
+    results: list[dict[str, Any]] = []
+
+    for suite in SUITES.values():
+        with ExitStack() as stack:
+            benchmarks = stack.enter_context(suite(quick))
+
+            for benchmark in benchmarks:
+                if name_filter is not None and name_filter not in benchmark.name:
+                    continue
+
+                result = measure(benchmark, repeat)
+                results.append(result)
+                print(format_results([result]).splitlines()[1], file=sys.stderr)
+
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.split('\n')[0])
+    parser.add_argument('--output', help='write the results to a JSON file')
+    parser.add_argument(
+        '--compare',
+        nargs = '+',
+        metavar = 'RESULTS',
+        help = 'baseline results file and optionally current results file instead of running',
+    )
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('--filter', dest='name_filter')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args()
+
+    if args.compare is not None and len(args.compare) > 2:
+        parser.error('--compare accepts one or two files')
+
+    if args.compare is not None and len(args.compare) == 2:
+        results = load_results(args.compare[1])
+    else:
+        results = run(args.quick, args.repeat, args.name_filter)
+
+    if args.output is not None:
+        save_results(args.output, results)
+
+    if args.compare is None:
+        print(format_results(results))
+        return 0
+
+    table, regressions = compare_results(load_results(args.compare[0]), results, args.threshold)
+    print(table)
+
+    if regressions:
+        print(f'\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}')
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Throughput of the escape functions compared with `html.escape()`.
+
+`escape.html_stdlib` is the baseline: the previous default escape function of `HtmlFormatter`.
+`escape.markdown_v2_translate` is the previous `str.translate()` implementation of
+`escape_markdown_v2`.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+import html
+
+from markup_tg_logger.escapers import (
+    MARKDOWN_V2_SPECIAL_CHARS,
+    escape_html,
+    escape_markdown,
+    escape_markdown_v2,
+    escape_markdown_v2_code,
+)
+from markup_tg_logger.types import EscapeFunc
+
+from .runner import Benchmark
+
+
+_MARKDOWN_V2_TABLE = str.maketrans({
+    char: '\\' + char for char in MARKDOWN_V2_SPECIAL_CHARS + '\\'
+})
+
+_TRACEBACK_LINE = (
+    '  File "/usr/lib/python3.13/site-packages/package/module.py", line 42, in <func>\n'
+    '    result = function(argument) if argument > 0 else other(argument) & mask\n'
+)
+
+TEXTS = {
+    # Typical log message without special characters.
+    'message_plain': 'Request to the server failed with status 503 and reason Service Unavailable',
+    'message_special': 'Request to <https://example.com/api?a=1&b=2> failed with "503" & retry',
+    'traceback_16kb': (_TRACEBACK_LINE * (16 * 1024 // len(_TRACEBACK_LINE) + 1))[:16 * 1024],
+}
+
+ESCAPE_FUNCS: dict[str, EscapeFunc] = {
+    'html_stdlib': lambda text: html.escape(text, quote=False),
+    'html': escape_html,
+    'markdown': escape_markdown,
+    'markdown_v2_translate': lambda text: text.translate(_MARKDOWN_V2_TABLE),
+    'markdown_v2': escape_markdown_v2,
+    'markdown_v2_code': escape_markdown_v2_code,
+}
+
+
+@contextmanager
+def suite(quick: bool) -> Iterator[list[Benchmark]]:
+    """Benchmarks of each escape function on short messages and a long traceback."""
+
+    number = 2000 if quick else 20000
+
+    benchmarks: list[Benchmark] = []
+    for text_name, text in TEXTS.items():
+        text_number = number // 100 if len(text) > 1024 else number
+
+        for func_name, escape_func in ESCAPE_FUNCS.items():
+            benchmarks.append(
+                Benchmark(
+                    name = f'escape.{func_name}.{text_name}',
+                    func = lambda escape_func=escape_func, text=text: escape_func(text),
+                    number = text_number,
+                    params = {'text': text_name},
+                    bytes_processed = len(text.encode()),
+                )
+            )
+
+    yield benchmarks
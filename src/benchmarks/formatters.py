@@ -0,0 +1,111 @@
+"""Throughput of the formatters.
+
+`logging.Formatter` caches the traceback in the log record, so every call formats a fresh copy of
+the record to measure the traceback formatting. The cost of copying is the same for all formatters
+and is included in the `formatter.logging` baseline. The shared traceback cache of the library
+formatters is cleared before every call, except for `traceback_storm`, which measures logging the
+same exception repeatedly.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+import logging
+import sys
+from typing import Any
+
+from markup_tg_logger import HtmlFormatter
+from markup_tg_logger.defaults import HTML_PYTHON_TEMPLATE
+from markup_tg_logger.formatters.traceback_cache import TRACEBACK_CACHE
+
+from .runner import Benchmark
+
+
+_FMT = '<b>{levelname}</b> <i>{name}</i> {asctime}\n{message}'
+_PLAIN_FMT = '{levelname} {name} {asctime}\n{message}'
+
+
+def _raise_nested(depth: int) -> None:
+    if depth == 0:
+        raise ValueError('Value <must> be "positive" & non-zero')
+
+    _raise_nested(depth - 1)
+
+
+def _make_record_attributes(with_exception: bool) -> dict[str, Any]:
+    attributes: dict[str, Any] = {
+        'name': 'benchmark.module',
+        'levelno': logging.ERROR,
+        'levelname': 'ERROR',
+        'pathname': __file__,
+        'lineno': 42,
+        'msg': 'Request to <%s> failed with status %d & reason "%s"',
+        'args': ('https://example.com/api?a=1&b=2', 503, 'Service Unavailable'),
+    }
+
+    if with_exception:
+        try:
+            _raise_nested(depth=20)
+        except ValueError:
+            attributes['exc_info'] = sys.exc_info()
+
+    return attributes
+
+
+def _make_benchmark(
+    name: str,
+    formatter: logging.Formatter,
+    attributes: dict[str, Any],
+    number: int,
+    clear_traceback_cache: bool = False,
+) -> Benchmark:
+    def format_record() -> str:
+        if clear_traceback_cache:
+            TRACEBACK_CACHE.clear()
+
+        return formatter.format(logging.makeLogRecord(attributes))
+
+    return Benchmark(name=name, func=format_record, number=number)
+
+
+@contextmanager
+def suite(quick: bool) -> Iterator[list[Benchmark]]:
+    """Benchmarks of formatting a simple record and a record with a traceback."""
+
+    number = 200 if quick else 2000
+
+    formatters: dict[str, logging.Formatter] = {
+        'logging': logging.Formatter(_PLAIN_FMT, style='{'),
+        'html': HtmlFormatter(_FMT, style='{'),
+        'html_code_block': HtmlFormatter(
+            _FMT,
+            style = '{',
+            exception_template = HTML_PYTHON_TEMPLATE,
+        ),
+    }
+
+    benchmarks: list[Benchmark] = []
+    for with_exception in (False, True):
+        attributes = _make_record_attributes(with_exception)
+        record_kind = 'traceback' if with_exception else 'message'
+
+        for formatter_name, formatter in formatters.items():
+            benchmarks.append(
+                _make_benchmark(
+                    name = f'formatter.{formatter_name}.{record_kind}',
+                    formatter = formatter,
+                    attributes = attributes,
+                    number = number // 10 if with_exception else number,
+                    clear_traceback_cache = with_exception,
+                )
+            )
+
+    benchmarks.append(
+        _make_benchmark(
+            name = 'formatter.html_code_block.traceback_storm',
+            formatter = formatters['html_code_block'],
+            attributes = _make_record_attributes(with_exception=True),
+            number = number,
+        )
+    )
+
+    yield benchmarks
@@ -0,0 +1,54 @@
+"""Benchmark of `HtmlMessageSplitter` scaling with the input size.
+
+Run from the `src` directory:
+
+```bash
+python -m benchmarks.html_splitter
+```
+
+For a linear-time splitter, the time per kilobyte stays roughly constant as the input grows.
+"""
+
+import html
+import timeit
+
+from markup_tg_logger.message_splitters.html import HtmlMessageSplitter
+
+
+SIZES_KB = (25, 50, 100, 200, 400)
+REPEAT = 5
+
+_TRACEBACK_LINE = (
+    '  File "/usr/lib/python3.13/site-packages/package/module.py", line 42, in <func>\n'
+    '    result = function(argument) if argument > 0 else other(argument) & mask\n'
+)
+
+
+def make_text(size_kb: int) -> str:
+    """Make an HTML-escaped traceback of the given size wrapped in a code block with tags inside."""
+
+    line = html.escape(_TRACEBACK_LINE, quote=False)
+    lines_count = size_kb * 1024 // len(line) + 1
+    body = '<b>bold</b> '.join(line for _ in range(lines_count))
+
+    return f'<pre><code class="language-python">{body}</code></pre>'
+
+
+def main() -> None:
+    splitter = HtmlMessageSplitter()
+
+    print(f'{"size, KB":>10} {"time, ms":>10} {"us per KB":>10} {"messages":>10}')
+
+    for size_kb in SIZES_KB:
+        text = make_text(size_kb)
+        seconds = min(timeit.repeat(lambda: splitter.split(text), number=1, repeat=REPEAT))
+        messages_count = len(splitter.split(text))
+
+        print(
+            f'{size_kb:>10} {seconds * 1000:>10.2f} {seconds * 1e6 / size_kb:>10.1f} '
+            f'{messages_count:>10}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""End-to-end latency of `TelegramHandler.emit()` against the local mock Telegram server.
+
+Covers the whole pipeline: formatting, splitting and sending over a keep-alive HTTP connection.
+The server runs in the same process on a free port.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from importlib.util import find_spec
+import logging
+import threading
+from typing import Any
+
+from markup_tg_logger import HtmlFormatter, TelegramHandler
+from markup_tg_logger.interfaces import ITelegramSender
+from markup_tg_logger.telegram_senders.http_client import HttpClientTelegramSender
+
+from tests.test_utils.telegram_server import (
+    HOST, SAVE_JSON_ENDPOINT, JsonHub, MockTelegramHandler, MockTelegramServer,
+)
+
+from .runner import Benchmark
+
+
+CHAT_IDS = [1, 2, 3]
+
+_LONG_TEXT = 'Line of a long log entry with <markup> & "quotes"\n' * 200
+
+
+@contextmanager
+def _run_server() -> Iterator[int]:
+    """Start the mock server on a free port and return the port."""
+
+    server = MockTelegramServer((HOST, 0), MockTelegramHandler, JsonHub())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield server.server_address[1]
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def _make_senders(url: str) -> dict[str, ITelegramSender]:
+    senders: dict[str, ITelegramSender] = {'http_client': HttpClientTelegramSender(url=url)}
+
+    if find_spec('requests') is not None:
+        from markup_tg_logger.telegram_senders.requests import RequestsTelegramSender
+        senders['requests'] = RequestsTelegramSender(url=url)
+
+    return senders
+
+
+def _make_benchmark(name: str, handler: TelegramHandler, msg: str, number: int) -> Benchmark:
+    attributes: dict[str, Any] = {'name': 'benchmark', 'levelno': logging.ERROR, 'msg': msg}
+
+    def emit() -> None:
+        handler.handle(logging.makeLogRecord(attributes))
+
+    return Benchmark(name=name, func=emit, number=number)
+
+
+@contextmanager
+def suite(quick: bool) -> Iterator[list[Benchmark]]:
+    """Benchmarks of short and long log entries sent to one and several chats."""
+
+    number = 10 if quick else 50
+
+    with _run_server() as port:
+        url = f'http://{HOST}:{port}' + '{bot_token}'
+        formatter = HtmlFormatter('<b>{levelname}</b> {message}', style='{')
+
+        handlers: list[TelegramHandler] = []
+        benchmarks: list[Benchmark] = []
+
+        def add_handler(sender: ITelegramSender, **params: Any) -> TelegramHandler:
+            handler = TelegramHandler(bot_token=SAVE_JSON_ENDPOINT, sender=sender, **params)
+            handler.setFormatter(formatter)
+            handlers.append(handler)
+            return handler
+
+        for sender_name, sender in _make_senders(url).items():
+            handler = add_handler(sender, chat_id=CHAT_IDS[0])
+            benchmarks.append(
+                _make_benchmark(f'pipeline.{sender_name}.short', handler, 'short', number)
+            )
+            benchmarks.append(
+                _make_benchmark(f'pipeline.{sender_name}.long', handler, _LONG_TEXT, number)
+            )
+
+        sequential_handler = add_handler(HttpClientTelegramSender(url=url), chat_id=CHAT_IDS)
+        benchmarks.append(
+            _make_benchmark(
+                f'pipeline.http_client.long.{len(CHAT_IDS)}_chats',
+                sequential_handler,
+                _LONG_TEXT,
+                number,
+            )
+        )
+
+        fan_out_handler = add_handler(
+            HttpClientTelegramSender(url=url, max_idle_connections=len(CHAT_IDS)),
+            chat_id = CHAT_IDS,
+            fan_out_workers = len(CHAT_IDS),
+        )
+        benchmarks.append(
+            _make_benchmark(
+                f'pipeline.http_client.long.{len(CHAT_IDS)}_chats_fan_out',
+                fan_out_handler,
+                _LONG_TEXT,
+                number,
+            )
+        )
+
+        try:
+            yield benchmarks
+        finally:
+            for handler in handlers:
+                handler.close()
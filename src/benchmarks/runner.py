@@ -0,0 +1,180 @@
+"""Measurement, serialization and comparison of benchmark results."""
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import time
+from typing import Any
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A single measured operation.
+
+    Attributes:
+        name: Unique dotted name, for example `'splitter.html.size_64kb.density_high'`.
+        func: The measured operation.
+        number: The number of calls in one sample. Increase for fast operations.
+        params: Parameters of the benchmark saved with the results, for example the input size.
+        bytes_processed: The size of the input of one call. If specified, the throughput is
+            calculated.
+    """
+
+    name: str
+    func: Callable[[], object]
+    number: int = 1
+    params: dict[str, Any] = field(default_factory=dict)
+    bytes_processed: int | None = None
+
+
+def measure(benchmark: Benchmark, repeat: int) -> dict[str, Any]:
+    """Run the benchmark and collect the statistics of the time of one call.
+
+    One warm-up sample is made before the measured ones. The garbage collector is disabled during
+    sampling, as `timeit` does.
+
+    Args:
+        benchmark: The benchmark to run.
+        repeat: The number of measured samples.
+
+    Returns:
+        JSON-serializable result. Times are in seconds per call.
+    """
+
+    samples: list[float] = []
+    func = benchmark.func
+    calls = range(benchmark.number)
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat + 1):
+            start = time.perf_counter()
+            for _ in calls:
+                func()
+            samples.append((time.perf_counter() - start) / benchmark.number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    samples = samples[1:]
+
+    result: dict[str, Any] = {
+        'name': benchmark.name,
+        'params': benchmark.params,
+        'number': benchmark.number,
+        'repeat': repeat,
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+    if benchmark.bytes_processed is not None:
+        result['bytes_processed'] = benchmark.bytes_processed
+        result['mb_per_s'] = benchmark.bytes_processed / result['min'] / 1e6
+
+    return result
+
+
+def get_metadata() -> dict[str, Any]:
+    """Describe the environment, so that results from different machines are not confused."""
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output = True,
+            text = True,
+            check = True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+    }
+
+
+def save_results(path: str, results: list[dict[str, Any]]) -> None:
+    """Write the results with the environment metadata to a JSON file."""
+
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'meta': get_metadata(), 'results': results}, file, indent=2)
+        file.write('\n')
+
+
+def load_results(path: str) -> list[dict[str, Any]]:
+    """Read the results from a JSON file written by `save_results()`."""
+
+    with open(path, encoding='utf-8') as file:
+        data: list[dict[str, Any]] = json.load(file)['results']
+
+    return data
+
+
+def format_results(results: Iterable[dict[str, Any]]) -> str:
+    """Format the results as a text table."""
+
+    lines = [f'{"benchmark":<52} {"min, us":>12} {"median, us":>12} {"MB/s":>8}']
+
+    for result in results:
+        throughput = f'{result["mb_per_s"]:>8.1f}' if 'mb_per_s' in result else f'{"":>8}'
+        lines.append(
+            f'{result["name"]:<52} {result["min"] * 1e6:>12.1f} {result["median"] * 1e6:>12.1f} '
+            f'{throughput}'
+        )
+
+    return '\n'.join(lines)
+
+
+def compare_results(
+    baseline: Iterable[dict[str, Any]],
+    current: Iterable[dict[str, Any]],
+    threshold: float,
+) -> tuple[str, list[str]]:
+    """Compare the minimum times of the benchmarks present in both result sets.
+
+    The minimum is used as the least noisy estimate of the cost of an operation.
+
+    Args:
+        baseline: Results of the reference commit.
+        current: Results of the tested commit.
+        threshold: Relative slowdown considered a regression, for example `0.1` for 10%.
+
+    Returns:
+        A text table and the names of the regressed benchmarks.
+    """
+
+    baseline_by_name = {result['name']: result for result in baseline}
+    lines = [f'{"benchmark":<52} {"base, us":>12} {"new, us":>12} {"change":>8}']
+    regressions: list[str] = []
+
+    for result in current:
+        base = baseline_by_name.get(result['name'])
+        if base is None:
+            continue
+
+        change = result['min'] / base['min'] - 1
+        mark = ''
+        if change > threshold:
+            mark = '  slower'
+            regressions.append(result['name'])
+        elif change < -threshold:
+            mark = '  faster'
+
+        lines.append(
+            f'{result["name"]:<52} {base["min"] * 1e6:>12.1f} {result["min"] * 1e6:>12.1f} '
+            f'{change:>+8.1%}{mark}'
+        )
+
+    return '\n'.join(lines), regressions
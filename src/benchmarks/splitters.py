@@ -0,0 +1,102 @@
+"""Throughput of the message splitters across input sizes and tag densities."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+import html
+
+from markup_tg_logger.message_splitters.base import BaseMessageSplitter
+from markup_tg_logger.message_splitters.html import HtmlMessageSplitter
+
+from .runner import Benchmark
+
+
+SIZES_KB = (1, 4, 16, 64, 256)
+QUICK_SIZES_KB = (4, 64)
+
+# The average number of text characters between tags.
+TAG_DENSITIES = {
+    'none': None,
+    'low': 1000,
+    'high': 40,
+}
+
+_TEXT_LINE = html.escape(
+    '  File "/usr/lib/python3.13/site-packages/package/module.py", line 42, in <func>\n'
+    '    result = function(argument) if argument > 0 else other(argument) & mask\n',
+    quote = False,
+)
+
+
+def make_html(size_kb: int, tag_every: int | None) -> str:
+    """Make escaped text of the given size with bold tags inserted every `tag_every` characters,
+    wrapped in a code block.
+    """
+
+    size = size_kb * 1024
+    text = (_TEXT_LINE * (size // len(_TEXT_LINE) + 1))[:size]
+
+    if tag_every is not None:
+        # Cut only at spaces, so that no escape sequence is broken.
+        chunks: list[str] = []
+        start = 0
+        while start < len(text):
+            end = text.find(' ', start + tag_every)
+            if end == -1:
+                end = len(text)
+            chunks.append(text[start:end])
+            start = end
+
+        text = '<b>*</b>'.join(chunks)
+
+    return f'<pre><code class="language-python">{text}</code></pre>'
+
+
+@contextmanager
+def suite(quick: bool) -> Iterator[list[Benchmark]]:
+    """Benchmarks of `HtmlMessageSplitter` in both length modes and `BaseMessageSplitter`."""
+
+    sizes = QUICK_SIZES_KB if quick else SIZES_KB
+    html_splitter = HtmlMessageSplitter()
+    visible_html_splitter = HtmlMessageSplitter(count_visible_length=True)
+    base_splitter = BaseMessageSplitter()
+
+    benchmarks: list[Benchmark] = []
+
+    for size_kb in sizes:
+        number = max(1, 64 // size_kb)
+
+        for density_name, tag_every in TAG_DENSITIES.items():
+            text = make_html(size_kb, tag_every)
+            benchmarks.append(
+                Benchmark(
+                    name = f'splitter.html.size_{size_kb}kb.density_{density_name}',
+                    func = lambda text=text: html_splitter.split(text),
+                    number = number,
+                    params = {'size_kb': size_kb, 'tag_density': density_name},
+                    bytes_processed = len(text.encode()),
+                )
+            )
+
+        visible_text = make_html(size_kb, TAG_DENSITIES['high'])
+        benchmarks.append(
+            Benchmark(
+                name = f'splitter.html_visible.size_{size_kb}kb.density_high',
+                func = lambda text=visible_text: visible_html_splitter.split(text),
+                number = number,
+                params = {'size_kb': size_kb, 'tag_density': 'high'},
+                bytes_processed = len(visible_text.encode()),
+            )
+        )
+
+        plain_text = make_html(size_kb, None)
+        benchmarks.append(
+            Benchmark(
+                name = f'splitter.base.size_{size_kb}kb',
+                func = lambda text=plain_text: base_splitter.split(text),
+                number = number * 10,
+                params = {'size_kb': size_kb},
+                bytes_processed = len(plain_text.encode()),
+            )
+        )
+
+    yield benchmarks
@@ -1,13 +1,28 @@
+from .admissions import AdmissionChain, RateAdmission
+from .async_handler import AsyncTelegramHandler
+from .deduplicator import RecordDeduplicator
+from .delivery import DeliveryQueue
+from .document_fallback import DocumentFallback
 from .exceptions import MarkupTgLoggerException
-from .formatters import BaseMarkupFormatter, EscapeMarkupFormatter, HtmlFormatter
+from .formatters import (
+    BaseMarkupFormatter, EscapeMarkupFormatter, HtmlFormatter, MarkdownV2Formatter,
+    TracebackBudget,
+)
 from .handler import TelegramHandler
-from .message_splitters import MessageSplitterFactory, BaseMessageSplitter, HtmlMessageSplitter
+from .message_splitters import (
+    MessageSplitterFactory, BaseMessageSplitter, HtmlMessageSplitter,
+    MarkdownMessageSplitter, MarkdownV2MessageSplitter,
+)
 from .notifiers import StaticNotifier, LevelNotifier
 
 __all__ = [
+    'AdmissionChain', 'RateAdmission',
+    'DeliveryQueue', 'DocumentFallback', 'RecordDeduplicator',
     'MarkupTgLoggerException',
-    'BaseMarkupFormatter', 'EscapeMarkupFormatter', 'HtmlFormatter',
-    'TelegramHandler',
+    'BaseMarkupFormatter', 'EscapeMarkupFormatter', 'HtmlFormatter', 'MarkdownV2Formatter',
+    'TracebackBudget',
+    'TelegramHandler', 'AsyncTelegramHandler',
     'MessageSplitterFactory', 'BaseMessageSplitter', 'HtmlMessageSplitter',
+    'MarkdownMessageSplitter', 'MarkdownV2MessageSplitter',
     'StaticNotifier', 'LevelNotifier',
 ]
@@ -0,0 +1,7 @@
+from .chain import AdmissionChain
+from .rate import RateAdmission
+
+__all__ = [
+    'AdmissionChain',
+    'RateAdmission',
+]
@@ -0,0 +1,39 @@
+from collections.abc import Iterable
+from logging import LogRecord
+from typing import Any, override
+
+from ..interfaces import IAdmission
+from ..resolve_object_from_config import resolve_object_from_config
+
+
+class AdmissionChain(IAdmission):
+    """Admission of several admissions at once.
+
+    The log record is admitted if all admissions of the chain admit it. Admissions are asked in
+    the order of the chain, and the first rejection stops the chain, so cheap and selective
+    admissions should go first. Stateful admissions after the rejecting one do not see the record.
+    """
+
+    def __init__(self, admissions: Iterable[IAdmission | dict[str, Any]]) -> None:
+        """
+        Args:
+            admissions: Admissions of the chain. A dictionary can be specified to support
+                configuration from a file.
+        """
+
+        self._admissions = tuple(
+            resolve_object_from_config(
+                admission,
+                IAdmission, # type: ignore[type-abstract]
+                            # https://github.com/python/mypy/issues/4717
+            ) if isinstance(admission, dict) else admission
+            for admission in admissions
+        )
+
+    @override
+    def admit(self, record: LogRecord) -> bool:
+        for admission in self._admissions:
+            if not admission.admit(record):
+                return False
+
+        return True
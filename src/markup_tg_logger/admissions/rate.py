@@ -0,0 +1,82 @@
+from logging import LogRecord, _nameToLevel
+import threading
+import time
+from typing import override
+
+from ..interfaces import IAdmission
+from ..types import LogLevel
+
+
+class RateAdmission(IAdmission):
+    """Admission that drops log records exceeding the rate limit.
+
+    Implements a token bucket: up to `max_records` records are admitted at once, and then one record
+    per `period / max_records` seconds. Records beyond the limit are dropped before formatting
+    instead of waiting for the Telegram rate limit, which protects the chat and the bot from floods
+    of log entries.
+
+    Thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_records: int = 20,
+        period: float = 60.0,
+        bypass_level: LogLevel | None = None,
+    ) -> None:
+        """
+        Args:
+            max_records: The maximum number of records admitted within `period` seconds.
+            period: Duration in seconds in which the bucket is refilled completely.
+            bypass_level: Records with this or a higher logging level are always admitted and do
+                not consume the limit. If `None` (the default), the limit applies to all records.
+
+        Raises:
+            ValueError: Invalid `max_records` or `period` value.
+        """
+
+        if max_records < 1:
+            raise ValueError('The maximum number of records must be positive')
+        if period <= 0:
+            raise ValueError('The rate limit period must be positive')
+
+        if isinstance(bypass_level, str):
+            bypass_level = _nameToLevel[bypass_level]
+
+        self._max_records = max_records
+        self._refill_rate = max_records / period
+        self._bypass_level = bypass_level
+
+        self._clock = time.monotonic
+        self._tokens = float(max_records)
+        self._updated_at = self._clock()
+        self._rejected_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def rejected_count(self) -> int:
+        """The number of records dropped since the admission was created."""
+
+        return self._rejected_count
+
+    @override
+    def admit(self, record: LogRecord) -> bool:
+        if self._bypass_level is not None and record.levelno >= self._bypass_level:
+            return True
+
+        now = self._clock()
+
+        with self._lock:
+            self._tokens = min(
+                self._max_records,
+                self._tokens + (now - self._updated_at) * self._refill_rate,
+            )
+            self._updated_at = now
+
+            if self._tokens < 1:
+                self._rejected_count += 1
+                return False
+
+            self._tokens -= 1
+
+        return True
@@ -0,0 +1,512 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from logging import LogRecord
+import threading
+from typing import Any, override
+
+from .deduplicator import RecordDeduplicator
+from .delivery import DeliveryTask
+from .exceptions import DeliveryError, MarkupTgLoggerException, SenderError
+from .handler import AdmissionConfig, BaseTelegramHandler
+from .interfaces import IAsyncTelegramSender, INotifier
+from .message_splitters.factory import MessageSplitterFactory, ParseModeToSplitter
+from .resolve_object_from_config import resolve_object_from_config
+from .telegram_senders.asyncio import AsyncioTelegramSender
+from .types import OverflowPolicy
+
+
+class AsyncTelegramHandler(BaseTelegramHandler):
+    """Logger handler that sends messages via a bot to Telegram from an asyncio event loop.
+
+    Equivalent to `TelegramHandler`, but never blocks the event loop. `emit()` formats the log
+    entry and schedules its delivery as a task on the event loop. Messages are sent through an
+    `IAsyncTelegramSender` implementation:
+    - different recipients receive messages concurrently, while the parts of one log entry are sent
+    to each recipient in order;
+    - deliveries of different log entries run concurrently;
+    - the total number of simultaneous requests is limited by `max_concurrency`.
+
+    Logging calls may be made both from the event loop thread and from other threads. In the
+    latter case, the event loop must be passed to the constructor.
+
+    The number of log entries scheduled and not yet delivered is limited by `max_pending`, so that
+    the tasks do not accumulate without bound when the event loop falls behind. When the limit is
+    reached, the behavior is determined by the overflow policy, as in `DeliveryQueue`:
+    - `'drop_oldest'` - the delivery of the oldest pending entry is cancelled, even if some of its
+    messages have already been sent;
+    - `'drop_newest'` - the new entry is discarded;
+    - `'block'` - a logging call made outside the event loop thread waits for a free slot for no
+    longer than `block_timeout` seconds, after which the new entry is discarded. The event loop
+    thread cannot wait without blocking the loop, so there the new entry is discarded immediately.
+    The slot is awaited in `handle()` before the handler lock is taken, so `emit()` called directly
+    does not wait.
+
+    The number of discarded entries is available through the `dropped_count` property.
+
+    Use `await handler.aflush()` to wait for the scheduled deliveries and `await handler.aclose()`
+    to close the handler from the event loop. `flush()` and `close()` wait for the deliveries only
+    when called outside the event loop thread, for example by `logging.shutdown()` while the loop
+    is running in another thread, and no longer than `flush_timeout` seconds. In the event loop
+    thread they return immediately, and the entries that are still pending are lost if the loop
+    stops before they are delivered.
+
+    Docs:
+        Handler: https://docs.python.org/3/library/logging.html#logging.Handler
+    """
+
+    def __init__(
+        self,
+        bot_token: str,
+        chat_id: int | str | set[int | str] | list[int | str],
+        disable_notification: bool | dict[str, Any] | INotifier = False,
+        message_splitter_factory: MessageSplitterFactory | ParseModeToSplitter | None = None,
+        sender: IAsyncTelegramSender | dict[str, Any] | None = None,
+        force_send_on_exception: bool = False,
+        max_concurrency: int = 10,
+        loop: asyncio.AbstractEventLoop | None = None,
+        deduplicator: RecordDeduplicator | dict[str, Any] | None = None,
+        admission: AdmissionConfig | None = None,
+        max_pending: int = 1000,
+        overflow_policy: OverflowPolicy = 'drop_oldest',
+        block_timeout: float | None = None,
+        flush_timeout: float | None = 10.0,
+        **params: Any
+    ) -> None:
+        """
+        Args:
+            bot_token: Telegram bot API token.
+            chat_id: Unique identifier for the target chat or username of the target channel (in
+                the format `@channelusername`) or list/set for multiple recipients.
+            disable_notification: Customize notifications. In case of bool values, notifications
+                will be always on or off. For more flexible customization, use `INotifier`
+                implementations. A dictionary can be specified to support configuration from a file.
+            message_splitter_factory: Factory for creating splitters depending on the markup
+                language or a dictionary with `ParseMode` to `IMessageSplitter` mappings that
+                will be passed to the constructor of the `MessageSplitterFactory`. See the
+                `MessageSplitterFactory` constructor documentation for details.
+            sender: Asynchronous Telegram Bot API adapter. If `None` (the default),
+                `AsyncioTelegramSender` is created. A dictionary can be specified to support
+                configuration from a file.
+            force_send_on_exception: If `True`, in case the handler sends a message to multiple
+                recipients and an exception occurs during the process, the handler will forcefully
+                continue sending messages to the remaining recipients. By default, if an exception
+                occurs, the mailing is interrupted.
+            max_concurrency: The maximum number of simultaneous requests to Telegram API.
+            loop: The event loop for delivery. If `None` (the default), the running event loop of
+                the thread that makes the logging call is used. Must be specified if logging calls
+                are made outside the event loop thread.
+            deduplicator: Suppressor of repeated log records. Duplicates are dropped before
+                formatting, and summaries with the number of suppressed duplicates are emitted
+                instead when their window expires. Pending summaries are emitted by `aclose()`.
+                If `None` (the default), all records are emitted. A dictionary can be specified
+                to support configuration from a file.
+            admission: Filter of log records checked before formatting, so that rejected records
+                cost neither formatting, splitting nor sending. A list is combined into
+                `AdmissionChain`. If `None` (the default), all records are admitted. A dictionary
+                can be specified to support configuration from a file.
+            max_pending: The maximum number of log entries scheduled for delivery and not yet
+                delivered.
+            overflow_policy: What to do with a new log entry when `max_pending` is reached. One of
+                `'drop_oldest'` (the default), `'drop_newest'` or `'block'`.
+            block_timeout: The maximum time in seconds to wait for a free slot with the `'block'`
+                policy. If `None` (the default), wait indefinitely.
+            flush_timeout: The maximum time in seconds that `flush()` and `close()` wait for the
+                scheduled deliveries outside the event loop thread. `logging.shutdown()` calls them
+                with the handler lock held, so a finite timeout keeps the process from hanging if
+                the event loop is stuck or logs through this handler. If `None`, wait indefinitely.
+            **params: Other parameters of the Telegram Bot API `sendMessage` method.
+
+        Raises:
+            ValueError: Invalid `max_pending` or `overflow_policy` value.
+        """
+
+        if max_pending < 1:
+            raise ValueError('The maximum number of pending entries must be positive')
+        if overflow_policy not in ('drop_oldest', 'drop_newest', 'block'):
+            raise ValueError(f'Unknown overflow policy: "{overflow_policy}"')
+
+        super().__init__(
+            bot_token = bot_token,
+            chat_id = chat_id,
+            disable_notification = disable_notification,
+            message_splitter_factory = message_splitter_factory,
+            force_send_on_exception = force_send_on_exception,
+            deduplicator = deduplicator,
+            admission = admission,
+            **params
+        )
+
+        self._sender: IAsyncTelegramSender
+        self._max_concurrency = max_concurrency
+        self._loop = loop
+        self._semaphores: dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        # Scheduled deliveries in the order of scheduling. Accessed in the event loop thread only.
+        self._tasks: dict[asyncio.Task[None], None] = {}
+        # The loop of the last scheduled delivery, waited for by `flush()`.
+        self._delivery_loop: asyncio.AbstractEventLoop | None = loop
+
+        self._max_pending = max_pending
+        self._overflow_policy: OverflowPolicy = overflow_policy
+        self._block_timeout = block_timeout
+        self._flush_timeout = flush_timeout
+        # Slot reservations made by `handle()` of each thread, innermost last. A reservation is
+        # consumed by `_reserve_slot()`.
+        self._reservations = threading.local()
+        # The number of entries scheduled or being scheduled from other threads. Guarded by
+        # `_pending_condition`, as well as `_dropped_count`.
+        self._pending_count = 0
+        self._dropped_count = 0
+        self._pending_condition = threading.Condition()
+
+        if sender is None:
+            self._sender = AsyncioTelegramSender()
+        elif isinstance(sender, dict):
+            self._sender = resolve_object_from_config(
+                sender,
+                IAsyncTelegramSender, # type: ignore[type-abstract]
+                                      # https://github.com/python/mypy/issues/4717
+            )
+        else:
+            self._sender = sender
+
+    @property
+    def dropped_count(self) -> int:
+        """The number of log entries discarded because `max_pending` was reached."""
+
+        return self._dropped_count
+
+    @override
+    def handle(self, record: LogRecord) -> bool:
+        """Conditionally emit the log record.
+
+        With the `'block'` policy, a logging call outside the event loop thread waits for a free
+        slot before the handler lock is taken, since the slots are freed in the event loop thread,
+        whose logging calls take the same lock.
+        """
+
+        reservations = self._get_reservations()
+
+        # A nested logging call made while emitting holds the handler lock, so it does not wait.
+        reservations.append(
+            not reservations
+            and self._overflow_policy == 'block'
+            and self._can_wait_for_slot()
+            and self._wait_for_slot()
+        )
+
+        try:
+            return super().handle(record)
+        finally:
+            if reservations.pop():
+                # The record was filtered or suppressed before the reservation was used.
+                self._release_slot()
+
+    @override
+    def _emit_record(self, record: LogRecord) -> None:
+        """Format log record and schedule its delivery on the event loop."""
+
+        task = self._make_task(record)
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        loop = self._loop or running_loop
+
+        if loop is None or loop.is_closed():
+            try:
+                raise MarkupTgLoggerException('No event loop to deliver the log record')
+            except MarkupTgLoggerException:
+                self.handleError(record)
+            return
+
+        if not self._reserve_slot():
+            return
+
+        if loop is running_loop:
+            self._schedule(task)
+            return
+
+        try:
+            loop.call_soon_threadsafe(self._schedule, task)
+        except RuntimeError:
+            # The loop has been closed after the check.
+            self._release_slot()
+            try:
+                raise MarkupTgLoggerException('No event loop to deliver the log record')
+            except MarkupTgLoggerException:
+                self.handleError(record)
+
+    @override
+    def flush(self) -> None:
+        """Wait for the scheduled deliveries when called outside the event loop thread.
+
+        Does nothing in the event loop thread, since waiting there would block the loop.
+        Use `await aflush()` instead.
+        """
+
+        loop = self._delivery_loop
+        if loop is None or not loop.is_running() or self._is_loop_thread(loop):
+            return
+
+        future: Future[None] = asyncio.run_coroutine_threadsafe(self.aflush(), loop)
+        try:
+            future.result(self._flush_timeout)
+        except FutureTimeoutError:
+            # Only the waiting is cancelled, the deliveries continue in the background.
+            future.cancel()
+
+    @override
+    def close(self) -> None:
+        """Close the handler.
+
+        Outside the event loop thread, emits pending deduplication summaries and waits for the
+        scheduled deliveries first. In the event loop thread, the pending deliveries are not waited
+        for, use `await aclose()` instead.
+        """
+
+        loop = self._delivery_loop
+        if loop is not None and loop.is_running() and not self._is_loop_thread(loop):
+            self._emit_summaries(force=True)
+            self.flush()
+
+        super().close()
+
+    async def aflush(self) -> None:
+        """Wait for the scheduled deliveries to complete."""
+
+        # Unlike `asyncio.gather()`, cancelling `asyncio.wait()` does not cancel the deliveries.
+        while self._tasks:
+            await asyncio.wait(list(self._tasks))
+
+    async def aclose(self) -> None:
+        """Emit pending deduplication summaries, wait for the scheduled deliveries, release
+        the sender resources and close the handler.
+        """
+
+        self._emit_summaries(force=True)
+        await self.aflush()
+        await self._sender.close()
+        self.close()
+
+    @override
+    def _start_timer(
+        self,
+        delay: float,
+        callback: Callable[[], None],
+    ) -> Callable[[], None] | None:
+        """Call the function after the delay.
+
+        Without the `loop` argument, logging calls are made in the event loop thread, so the call
+        is scheduled on the running event loop. Otherwise, it is made in a daemon thread.
+        """
+
+        if self._loop is not None:
+            return super()._start_timer(delay, callback)
+
+        try:
+            timer_handle = asyncio.get_running_loop().call_later(delay, callback)
+        except RuntimeError:
+            return None
+
+        return timer_handle.cancel
+
+    def _get_reservations(self) -> list[bool]:
+        """Get the slot reservations of the current thread."""
+
+        reservations: list[bool] | None = getattr(self._reservations, 'stack', None)
+        if reservations is None:
+            reservations = self._reservations.stack = []
+
+        return reservations
+
+    def _can_wait_for_slot(self) -> bool:
+        """Check whether the logging call is made outside the thread of the delivery event loop."""
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        loop = self._loop or running_loop
+
+        return loop is not None and loop is not running_loop
+
+    def _wait_for_slot(self) -> bool:
+        """Wait for a free slot no longer than `block_timeout` and reserve it.
+
+        Returns:
+            `True` if the slot is reserved, `False` if the timeout has expired.
+        """
+
+        with self._pending_condition:
+            if self._pending_condition.wait_for(
+                lambda: self._pending_count < self._max_pending,
+                timeout = self._block_timeout,
+            ):
+                self._pending_count += 1
+                return True
+
+        return False
+
+    def _reserve_slot(self) -> bool:
+        """Reserve a slot for a new log entry according to the overflow policy.
+
+        Uses the slot reserved by `handle()`, if any, otherwise does not wait.
+
+        Returns:
+            `True` if the entry may be scheduled, `False` if it is discarded.
+        """
+
+        reservations = self._get_reservations()
+        if reservations and reservations[-1]:
+            reservations[-1] = False
+            return True
+
+        with self._pending_condition:
+            # With `'drop_oldest'`, the oldest entry is cancelled in the event loop thread.
+            if self._pending_count < self._max_pending or self._overflow_policy == 'drop_oldest':
+                self._pending_count += 1
+                return True
+
+            self._dropped_count += 1
+            return False
+
+    def _release_slot(self) -> None:
+        """Free the slot of a delivered or discarded log entry."""
+
+        with self._pending_condition:
+            self._pending_count -= 1
+            self._pending_condition.notify()
+
+    def _schedule(self, task: DeliveryTask) -> None:
+        """Create an event loop task for the delivery. Called in the event loop thread after
+        a slot is reserved."""
+
+        loop = asyncio.get_running_loop()
+        self._delivery_loop = loop
+
+        loop_task = loop.create_task(self._deliver(task))
+        self._tasks[loop_task] = None
+        loop_task.add_done_callback(self._on_delivery_done)
+
+        while len(self._tasks) > self._max_pending:
+            oldest_task = next(iter(self._tasks))
+            del self._tasks[oldest_task]
+            oldest_task.cancel()
+
+            with self._pending_condition:
+                self._dropped_count += 1
+
+    def _on_delivery_done(self, loop_task: asyncio.Task[None]) -> None:
+        """Forget the finished or cancelled delivery and free its slot."""
+
+        self._tasks.pop(loop_task, None)
+        self._release_slot()
+
+    async def _deliver(self, task: DeliveryTask) -> None:
+        """Split the formatted log entry into messages and send them to all recipients.
+
+        Recipients receive messages concurrently. Sender errors are reported via `handleError()`
+        as a single `DeliveryError`, other errors are reported separately.
+        """
+
+        try:
+            messages = self._split(task)
+        except Exception:
+            self.handleError(task.record)
+            return
+
+        interrupted = asyncio.Event()
+        chat_ids = list(self._chat_ids)
+
+        results = await asyncio.gather(
+            *(
+                self._send_to_chat(chat_id, messages, task, interrupted)
+                for chat_id in chat_ids
+            ),
+            return_exceptions = True,
+        )
+
+        errors: dict[int | str, SenderError] = {}
+
+        for chat_id, result in zip(chat_ids, results):
+            if isinstance(result, SenderError):
+                errors[chat_id] = result
+            elif isinstance(result, Exception):
+                try:
+                    raise result
+                except Exception:
+                    self.handleError(task.record)
+
+        if errors:
+            try:
+                raise DeliveryError(errors) from next(iter(errors.values()))
+            except DeliveryError:
+                self.handleError(task.record)
+
+    async def _send_to_chat(
+        self,
+        chat_id: int | str,
+        messages: list[str],
+        task: DeliveryTask,
+        interrupted: asyncio.Event,
+    ) -> SenderError | None:
+        """Send messages to one recipient in order.
+
+        Args:
+            chat_id: The recipient.
+            messages: Parts of the log entry.
+            task: Delivery parameters.
+            interrupted: Set when the mailing is interrupted due to an error in another recipient.
+
+        Returns:
+            The first error interacting with Telegram API, if any.
+        """
+
+        semaphore = self._get_semaphore()
+        first_error: SenderError | None = None
+
+        for message in messages:
+            if interrupted.is_set():
+                break
+
+            try:
+                async with semaphore:
+                    await self._sender.send(
+                        bot_token = self._bot_token,
+                        chat_id = chat_id,
+                        text = message,
+                        parse_mode = task.parse_mode,
+                        disable_notification = task.disable_notification,
+                        **self._params
+                    )
+            except SenderError as e:
+                first_error = first_error or e
+                if not self._force_send_on_exception:
+                    interrupted.set()
+                    break
+
+        return first_error
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency limiting semaphore of the running event loop."""
+
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._semaphores = {loop: semaphore}
+
+        return semaphore
+
+    @staticmethod
+    def _is_loop_thread(loop: asyncio.AbstractEventLoop) -> bool:
+        """Check whether the current thread runs the event loop."""
+
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
@@ -1,3 +1,8 @@
 MAX_MESSAGE_LENGTH = 4096
 
+# Limits of the `sendDocument` method.
+MAX_CAPTION_LENGTH = 1024
+MAX_DOCUMENT_SIZE = 50 * 1024 * 1024
+
 TELEGRAM_SEND_MESSAGE_URL = 'https://api.telegram.org/bot{bot_token}/sendMessage'
+TELEGRAM_SEND_DOCUMENT_URL = 'https://api.telegram.org/bot{bot_token}/sendDocument'
@@ -0,0 +1,185 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from logging import LogRecord, makeLogRecord
+import threading
+import time
+from typing import Any, override
+
+from .interfaces import IAdmission
+
+
+_RecordKey = tuple[str, int, str, int, str, type[BaseException] | None]
+
+
+@dataclass
+class _Entry:
+    """State of the deduplication window of one kind of log record."""
+
+    started_at: float
+    last_seen_at: float
+    suppressed_count: int = 0
+    last_record: LogRecord | None = None
+
+
+class RecordDeduplicator(IAdmission):
+    """Suppressor of repeated log records.
+
+    Records are considered duplicates if they have the same logger name, level, source location,
+    message template (not the formatted message, so different arguments do not matter) and
+    exception type. The first record opens a window of `window` seconds, during which its duplicates
+    are suppressed. When the window expires, a summary record with the number of suppressed
+    duplicates is produced. The handlers emit it at the end of the window, as well as with the next
+    logging call, on `flush()` and on `close()`.
+
+    The windows are stored in a bounded cache ordered by their start time. When the cache is full,
+    the oldest window is closed ahead of time.
+
+    Thread-safe.
+    """
+
+    def __init__(
+        self,
+        window: float = 60.0,
+        max_size: int = 1024,
+        summary_format: str = '[Repeated {count} times in {seconds:.0f} s] {message}',
+    ) -> None:
+        """
+        Args:
+            window: Duration in seconds of the suppression window.
+            max_size: The maximum number of kinds of log records tracked at once.
+            summary_format: `str.format()` template of the summary record message. Available
+                fields: `count` - the number of suppressed duplicates, `seconds` - the time between
+                the first record and the last duplicate, `message` - the message of the last
+                duplicate.
+
+        Raises:
+            ValueError: Invalid `window` or `max_size` value.
+        """
+
+        if window < 0:
+            raise ValueError('The deduplication window must not be negative')
+        if max_size < 1:
+            raise ValueError('The deduplication cache size must be positive')
+
+        self._window = window
+        self._max_size = max_size
+        self._summary_format = summary_format
+
+        self._clock = time.monotonic
+        self._entries: OrderedDict[_RecordKey, _Entry] = OrderedDict()
+        self._closed_entries: list[_Entry] = []
+        self._lock = threading.Lock()
+
+    @override
+    def admit(self, record: LogRecord) -> bool:
+        """Check whether the record must be emitted.
+
+        Returns:
+            `False` if the record is a duplicate of a record emitted less than `window` seconds ago.
+        """
+
+        key = self._get_key(record)
+        now = self._clock()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and now - entry.started_at < self._window:
+                entry.suppressed_count += 1
+                entry.last_seen_at = now
+                entry.last_record = record
+                return False
+
+            if entry is not None:
+                self._close_entry(key)
+
+            self._entries[key] = _Entry(started_at=now, last_seen_at=now)
+
+            while len(self._entries) > self._max_size:
+                self._close_entry(next(iter(self._entries)))
+
+        return True
+
+    def pop_summaries(self, force: bool = False) -> list[LogRecord]:
+        """Close the expired windows and get the summary records of their suppressed duplicates.
+
+        Args:
+            force: Close all windows, including those that have not yet expired. Used when the
+                handler is closed.
+
+        Returns:
+            Summary records in the order of the window start. Windows without duplicates do not
+            produce summaries.
+        """
+
+        now = self._clock()
+
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if not force and now - entry.started_at < self._window:
+                    break
+
+                self._close_entry(key)
+
+            closed_entries, self._closed_entries = self._closed_entries, []
+
+        return [self._make_summary(entry) for entry in closed_entries]
+
+    def get_summary_delay(self) -> float | None:
+        """Get the time in seconds until the next summary is ready to be popped.
+
+        Returns:
+            `0.0` if a summary is already ready, `None` if no window has suppressed duplicates.
+        """
+
+        now = self._clock()
+
+        with self._lock:
+            if self._closed_entries:
+                return 0.0
+
+            for entry in self._entries.values():
+                if entry.suppressed_count:
+                    return max(0.0, entry.started_at + self._window - now)
+
+        return None
+
+    def _close_entry(self, key: _RecordKey) -> None:
+        """Remove the window from the cache and keep it for a summary if needed. Called under
+        the lock.
+        """
+
+        entry = self._entries.pop(key)
+        if entry.suppressed_count:
+            self._closed_entries.append(entry)
+
+    def _make_summary(self, entry: _Entry) -> LogRecord:
+        """Create a summary record based on the last suppressed duplicate."""
+
+        assert entry.last_record is not None
+
+        attributes: dict[str, Any] = dict(entry.last_record.__dict__)
+        attributes.update(
+            msg = self._summary_format.format(
+                count = entry.suppressed_count,
+                seconds = entry.last_seen_at - entry.started_at,
+                message = entry.last_record.getMessage(),
+            ),
+            args = None,
+            exc_info = None,
+            exc_text = None,
+            stack_info = None,
+        )
+
+        return makeLogRecord(attributes)
+
+    @staticmethod
+    def _get_key(record: LogRecord) -> _RecordKey:
+        """Get the key identifying duplicates of the record."""
+
+        message = record.msg if isinstance(record.msg, str) else repr(record.msg)
+        exception_type = record.exc_info[0] if record.exc_info else None
+
+        return (
+            record.name, record.levelno, record.pathname, record.lineno, message, exception_type
+        )
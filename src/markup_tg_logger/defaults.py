@@ -3,6 +3,8 @@ import logging
 
 HTML_PYTHON_TEMPLATE = '<pre><code class="language-python">{text}</code></pre>'
 HTML_BASH_TEMPLATE = '<pre><code class="language-bash">{text}</code></pre>'
+MARKDOWN_V2_PYTHON_TEMPLATE = '```python\n{text}\n```'
+MARKDOWN_V2_BASH_TEMPLATE = '```bash\n{text}\n```'
 
 DEFAULT_LEVEL_NAMES: dict[int, str] = {
         logging.DEBUG:    '⬛️ DEBUG ⬛️',
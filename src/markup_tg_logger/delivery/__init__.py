@@ -0,0 +1,7 @@
+from .queue import DeliveryQueue
+from .task import DeliveryTask
+
+__all__ = [
+    'DeliveryQueue',
+    'DeliveryTask',
+]
@@ -0,0 +1,320 @@
+from collections import deque
+from collections.abc import Callable
+import queue
+import threading
+import time
+import traceback
+
+from ..config import MAX_MESSAGE_LENGTH
+from ..exceptions import MarkupTgLoggerException
+from ..types import OverflowPolicy
+from .task import DeliveryTask
+
+
+DeliveryConsumer = Callable[[DeliveryTask], None]
+
+_STOP = None
+
+
+class DeliveryQueue:
+    """Bounded queue of delivery tasks drained by background worker threads.
+
+    Allows `TelegramHandler` to return from `emit()` right after formatting the log entry. Splitting
+    and sending messages is performed by the worker threads through the consumer function passed
+    to `start()`.
+
+    When the queue is full, the behavior is determined by the overflow policy:
+    - `'drop_oldest'` - the oldest queued task is discarded to make room for the new one;
+    - `'drop_newest'` - the new task is discarded;
+    - `'block'` - the caller waits for free space for no longer than `block_timeout` seconds,
+    after which the new task is discarded.
+
+    The number of discarded tasks is available through the `dropped_count` property.
+
+    Coalescing mode is enabled by the `coalesce_window` argument. In this mode, a worker that has
+    taken a task keeps collecting the following tasks with the same markup language for up to
+    `coalesce_window` seconds or until their total length reaches `coalesce_max_length`. The
+    collected log entries are joined with `coalesce_separator` and passed to the consumer as a
+    single task, so a burst of small records is sent in as few messages as possible.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        workers: int = 1,
+        overflow_policy: OverflowPolicy = 'drop_oldest',
+        block_timeout: float | None = None,
+        flush_timeout: float | None = None,
+        coalesce_window: float | None = None,
+        coalesce_max_length: int = MAX_MESSAGE_LENGTH,
+        coalesce_separator: str = '\n\n',
+    ) -> None:
+        """
+        Args:
+            maxsize: The maximum number of tasks waiting to be delivered.
+            workers: The number of worker threads. With more than one worker, the order of
+                delivery of different log entries is not guaranteed.
+            overflow_policy: What to do with a new task when the queue is full. One of
+                `'drop_oldest'` (the default), `'drop_newest'` or `'block'`.
+            block_timeout: The maximum time in seconds to wait for free space with the `'block'`
+                policy. If `None` (the default), wait indefinitely.
+            flush_timeout: The maximum time in seconds that `flush()` and `close()` wait for the
+                queued tasks to be delivered. If `None` (the default), wait indefinitely.
+            coalesce_window: The maximum time in seconds to wait for more log entries to join with
+                the first one. If `0`, only the entries already in the queue are joined. If `None`
+                (the default), coalescing is disabled.
+            coalesce_max_length: The maximum length of the joined text including separators.
+                An entry that does not fit is left for the next batch. An entry that is longer on
+                its own is passed alone.
+            coalesce_separator: The string inserted between joined entries.
+
+        Raises:
+            ValueError: Invalid `maxsize`, `workers`, `overflow_policy`, `coalesce_window` or
+                `coalesce_max_length` value.
+        """
+
+        if maxsize < 1:
+            raise ValueError('The queue size must be positive')
+        if workers < 1:
+            raise ValueError('The number of workers must be positive')
+        if overflow_policy not in ('drop_oldest', 'drop_newest', 'block'):
+            raise ValueError(f'Unknown overflow policy: "{overflow_policy}"')
+        if coalesce_window is not None and coalesce_window < 0:
+            raise ValueError('The coalesce window must not be negative')
+        if coalesce_max_length < 1:
+            raise ValueError('The coalesce max length must be positive')
+
+        self._maxsize = maxsize
+        self._workers_count = workers
+        self._overflow_policy: OverflowPolicy = overflow_policy
+        self._block_timeout = block_timeout
+        self._flush_timeout = flush_timeout
+        self._coalesce_window = coalesce_window
+        self._coalesce_max_length = coalesce_max_length
+        self._coalesce_separator = coalesce_separator
+
+        self._workers: list[threading.Thread] = []
+        self._running = False
+        self._lock = threading.Lock()
+
+        # The queued tasks and the counters are guarded by the mutex shared by the conditions.
+        self._tasks: deque[DeliveryTask | None] = deque()
+        self._unfinished_count = 0
+        self._closed = False
+        self._dropped_count = 0
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._not_full = threading.Condition(self._mutex)
+        self._all_done = threading.Condition(self._mutex)
+
+    @property
+    def is_running(self) -> bool:
+        """`True` if the worker threads are started and the queue accepts new tasks."""
+
+        return self._running
+
+    @property
+    def dropped_count(self) -> int:
+        """The number of tasks discarded due to queue overflow."""
+
+        return self._dropped_count
+
+    def start(self, consumer: DeliveryConsumer) -> None:
+        """Start the worker threads.
+
+        Args:
+            consumer: The function that delivers a single task. It must handle its own errors,
+                unhandled exceptions are printed to `stderr` and do not stop the worker.
+
+        Raises:
+            MarkupTgLoggerException: The queue is already running.
+        """
+
+        with self._lock:
+            if self._running:
+                raise MarkupTgLoggerException('The delivery queue is already running')
+
+            self._workers = [
+                threading.Thread(
+                    target = self._work,
+                    args = (consumer, ),
+                    name = f'markup-tg-logger-delivery-{index}',
+                    daemon = True,
+                )
+                for index in range(self._workers_count)
+            ]
+            for worker in self._workers:
+                worker.start()
+
+            with self._mutex:
+                self._closed = False
+
+            self._running = True
+
+    def put(self, task: DeliveryTask) -> bool:
+        """Add a task to the queue according to the overflow policy.
+
+        Tasks put after `close()` has been called are discarded, so that no task is queued behind
+        the stop signal of the workers and left undelivered.
+
+        Args:
+            task: The task to be delivered.
+
+        Returns:
+            `True` if the task was queued, `False` if it was discarded.
+        """
+
+        # The closed flag is checked under the mutex, so `close()` cannot interleave between the
+        # check and adding the task.
+        with self._not_full:
+            if not self._closed and len(self._tasks) >= self._maxsize:
+                if self._overflow_policy == 'drop_oldest':
+                    self._tasks.popleft()
+                    self._unfinished_count -= 1
+                    self._dropped_count += 1
+                elif self._overflow_policy == 'block':
+                    self._not_full.wait_for(
+                        lambda: self._closed or len(self._tasks) < self._maxsize,
+                        self._block_timeout,
+                    )
+
+            if self._closed or len(self._tasks) >= self._maxsize:
+                self._dropped_count += 1
+                return False
+
+            self._tasks.append(task)
+            self._unfinished_count += 1
+            self._not_empty.notify()
+
+        return True
+
+    def flush(self) -> bool:
+        """Wait until all queued tasks are delivered, but no longer than `flush_timeout`.
+
+        Returns:
+            `True` if all tasks are delivered, `False` if the timeout has expired.
+        """
+
+        with self._all_done:
+            return self._all_done.wait_for(lambda: not self._unfinished_count, self._flush_timeout)
+
+    def close(self) -> None:
+        """Deliver the queued tasks and stop the worker threads.
+
+        New tasks are discarded from the moment the method is called. Waits for delivery no longer
+        than `flush_timeout`. Tasks that are still in the queue after the timeout expires will be
+        delivered by the worker threads in the background, since they are daemon threads, they do
+        not prevent the interpreter from exiting.
+        """
+
+        with self._lock:
+            if not self._running:
+                return
+
+            self._running = False
+
+        with self._mutex:
+            self._closed = True
+            # The stop signals are not limited by the queue size, so the workers stop after
+            # delivering the queued tasks even if the queue is full.
+            self._tasks.extend([_STOP] * len(self._workers))
+            self._not_empty.notify_all()
+            # Producers waiting for free space with the `'block'` policy discard their tasks.
+            self._not_full.notify_all()
+
+        deadline = None if self._flush_timeout is None else time.monotonic() + self._flush_timeout
+
+        for worker in self._workers:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            worker.join(remaining)
+
+        self._workers = []
+
+    def _work(self, consumer: DeliveryConsumer) -> None:
+        """Worker thread loop."""
+
+        # A task taken from the queue while coalescing, but not fitting into the batch.
+        backlog: list[DeliveryTask | None] = []
+
+        while True:
+            task = backlog.pop() if backlog else self._get()
+            if task is _STOP:
+                return
+
+            batch = [task]
+            if self._coalesce_window is not None:
+                backlog = self._collect(batch, self._coalesce_window)
+
+            try:
+                if len(batch) == 1:
+                    consumer(task)
+                else:
+                    consumer(DeliveryTask.join(batch, self._coalesce_separator))
+            except Exception:
+                traceback.print_exc()
+            finally:
+                self._task_done(len(batch))
+
+    def _collect(self, batch: list[DeliveryTask], window: float) -> list[DeliveryTask | None]:
+        """Take compatible tasks from the queue and append them to the batch.
+
+        Args:
+            batch: The batch with the first task. Modified in place.
+            window: The maximum time in seconds to wait for new tasks.
+
+        Returns:
+            The task that was taken from the queue, but does not fit into the batch, if any.
+        """
+
+        deadline = time.monotonic() + window
+        separator_length = len(self._coalesce_separator)
+        parse_mode = batch[0].parse_mode
+        length = len(batch[0].text)
+
+        while length < self._coalesce_max_length:
+            try:
+                task = self._get(max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+
+            if (
+                task is _STOP
+                or task.parse_mode != parse_mode
+                or length + separator_length + len(task.text) > self._coalesce_max_length
+            ):
+                return [task]
+
+            batch.append(task)
+            length += separator_length + len(task.text)
+
+        return []
+
+    def _get(self, timeout: float | None = None) -> DeliveryTask | None:
+        """Take the next task from the queue.
+
+        Args:
+            timeout: The maximum time in seconds to wait for a task. If `None`, wait indefinitely.
+
+        Returns:
+            The task or the stop signal.
+
+        Raises:
+            queue.Empty: The timeout has expired.
+        """
+
+        with self._not_empty:
+            if not self._not_empty.wait_for(lambda: self._tasks, timeout):
+                raise queue.Empty
+
+            task = self._tasks.popleft()
+            self._not_full.notify()
+
+        return task
+
+    def _task_done(self, count: int) -> None:
+        """Mark the given number of tasks taken from the queue as processed."""
+
+        with self._all_done:
+            self._unfinished_count -= count
+            if not self._unfinished_count:
+                self._all_done.notify_all()
@@ -0,0 +1,44 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from logging import LogRecord
+
+from ..types import ParseMode
+
+
+@dataclass(frozen=True)
+class DeliveryTask:
+    """A formatted log entry waiting to be delivered to Telegram.
+
+    Attributes:
+        record: The source log record. Used for error reporting via `Handler.handleError()`.
+        text: Fully formatted text of the log entry, not yet split into messages.
+        parse_mode: Markup language of the text.
+        disable_notification: Value of the `disable_notification` parameter for all messages
+            of the entry.
+    """
+
+    record: LogRecord
+    text: str
+    parse_mode: ParseMode
+    disable_notification: bool
+
+    @classmethod
+    def join(cls, tasks: Sequence['DeliveryTask'], separator: str) -> 'DeliveryTask':
+        """Combine several log entries with the same markup language into one task.
+
+        The notification is disabled only if it is disabled for all the combined entries.
+
+        Args:
+            tasks: Non-empty sequence of tasks with the same `parse_mode`.
+            separator: The string inserted between the texts of the entries.
+
+        Returns:
+            A task with the record of the first entry and the joined text.
+        """
+
+        return cls(
+            record = tasks[0].record,
+            text = separator.join(task.text for task in tasks),
+            parse_mode = tasks[0].parse_mode,
+            disable_notification = all(task.disable_notification for task in tasks),
+        )
@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+
+from .config import MAX_CAPTION_LENGTH
+from .delivery import DeliveryTask
+
+
+@dataclass(frozen=True)
+class Document:
+    """A log entry prepared for uploading as a file.
+
+    Attributes:
+        content: The formatted text of the log entry encoded in UTF-8.
+        filename: Name of the file displayed in the chat.
+        caption: Plain text caption of the document. Empty if disabled.
+    """
+
+    content: bytes
+    filename: str
+    caption: str
+
+
+class DocumentFallback:
+    """Policy of uploading oversized log entries as files.
+
+    If a formatted log entry is split into more than `max_messages` messages or takes more than
+    `max_bytes` bytes, `TelegramHandler` uploads the full text as one document via the
+    `sendDocument` method instead of sending every part. This saves the rate limit and does not
+    flood the chat. The size is checked before splitting, so huge entries are not even split.
+
+    The document contains the formatted text with markup. The file extension corresponds to the
+    markup language: `.html`, `.md` or `.txt`. The document is captioned with a short summary of the
+    log record without markup.
+    """
+
+    _EXTENSIONS = {
+        'HTML': '.html',
+        'MarkdownV2': '.md',
+        'Markdown': '.md',
+    }
+    _DEFAULT_EXTENSION = '.txt'
+    _PLAIN_CAPTION_FORMAT = '{levelname}: {message}'
+    _ENCODING = 'utf-8'
+    _ELLIPSIS = '…'
+
+    def __init__(
+        self,
+        max_messages: int | None = 5,
+        max_bytes: int | None = None,
+        filename: str = 'log',
+        caption_format: str | None = '{levelname}: {message}',
+        max_caption_length: int = 200,
+    ) -> None:
+        """
+        Args:
+            max_messages: The maximum number of messages a log entry is sent as. If `None`, the
+                number of messages is not limited.
+            max_bytes: The maximum size in bytes of a log entry in UTF-8 sent as messages. If
+                `None` (the default), the size is not limited.
+            filename: Name of the document without the extension.
+            caption_format: `str.format()` template of the document caption. Available fields are
+                the attributes of the log record, `message` is the first line of the log message.
+                If the template references a field missing from the record, the caption
+                `'{levelname}: {message}'` is used instead. If `None`, the document is sent without
+                a caption.
+            max_caption_length: Captions longer than this number of characters are truncated.
+                Cannot exceed the Telegram limit of 1024 characters.
+
+        Raises:
+            ValueError: Invalid `max_messages`, `max_bytes` or `max_caption_length` value.
+        """
+
+        if max_messages is not None and max_messages < 1:
+            raise ValueError('The maximum number of messages must be positive')
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError('The maximum size must be positive')
+        if not 1 <= max_caption_length <= MAX_CAPTION_LENGTH:
+            raise ValueError(f'The caption length must be from 1 to {MAX_CAPTION_LENGTH}')
+
+        self._max_messages = max_messages
+        self._max_bytes = max_bytes
+        self._filename = filename
+        self._caption_format = caption_format
+        self._max_caption_length = max_caption_length
+
+    @property
+    def max_messages(self) -> int | None:
+        """The maximum number of messages a log entry is sent as."""
+
+        return self._max_messages
+
+    def exceeds_size(self, text: str) -> bool:
+        """Check whether the formatted log entry is larger than `max_bytes` in UTF-8."""
+
+        if self._max_bytes is None:
+            return False
+
+        # A character takes from 1 to 4 bytes, so encoding is only needed in between.
+        if len(text) > self._max_bytes:
+            return True
+        if len(text) * 4 <= self._max_bytes:
+            return False
+
+        return len(text.encode(self._ENCODING)) > self._max_bytes
+
+    def exceeds_messages(self, count: int) -> bool:
+        """Check whether the number of messages of the log entry is greater than `max_messages`."""
+
+        return self._max_messages is not None and count > self._max_messages
+
+    def make_document(self, task: DeliveryTask) -> Document:
+        """Prepare the formatted log entry for uploading."""
+
+        return Document(
+            content = task.text.encode(self._ENCODING),
+            filename = self._filename + self._EXTENSIONS.get(
+                task.parse_mode, self._DEFAULT_EXTENSION
+            ),
+            caption = self._make_caption(task),
+        )
+
+    def _make_caption(self, task: DeliveryTask) -> str:
+        """Format the caption from the log record and truncate it to `max_caption_length`."""
+
+        if self._caption_format is None:
+            return ''
+
+        record = task.record
+        message = record.getMessage().partition('\n')[0]
+        fields = {**record.__dict__, 'message': message}
+
+        try:
+            caption = self._caption_format.format(**fields)
+        except (KeyError, IndexError, AttributeError, ValueError):
+            # The caption must not prevent the delivery of the log entry.
+            caption = self._PLAIN_CAPTION_FORMAT.format(**fields)
+
+        if len(caption) > self._max_caption_length:
+            caption = caption[:self._max_caption_length - len(self._ELLIPSIS)] + self._ELLIPSIS
+
+        return caption
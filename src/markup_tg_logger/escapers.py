@@ -0,0 +1,88 @@
+import re
+
+
+HTML_SPECIAL_CHARS = '&<>'
+MARKDOWN_SPECIAL_CHARS = '_*`['
+MARKDOWN_V2_SPECIAL_CHARS = '_*[]()~`>#+-=|{}.!'
+MARKDOWN_V2_CODE_SPECIAL_CHARS = '`\\'
+MARKDOWN_V2_LINK_URL_SPECIAL_CHARS = ')\\'
+
+# Prepends `\` to the matched character.
+_BACKSLASH_REPLACEMENT = r'\\\g<0>'
+
+
+def _make_special_chars_pattern(special_chars: str) -> re.Pattern[str]:
+    """Make a pattern matching any of the characters.
+
+    Most log messages contain no special characters at all. A single search with a precompiled
+    character class finds them faster than escaping does, so the text without special characters
+    is returned as is, and only the text with them is rebuilt.
+    """
+
+    return re.compile(f'[{re.escape(special_chars)}]')
+
+
+# The backslash itself must be escaped as well.
+_MARKDOWN_V2_PATTERN = _make_special_chars_pattern(MARKDOWN_V2_SPECIAL_CHARS + '\\')
+_MARKDOWN_PATTERN = _make_special_chars_pattern(MARKDOWN_SPECIAL_CHARS)
+
+
+def escape_html(text: str) -> str:
+    """Escape text for HTML, both outside and inside code.
+
+    Equivalent to `html.escape(text, quote=False)`: quotes need not be escaped outside of tag
+    attributes. The text without special characters is returned as is.
+
+    Docs:
+        https://core.telegram.org/bots/api#html-style
+    """
+
+    # `str.replace()` returns the original string if there is nothing to replace, and finding
+    # a single character is faster than matching a character class.
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def escape_markdown(text: str) -> str:
+    """Escape text for legacy Markdown outside of code.
+
+    Legacy Markdown has no escaping inside code and link URLs. The text without special characters
+    is returned as is.
+
+    Docs:
+        https://core.telegram.org/bots/api#markdown-style
+    """
+
+    if _MARKDOWN_PATTERN.search(text) is None:
+        return text
+
+    return _MARKDOWN_PATTERN.sub(_BACKSLASH_REPLACEMENT, text)
+
+
+def escape_markdown_v2(text: str) -> str:
+    """Escape text for MarkdownV2 outside of code and link URLs.
+
+    The text without special characters is returned as is.
+
+    Docs:
+        https://core.telegram.org/bots/api#markdownv2-style
+    """
+
+    if _MARKDOWN_V2_PATTERN.search(text) is None:
+        return text
+
+    return _MARKDOWN_V2_PATTERN.sub(_BACKSLASH_REPLACEMENT, text)
+
+
+def escape_markdown_v2_code(text: str) -> str:
+    """Escape text for MarkdownV2 inside inline code and code blocks, where only `` ` `` and `\\`
+    are special.
+    """
+
+    # The backslash is escaped first, so that the added backslashes are not escaped again.
+    return text.replace('\\', '\\\\').replace('`', '\\`')
+
+
+def escape_markdown_v2_link_url(text: str) -> str:
+    """Escape the URL part of a MarkdownV2 link, where only `)` and `\\` are special."""
+
+    return text.replace('\\', '\\\\').replace(')', '\\)')
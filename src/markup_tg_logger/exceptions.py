@@ -1,3 +1,6 @@
+from typing import Any
+
+
 class MarkupTgLoggerException(Exception):
     """Base library exception."""
 
@@ -7,6 +10,51 @@ class SenderError(MarkupTgLoggerException):
 class TelegramApiError(SenderError):
     """Subclass of `SenderError` for errors sent by Telegram server."""
 
+    def __init__(self, message: str, response: dict[str, Any] | None = None) -> None:
+        """
+        Args:
+            message: Error message.
+            response: JSON response of Telegram Bot API, if any.
+        """
+
+        super().__init__(message)
+        self.response: dict[str, Any] = response or {}
+
+    @property
+    def error_code(self) -> int | None:
+        """Error code from the Telegram Bot API response."""
+
+        return self.response.get('error_code')
+
+    @property
+    def retry_after(self) -> float | None:
+        """The number of seconds to wait before the request can be repeated.
+
+        Set by Telegram when the flood control limits are exceeded (error code 429).
+        """
+
+        parameters = self.response.get('parameters')
+        if not isinstance(parameters, dict):
+            return None
+
+        return parameters.get('retry_after')
+
+class DeliveryError(SenderError):
+    """Failed to deliver a log entry to one or more recipients."""
+
+    def __init__(self, errors: dict[int | str, SenderError]) -> None:
+        """
+        Args:
+            errors: The first error for each recipient that did not receive the log entry in full.
+        """
+
+        self.errors = errors
+
+        details = '\n'.join(f'{chat_id}: {error}' for chat_id, error in errors.items())
+        super().__init__(
+            f'Failed to deliver the log entry to {len(errors)} recipient(s):\n{details}'
+        )
+
 class SplitterException(MarkupTgLoggerException):
     """Base exception when working with the `IMessageSplitter` implementation."""
 
@@ -1,9 +1,13 @@
 from .base import BaseMarkupFormatter
 from .escape import EscapeMarkupFormatter
 from .html import HtmlFormatter
+from .markdown_v2 import MarkdownV2Formatter
+from .traceback_budget import TracebackBudget
 
 __all__ = [
     'BaseMarkupFormatter',
     'EscapeMarkupFormatter',
     'HtmlFormatter',
+    'MarkdownV2Formatter',
+    'TracebackBudget',
 ]
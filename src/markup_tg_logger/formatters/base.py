@@ -1,9 +1,11 @@
-from collections.abc import Mapping
+from collections.abc import Hashable, Mapping
 from logging import Formatter, LogRecord
 from typing import override, Any
 
 from ..defaults import DEFAULT_LEVEL_NAMES
-from ..types import ParseMode, FormatStyle
+from ..types import ParseMode, FormatStyle, SysExcInfoType
+from .format_plan import FormatPlan, ScratchRecord
+from .traceback_cache import TRACEBACK_CACHE, TracebackCache
 
 
 class BaseMarkupFormatter(Formatter):
@@ -14,10 +16,22 @@ class BaseMarkupFormatter(Formatter):
     The formatter behaves like the standard `logging.Formatter`, optionally replacing the
     displayedlevel names. It does not use escaping.
 
-    To add escaping, create a derived class and override the methods `_pre_format` and
-    `_post_format`. Also, if necessary, use the methods `formatMesage`, `formatException` and
-    `formatStack`, which are inherited from `logging.Formatter`. Or use the derived classes
-    included in the library.
+    The log record is not modified, so other handlers of the logger receive it unchanged. The
+    message is interpolated once and stored in a scratch copy of the record, which is prepared by
+    `_pre_format` and substituted into the `fmt` string. Only the raw traceback is cached in the
+    `exc_text` attribute, as `logging.Formatter` does.
+
+    The `fmt` string is compiled into a `FormatPlan` on creation. Only the record attributes
+    referenced in `fmt` are fetched, and `asctime` is computed only if it is referenced.
+
+    Marked up tracebacks are stored in the shared `TracebackCache`, so the traceback of an exception
+    logged many times is rendered once. Derived classes whose traceback output depends on their
+    settings must include them in `_get_traceback_cache_key`.
+
+    To add escaping, create a derived class and override the methods `_pre_format`,
+    `_mark_up_exception`, `_mark_up_stack` and `_post_format`. Also, if necessary, use the methods
+    `formatMesage`, `formatException` and `formatStack`, which are inherited from
+    `logging.Formatter`. Or use the derived classes included in the library.
 
     Docs:
         `logging.Formatter`: https://docs.python.org/3/library/logging.html#logging.Formatter.
@@ -70,6 +84,8 @@ class BaseMarkupFormatter(Formatter):
 
         self._level_names = level_names
         self._parse_mode: ParseMode = parse_mode
+        self._format_plan = FormatPlan(self._fmt or '', style, defaults)
+        self._traceback_cache: TracebackCache | None = TRACEBACK_CACHE
 
     @property
     def parse_mode(self) -> ParseMode:
@@ -79,28 +95,143 @@ class BaseMarkupFormatter(Formatter):
     
     @override
     def format(self, record: LogRecord) -> str:
-        self._pre_format(record)
-        text = super().format(record)
+        scratch = self._make_scratch_record(record)
+        self._pre_format(scratch)
+
+        if self._format_plan.uses('asctime'):
+            scratch.asctime = self.formatTime(scratch, self.datefmt)
+
+        text = self.formatMessage(scratch)
+
+        exception_text = self._format_exception_text(record)
+        if exception_text:
+            if text[-1:] != '\n':
+                text += '\n'
+            text += exception_text
+
+        if record.stack_info:
+            if text[-1:] != '\n':
+                text += '\n'
+            text += self._mark_up_stack(self.formatStack(record.stack_info))
+
         text = self._post_format(text)
         
         return text
 
+    @override
+    def formatMessage(self, record: LogRecord) -> str:
+        return self._format_plan.render(record)
+
+    @override
+    def usesTime(self) -> bool:
+        return self._format_plan.uses('asctime')
+
+    def _make_scratch_record(self, record: LogRecord) -> LogRecord:
+        """Make a scratch copy of the log record for formatting.
+
+        The message is interpolated once and stored in both the `message` and `msg` attributes of
+        the copy, so that it can be escaped without interpolating the arguments again.
+        """
+
+        return ScratchRecord(record)
+
+    def _format_exception_text(self, record: LogRecord) -> str:
+        """Render and mark up the traceback of the log record.
+
+        The marked up traceback is taken from the traceback cache if the exception has already been
+        rendered with the same configuration. Otherwise, unless `_render_exception()` renders it
+        separately, the raw traceback is cached in the `exc_text` attribute of the record, as
+        `logging.Formatter` does.
+
+        Returns:
+            An empty string if the record has no exception.
+        """
+
+        if not record.exc_info:
+            return self._mark_up_exception(record.exc_text) if record.exc_text else ''
+
+        key = self._get_traceback_cache_key()
+        if self._traceback_cache is not None:
+            text = self._traceback_cache.get(record.exc_info, key)
+            if text is not None:
+                return text
+
+        raw_text = self._render_exception(record.exc_info)
+
+        if raw_text is None:
+            # The traceback rendered by another formatter may differ, so it is not cached.
+            if record.exc_text:
+                return self._mark_up_exception(record.exc_text)
+
+            record.exc_text = raw_text = self.formatException(record.exc_info)
+
+        text = self._mark_up_exception(raw_text)
+
+        if self._traceback_cache is not None:
+            self._traceback_cache.put(record.exc_info, key, text)
+
+        return text
+
+    def _render_exception(self, ei: SysExcInfoType) -> str | None:
+        """Render the traceback specifically for this formatter.
+
+        The result is not stored in the `exc_text` attribute of the record, which is shared with
+        the other handlers of the logger, and `exc_text` already set by them is not used.
+
+        Returns:
+            `None` in this implementation, which means that the standard traceback of
+            `formatException()` cached in `exc_text` is used.
+        """
+
+        return None
+
+    def _get_traceback_cache_key(self) -> Hashable:
+        """Get the key of the settings that affect the marked up traceback.
+
+        Formatters with equal keys share the tracebacks in the cache.
+        """
+
+        return (type(self), )
+
     def _pre_format(self, record: LogRecord) -> None:
         """Prepare log entry for formatting.
 
-        The method will be called before calling `logging.Formatter.format()`.
-        By default, it only calls the `_replace_level_name()` method.
+        The method will be called before substituting the record into the `fmt` string. By default,
+        it only calls the `_replace_level_name()` method.
 
         Args:
-            record: A log entry that requires formatting.
+            record: A scratch copy of the log entry with the interpolated `message` attribute.
+                It can be modified freely, the original record is not affected.
         """
 
         self._replace_level_name(record)
 
+    def _mark_up_exception(self, text: str) -> str:
+        """Prepare the traceback output for inserting into the log entry.
+
+        Does nothing in this implementation. Designed to be overridden in derived classes.
+
+        Args:
+            text: Traceback output of `formatException()`.
+        """
+
+        return text
+
+    def _mark_up_stack(self, text: str) -> str:
+        """Prepare the stack output for inserting into the log entry.
+
+        Does nothing in this implementation. Designed to be overridden in derived classes.
+
+        Args:
+            text: Stack output of `formatStack()`.
+        """
+
+        return text
+
     def _post_format(self, text: str) -> str:
         """Additional operations with text after formatting.
         
-        The method will be called after `logging.Formatter.format()` is called. Does nothing
+        The method will be called after the message, traceback and stack are joined. Does nothing
         in this implementation. Designed to be overridden in derived classes.
 
         Args:
@@ -115,5 +246,6 @@ class BaseMarkupFormatter(Formatter):
         The name will remain unchanged unless an alternative name is specified in `_level_names`.
         """
 
-        if record.levelno in self._level_names.keys():
-            record.levelname = self._level_names[record.levelno]
+        level_name = self._level_names.get(record.levelno)
+        if level_name is not None:
+            record.levelname = level_name
@@ -1,10 +1,13 @@
-from collections.abc import Mapping
+from collections.abc import Hashable, Mapping
 from logging import LogRecord
 from typing import override, Any
 
 from ..defaults import DEFAULT_LEVEL_NAMES
-from ..types import FormatStyle, SysExcInfoType, EscapeFunc, ParseMode
+from ..resolve_object_from_config import resolve_object_from_config
+from ..types import FormatStyle, EscapeFunc, ParseMode, SysExcInfoType
 from .base import BaseMarkupFormatter
+from .format_plan import compile_template
+from .traceback_budget import TracebackBudget
     
 
 class EscapeMarkupFormatter(BaseMarkupFormatter):
@@ -12,13 +15,13 @@ class EscapeMarkupFormatter(BaseMarkupFormatter):
 
     Example for HTML:
     ```python
-    import html
+    from markup_tg_logger.escapers import escape_html
 
     formatter = EscapeMarkupFormatter(
         fmt = '<b>{levelname}</b> <u>{asctime}</u> <i>{message}</i> <code>{pathname}</code>',
         style = '{',
         parse_mode = 'HTML',
-        escape_func = lambda text: html.escape(text, quote=False),
+        escape_func = escape_html,
         stack_info_tamplate = '<code>{text}</code>',
         exception_template = '<code>{text}</code>',
     )
@@ -44,6 +47,7 @@ class EscapeMarkupFormatter(BaseMarkupFormatter):
         stack_info_template: str = '{text}',
         exception_template: str = '{text}',
         result_template: str = '{text}',
+        traceback_budget: TracebackBudget | dict[str, Any] | None = None,
     ) -> None:
         """
         Args:
@@ -88,6 +92,10 @@ class EscapeMarkupFormatter(BaseMarkupFormatter):
                 includes the result of substitution into the `fmt` string, stack info and exception
                 traceback. For example, `'<code>{text}</code>'` for HTML. By default, does not
                 change the text.
+            traceback_budget: Policy of limiting the size of the traceback output. The traceback
+                is cut before escaping, so the cost of escaping and splitting is bounded. If `None`
+                (the default), the traceback is not limited. A dictionary can be specified to
+                support configuration from a file.
 
         There is no separate `message_template` parameter in templates, since this functionality is
         implemented through the standard `fmt` string. For example, `fmt = '<code>{message}</code>'`.
@@ -104,57 +112,83 @@ class EscapeMarkupFormatter(BaseMarkupFormatter):
         )
 
         self._escape_func = escape_func
+        # Derived classes may escape some parts differently, for example, inside code blocks.
+        self._stack_info_escape_func = escape_func
+        self._exception_escape_func = escape_func
+        self._result_escape_func = escape_func
         self._escape_message = escape_message
         self._escape_stack_info = escape_stack_info
         self._escape_excpetion = escape_exception
         self._escape_result = escape_result
-        self._stack_info_template = stack_info_template
         self._exception_template = exception_template
-        self._result_template = result_template
+        self._stack_info_markup = compile_template(stack_info_template)
+        self._exception_markup = compile_template(exception_template)
+        self._result_markup = compile_template(result_template)
+        self._traceback_budget: TracebackBudget | None
+
+        if isinstance(traceback_budget, dict):
+            self._traceback_budget = resolve_object_from_config(traceback_budget, TracebackBudget)
+        else:
+            self._traceback_budget = traceback_budget
+
+    @override
+    def _render_exception(self, ei: SysExcInfoType) -> str | None:
+        # The limited traceback is only sent to Telegram, the other handlers of the logger receive
+        # the full one in `exc_text`.
+        if self._traceback_budget is None or ei[1] is None:
+            return super()._render_exception(ei)
+
+        return self._traceback_budget.format_exception(ei)
     
     @override
-    def formatMessage(self, record: LogRecord) -> str:
-        if record.getMessage() and self._escape_message:
-            record.msg = self._escape_func(record.getMessage())
+    def _pre_format(self, record: LogRecord) -> None:
+        if record.message and self._escape_message:
+            record.message = record.msg = self._escape_func(record.message)
+
+        super()._pre_format(record)
 
-        return super().formatMessage(record)
+    @override
+    def _get_traceback_cache_key(self) -> Hashable:
+        return (
+            super()._get_traceback_cache_key(),
+            self._escape_excpetion,
+            self._exception_escape_func,
+            self._exception_template,
+            self._traceback_budget,
+        )
 
     @override
-    def formatException(self, ei: SysExcInfoType) -> str:
-        text = super().formatException(ei)
+    def _mark_up_exception(self, text: str) -> str:
+        text = super()._mark_up_exception(text)
 
         if self._escape_excpetion:
-            text = self._escape_func(text)
+            text = self._exception_escape_func(text)
 
-        text = self._exception_template.format(text=text)
+        if self._exception_markup is not None:
+            text = self._exception_markup(text)
 
         return text
-    
+
     @override
-    def formatStack(self, stack_info: str) -> str:
-        text = super().formatStack(stack_info)
+    def _mark_up_stack(self, text: str) -> str:
+        text = super()._mark_up_stack(text)
 
         if self._escape_stack_info:
-            text = self._escape_func(text)
+            text = self._stack_info_escape_func(text)
 
-        text = self._stack_info_template.format(text=text)
+        if self._stack_info_markup is not None:
+            text = self._stack_info_markup(text)
 
         return text
-    
-    @override
-    def _pre_format(self, record: LogRecord) -> None:
-        if record.getMessage() and self._escape_message:
-            record.msg = self._escape_func(record.getMessage())
-
-        super()._pre_format(record)
 
     @override
     def _post_format(self, text: str) -> str:
         text = super()._post_format(text)
 
         if self._escape_result:
-            text = self._escape_func(text)
+            text = self._result_escape_func(text)
 
-        text = self._result_template.format(text=text)
+        if self._result_markup is not None:
+            text = self._result_markup(text)
 
         return text
@@ -0,0 +1,179 @@
+from collections.abc import Callable, Iterator, Mapping
+from logging import LogRecord
+import re
+from string import Formatter, Template
+from typing import Any
+
+from ..types import EscapeFunc, FormatStyle
+
+
+# Escaped percent signs `%%` are literal text, so `%%(name)s` is not a field.
+_PERCENT_FIELD_PATTERN = re.compile(r'(?<!%)(?:%%)*%\((\w+)\)')
+_FIELD_NAME_PATTERN = re.compile(r'[^.\[]*')
+_IDENTITY_TEMPLATE_PARTS = ('', '')
+_MISSING = object()
+_NO_OVERRIDES: dict[str, Any] = {}
+
+_string_formatter = Formatter()
+
+
+class ScratchRecord(LogRecord):
+    """Scratch copy of a log record for formatting.
+
+    Only the attributes prepared for formatting, such as the interpolated message, are stored in
+    the copy. The other attributes are read from the source record on access, so the record is not
+    copied as a whole.
+    """
+
+    def __init__(self, record: LogRecord) -> None:
+        """
+        Args:
+            record: The source log record. It is not modified.
+        """
+
+        self.source = record
+
+        message = record.getMessage()
+        self.message = message
+        self.msg = message
+        self.args = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Not set yet if the copy is created without `__init__()`, for example, by `copy.copy()`.
+        if name == 'source':
+            raise AttributeError(name)
+
+        return getattr(self.source, name)
+
+
+class FormatPlan:
+    """The `fmt` string of a formatter compiled for its style.
+
+    The names of the record attributes referenced in `fmt` are extracted once on creation, and
+    the substitution method of the style is selected once. Rendering fetches only the referenced
+    attributes, so unused fields, such as `asctime`, need not be computed and the record
+    attributes are not copied.
+    """
+
+    __slots__ = ('_fields', '_defaults', '_substitute')
+
+    def __init__(
+        self,
+        fmt: str,
+        style: FormatStyle,
+        defaults: Mapping[str, Any] | None = None,
+    ) -> None:
+        """
+        Args:
+            fmt: A format string in the given style.
+            style: One of `%`, `{` or `$`, as in `logging.Formatter`.
+            defaults: Default values of the fields that are missing from the record.
+        """
+
+        self._defaults = dict(defaults or {})
+        self._substitute: Callable[[dict[str, Any]], str]
+
+        if style == '%':
+            self._fields = tuple(dict.fromkeys(_PERCENT_FIELD_PATTERN.findall(fmt)))
+            self._substitute = fmt.__mod__
+        elif style == '{':
+            self._fields = tuple(dict.fromkeys(_iter_str_format_fields(fmt)))
+            self._substitute = fmt.format_map
+        else:
+            template = Template(fmt)
+            self._fields = tuple(dict.fromkeys(
+                match['named'] or match['braced']
+                for match in template.pattern.finditer(fmt)
+                if match['named'] or match['braced']
+            ))
+            self._substitute = template.substitute
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """Names of the record attributes referenced in `fmt` in the order of appearance."""
+
+        return self._fields
+
+    def uses(self, field: str) -> bool:
+        """Check whether `fmt` references the record attribute."""
+
+        return field in self._fields
+
+    def render(self, record: LogRecord) -> str:
+        """Substitute the referenced attributes of the record into `fmt`.
+
+        Raises:
+            ValueError: A referenced attribute is missing from the record and has no default
+                value.
+        """
+
+        if isinstance(record, ScratchRecord):
+            overrides, attributes = record.__dict__, record.source.__dict__
+        else:
+            overrides, attributes = _NO_OVERRIDES, record.__dict__
+
+        # Fast path: all fields are instance attributes.
+        try:
+            values = {
+                name: overrides[name] if name in overrides else attributes[name]
+                for name in self._fields
+            }
+        except KeyError:
+            pass
+        else:
+            return self._substitute(values)
+
+        values = {}
+
+        for name in self._fields:
+            value = getattr(record, name, _MISSING)
+
+            if value is _MISSING:
+                if name not in self._defaults:
+                    raise ValueError(f'Formatting field not found in record: {name!r}')
+                value = self._defaults[name]
+
+            values[name] = value
+
+        return self._substitute(values)
+
+
+def _iter_str_format_fields(fmt: str) -> Iterator[str]:
+    """Extract the names of the top-level fields of a `str.format()` string, including the fields
+    nested in format specifications."""
+
+    for _, field_name, format_spec, _ in _string_formatter.parse(fmt):
+        if field_name is not None:
+            match = _FIELD_NAME_PATTERN.match(field_name)
+            assert match is not None
+            yield match[0]
+        if format_spec:
+            yield from _iter_str_format_fields(format_spec)
+
+
+def compile_template(template: str) -> EscapeFunc | None:
+    """Compile a template with the `{text}` parameter into a function.
+
+    Templates that only contain `{text}` and literal text are rendered by joining the precomputed
+    literal parts with the text, other templates fall back to `str.format()`.
+
+    Returns:
+        `None` for the identity template `'{text}'`, which does not change the text.
+    """
+
+    parts = ['']
+
+    for literal, field_name, format_spec, conversion in _string_formatter.parse(template):
+        parts[-1] += literal
+
+        if field_name is None:
+            continue
+        if field_name != 'text' or format_spec or conversion is not None:
+            return lambda text: template.format(text=text)
+
+        parts.append('')
+
+    if tuple(parts) == _IDENTITY_TEMPLATE_PARTS:
+        return None
+
+    return lambda text: text.join(parts)
@@ -1,10 +1,11 @@
 from collections.abc import Mapping
-import html
 from typing import override, Any
 
 from ..defaults import DEFAULT_LEVEL_NAMES
+from ..escapers import escape_html
 from ..types import FormatStyle, EscapeFunc
 from .escape import EscapeMarkupFormatter
+from .traceback_budget import TracebackBudget
     
 
 class HtmlFormatter(EscapeMarkupFormatter):
@@ -81,14 +82,15 @@ class HtmlFormatter(EscapeMarkupFormatter):
         *,
         defaults: Mapping[str, Any] | None = None,
         level_names: dict[int, str] = DEFAULT_LEVEL_NAMES,
-        escape_func: EscapeFunc = lambda text: html.escape(text, quote=False),
+        escape_func: EscapeFunc = escape_html,
         escape_message: bool = True,
         escape_stack_info: bool = True,
         escape_exception: bool = True,
         escape_result: bool = False,
         stack_info_template: str = '{text}',
         exception_template: str = '{text}',
-        result_template: str = '{text}'
+        result_template: str = '{text}',
+        traceback_budget: TracebackBudget | dict[str, Any] | None = None,
     ) -> None:
         """
         Args:
@@ -113,8 +115,7 @@ class HtmlFormatter(EscapeMarkupFormatter):
                 with colored emoji. The dictionary does not have to override all level names.
                 To use the default names, use `level_names = {}`.
             escape_func: The function that will be used to escape special characters. By default,
-                the `escape` function with `quote=False` from the `html` module of the standard
-                library is used. 
+                `escape_html`, which is equivalent to `html.escape(text, quote=False)`.
             escape_message: If `True`(the default), escape the log message text.
             escape_stack_info: If `True` (the default), escape stack output.
             escape_exception: If `True` (the default), escape traceback exception output.
@@ -131,6 +132,10 @@ class HtmlFormatter(EscapeMarkupFormatter):
                 marking up the resulting message after all formatting. The `text` parameter
                 includes the result of substitution into the `fmt` string, stack info and exception
                 traceback. For example, `'<code>{text}</code>'`. By default, does not change the text.
+            traceback_budget: Policy of limiting the size of the traceback output. The traceback
+                is cut before escaping, so the cost of escaping and splitting is bounded. If `None`
+                (the default), the traceback is not limited. A dictionary can be specified to
+                support configuration from a file.
 
         There is no separate `message_template` parameter in templates, since this functionality is
         implemented through the standard `fmt` string. For example, `fmt = '<code>{message}</code>'`.
@@ -152,4 +157,5 @@ class HtmlFormatter(EscapeMarkupFormatter):
             stack_info_template = stack_info_template,
             exception_template = exception_template,
             result_template = result_template,
+            traceback_budget = traceback_budget,
         )
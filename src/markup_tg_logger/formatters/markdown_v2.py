@@ -0,0 +1,154 @@
+from collections.abc import Mapping
+from typing import override, Any
+
+from ..defaults import DEFAULT_LEVEL_NAMES
+from ..escapers import escape_markdown_v2, escape_markdown_v2_code
+from ..types import FormatStyle, EscapeFunc
+from .escape import EscapeMarkupFormatter
+from .traceback_budget import TracebackBudget
+
+
+class MarkdownV2Formatter(EscapeMarkupFormatter):
+    """A formatter for using MarkdownV2 markup and flexible escaping settings.
+
+    Equivalent to `EscapeMarkupFormatter` with `parse_mode` and `escape_func` parameters preset.
+    The use cases are the same as for `HtmlFormatter`.
+
+    In MarkdownV2, the set of special characters depends on the context: inside inline code and
+    code blocks only `` ` `` and `\\` are escaped. Therefore, if a template places `{text}` inside
+    code, the stack info, traceback or result is escaped with `code_escape_func` instead of
+    `escape_func`.
+
+    ```python
+    from markup_tg_logger.defaults import MARKDOWN_V2_PYTHON_TEMPLATE
+
+    formatter = MarkdownV2Formatter(
+        fmt = '*{levelname}* `{name}` _{message}_',
+        style = '{',
+        exception_template = MARKDOWN_V2_PYTHON_TEMPLATE,
+    )
+    ```
+
+    The `MARKDOWN_V2_PYTHON_TEMPLATE` constant is a code block template with python syntax
+    highlighting. For bash, use `MARKDOWN_V2_BASH_TEMPLATE`.
+
+    Only the message, stack info and traceback are escaped. Special characters in the `fmt` string
+    and in other record attributes, such as `.` in logger names and `-` in dates, must be escaped
+    manually or placed inside inline code, as `{name}` in the example above.
+    """
+
+    @override
+    def __init__(
+        self,
+        fmt: str | None = None,
+        datefmt: str | None = None,
+        style: FormatStyle = '%',
+        validate: bool = True,
+        *,
+        defaults: Mapping[str, Any] | None = None,
+        level_names: dict[int, str] = DEFAULT_LEVEL_NAMES,
+        escape_func: EscapeFunc = escape_markdown_v2,
+        code_escape_func: EscapeFunc = escape_markdown_v2_code,
+        escape_message: bool = True,
+        escape_stack_info: bool = True,
+        escape_exception: bool = True,
+        escape_result: bool = False,
+        stack_info_template: str = '{text}',
+        exception_template: str = '{text}',
+        result_template: str = '{text}',
+        traceback_budget: TracebackBudget | dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Args:
+            fmt: A format string in the given style for the logged output as a whole. The possible
+                mapping keys are drawn from the `LogRecord` object's `LogRecord` attributes. If not
+                specified, `%(message)s` is used, which is just the logged message.
+            datefmt: A format string in the given style for the date/time portion of the logged
+                output. If not specified, the default described in `formatTime()` is used.
+            style: Can be one of `%`, `{` or `$` and determines how the format string will be
+                merged with its data: using one of printf-style String Formatting (%),
+                `str.format()` ({) or string.Template ($). This only applies to fmt and datefmt
+                (e.g. `%(message)s` versus `{message}`), not to the actual log messages passed
+                to the logging methods. However, there are other ways to use {- and $-formatting
+                for log messages.
+            validate:  If `True` (the default), incorrect or mismatched `fmt` and `style` will
+                raise a `ValueError`; for example, `MarkdownV2Formatter('%(message)s', style='{')`.
+            defaults:
+                A dictionary with default values to use in custom fields. For example,
+                `MarkdownV2Formatter('%(ip)s %(message)s', defaults={"ip": None})`.
+            level_names: Mapping between numeric logging level IDs and their names. For example,
+                `{30: 'WARN'}` or `{logging.WARNING: 'WARN'}`. By default, names will be appended
+                with colored emoji. The dictionary does not have to override all level names.
+                To use the default names, use `level_names = {}`.
+            escape_func: The function that will be used to escape special characters outside of
+                code. By default, `escape_markdown_v2`.
+            code_escape_func: The function that will be used to escape the stack info, traceback
+                and result if their template places them inside code. By default,
+                `escape_markdown_v2_code`.
+            escape_message: If `True`(the default), escape the log message text.
+            escape_stack_info: If `True` (the default), escape stack output.
+            escape_exception: If `True` (the default), escape traceback exception output.
+            escape_result: If `True`, escape the resulting message after all formatting. To enable
+                this option, it is recommended to disable `escape_message`, `escape_stack_info`and
+                `escape_exception` to avoid repeated escaping.
+            stack_info_template: A template string with a single required parameter `{text}` for
+                marking up stack info text. For example, `'```\\n{text}\\n```'`. By default, does
+                not change the text.
+            exception_template: A template string with a single required parameter `{text}` for
+                marking up the traceback output. For example, `'```\\n{text}\\n```'`. By default,
+                does not change the text.
+            result_template: A template string with a single required parameter `{text}` for
+                marking up the resulting message after all formatting. The `text` parameter
+                includes the result of substitution into the `fmt` string, stack info and exception
+                traceback. For example, `'```\\n{text}\\n```'`. By default, does not change the
+                text.
+            traceback_budget: Policy of limiting the size of the traceback output. The traceback
+                is cut before escaping, so the cost of escaping and splitting is bounded. If `None`
+                (the default), the traceback is not limited. A dictionary can be specified to
+                support configuration from a file.
+
+        There is no separate `message_template` parameter in templates, since this functionality is
+        implemented through the standard `fmt` string. For example, `fmt = '`{message}`'`.
+        """
+
+        super().__init__(
+            fmt = fmt,
+            datefmt = datefmt,
+            style = style,
+            validate = validate,
+            defaults = defaults,
+            level_names = level_names,
+            parse_mode = 'MarkdownV2',
+            escape_func = escape_func,
+            escape_message = escape_message,
+            escape_stack_info = escape_stack_info,
+            escape_exception = escape_exception,
+            escape_result = escape_result,
+            stack_info_template = stack_info_template,
+            exception_template = exception_template,
+            result_template = result_template,
+            traceback_budget = traceback_budget,
+        )
+
+        if self._is_code_template(stack_info_template):
+            self._stack_info_escape_func = code_escape_func
+        if self._is_code_template(exception_template):
+            self._exception_escape_func = code_escape_func
+        if self._is_code_template(result_template):
+            self._result_escape_func = code_escape_func
+
+    @staticmethod
+    def _is_code_template(template: str) -> bool:
+        """Check whether the template places `{text}` inside inline code or a code block.
+
+        The markup before `{text}` opens code if it contains an odd number of code block markers
+        or, outside of them, an odd number of backticks.
+        """
+
+        prefix = template.partition('{text}')[0]
+        block_markers = prefix.count('```')
+
+        if block_markers % 2 == 1:
+            return True
+
+        return (prefix.count('`') - 3 * block_markers) % 2 == 1
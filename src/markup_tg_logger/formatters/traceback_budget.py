@@ -0,0 +1,203 @@
+from collections.abc import Iterator
+import reprlib
+from traceback import FrameSummary, StackSummary, TracebackException, walk_tb
+from types import FrameType, TracebackType
+from typing import Any, override
+
+from ..types import SysExcInfoType
+
+
+class _TruncatedStackSummary(StackSummary):
+    """Stack with the middle frames omitted."""
+
+    head_length: int
+    omitted_count: int
+
+    @override
+    def format(self, **kwargs: Any) -> list[str]:
+        lines = StackSummary(self[:self.head_length]).format(**kwargs)
+        lines.append(f'  [... {self.omitted_count} frames omitted ...]\n')
+        lines.extend(StackSummary(self[self.head_length:]).format(**kwargs))
+
+        return lines
+
+
+class TracebackBudget:
+    """Policy of limiting the size of the traceback output.
+
+    Deep recursion or long chains of exceptions produce tracebacks of hundreds of kilobytes, which
+    are split into dozens of messages. The budget is applied when the traceback is rendered, before
+    escaping, so the cost of escaping and splitting is bounded regardless of the size of the
+    exception.
+
+    - Only the first `head_frames` and the last `tail_frames` frames of each stack are rendered,
+    the omitted frames are replaced with a line with their number. Repeated frames are collapsed by
+    the `traceback` module into a `[Previous line repeated N more times]` line.
+    - Lines longer than `max_line_length` characters, such as huge exception messages, are cut.
+    - If the whole output is longer than `max_length` characters, its beginning and end are kept,
+    and the lines in the middle are omitted.
+    - With `capture_locals`, local variables of the rendered frames are displayed, and their reprs
+    are limited to `max_local_length` characters.
+    """
+
+    _ELLIPSIS = '...'
+
+    def __init__(
+        self,
+        head_frames: int = 5,
+        tail_frames: int = 15,
+        max_line_length: int | None = 1000,
+        max_length: int | None = 16000,
+        capture_locals: bool = False,
+        max_local_length: int = 100,
+    ) -> None:
+        """
+        Args:
+            head_frames: The number of the outermost frames rendered for each stack.
+            tail_frames: The number of the innermost frames, the closest to the error, rendered for
+                each stack.
+            max_line_length: Lines longer than this number of characters are cut. If `None`,
+                the line length is not limited.
+            max_length: The maximum length of the traceback output in characters. If `None`,
+                the output length is not limited.
+            capture_locals: If `True`, display local variables of the rendered frames.
+            max_local_length: Reprs of local variables longer than this number of characters
+                are cut.
+
+        Raises:
+            ValueError: Invalid number of frames or length.
+        """
+
+        if head_frames < 0 or tail_frames < 1:
+            raise ValueError('At least one innermost frame must be rendered')
+        if max_line_length is not None and max_line_length <= len(self._ELLIPSIS):
+            raise ValueError(f'The line length must be greater than {len(self._ELLIPSIS)}')
+        if max_length is not None and max_length < 1:
+            raise ValueError('The traceback length must be positive')
+        if max_local_length <= len(self._ELLIPSIS):
+            raise ValueError(f'The repr length must be greater than {len(self._ELLIPSIS)}')
+
+        self._head_frames = head_frames
+        self._tail_frames = tail_frames
+        self._max_line_length = max_line_length
+        self._max_length = max_length
+        self._capture_locals = capture_locals
+        self._repr = reprlib.Repr(maxstring=max_local_length, maxother=max_local_length)
+
+    def format_exception(self, ei: SysExcInfoType) -> str:
+        """Render the traceback within the budget.
+
+        Returns:
+            The traceback output in the format of `logging.Formatter.formatException()`.
+        """
+
+        exc_type, exc_value, exc_traceback = ei
+        traceback_exception = TracebackException(
+            exc_type, # type: ignore[arg-type]
+            exc_value, # type: ignore[arg-type]
+            exc_traceback,
+            lookup_lines = False,
+        )
+
+        self._limit_stacks(traceback_exception, exc_value, exc_traceback, set())
+        lines = ''.join(traceback_exception.format()).rstrip('\n').split('\n')
+
+        if self._max_line_length is not None:
+            lines = [self._cut_line(line, self._max_line_length) for line in lines]
+
+        text = '\n'.join(lines)
+
+        if self._max_length is not None and len(text) > self._max_length:
+            text = self._cut_middle(text, self._max_length)
+
+        return text
+
+    def _limit_stacks(
+        self,
+        traceback_exception: TracebackException,
+        exception: BaseException | None,
+        traceback: TracebackType | None,
+        seen: set[int],
+    ) -> None:
+        """Omit the middle frames and capture locals of the rendered frames in the exception and
+        the chained exceptions."""
+
+        if id(traceback_exception) in seen:
+            return
+        seen.add(id(traceback_exception))
+
+        stack = traceback_exception.stack
+        frames = [frame for frame, _ in walk_tb(traceback)]
+        kept = self._head_frames + self._tail_frames
+
+        if self._capture_locals and len(frames) == len(stack):
+            for frame_summary, frame in self._iter_kept_frames(stack, frames):
+                frame_summary.locals = self._repr_locals(frame)
+
+        if len(stack) > kept:
+            truncated = _TruncatedStackSummary(
+                stack[:self._head_frames] + stack[len(stack) - self._tail_frames:]
+            )
+            truncated.head_length = self._head_frames
+            truncated.omitted_count = len(stack) - kept
+            traceback_exception.stack = truncated
+
+        chained: list[tuple[TracebackException | None, BaseException | None]] = [
+            (traceback_exception.__cause__, getattr(exception, '__cause__', None)),
+            (traceback_exception.__context__, getattr(exception, '__context__', None)),
+        ]
+        chained.extend(zip(
+            traceback_exception.exceptions or [],
+            getattr(exception, 'exceptions', None) or [],
+        ))
+
+        for chained_traceback_exception, chained_exception in chained:
+            if chained_traceback_exception is not None:
+                self._limit_stacks(
+                    chained_traceback_exception,
+                    chained_exception,
+                    getattr(chained_exception, '__traceback__', None),
+                    seen,
+                )
+
+    def _iter_kept_frames(
+        self,
+        stack: StackSummary,
+        frames: list[FrameType],
+    ) -> Iterator[tuple[FrameSummary, FrameType]]:
+        """Iterate over the frames that remain after omitting the middle ones."""
+
+        for index, (frame_summary, frame) in enumerate(zip(stack, frames)):
+            if index < self._head_frames or index >= len(stack) - self._tail_frames:
+                yield frame_summary, frame
+
+    def _repr_locals(self, frame: FrameType) -> dict[str, str]:
+        """Make limited reprs of the local variables of the frame."""
+
+        return {name: self._repr.repr(value) for name, value in frame.f_locals.items()}
+
+    def _cut_line(self, line: str, max_length: int) -> str:
+        """Cut the line to `max_length` characters."""
+
+        if len(line) <= max_length:
+            return line
+
+        return line[:max_length - len(self._ELLIPSIS)] + self._ELLIPSIS
+
+    @staticmethod
+    def _cut_middle(text: str, max_length: int) -> str:
+        """Keep the beginning and the end of the text, `max_length` characters in total, and
+        replace the whole lines in the middle with a line with the number of omitted characters."""
+
+        head = text[:max_length // 2]
+        tail = text[len(text) - max_length // 2:]
+
+        # Only whole lines are kept, unless the text has no line breaks.
+        if '\n' in head:
+            head = head[:head.rindex('\n')]
+        if '\n' in tail:
+            tail = tail[tail.index('\n') + 1:]
+
+        omitted_count = len(text) - len(head) - len(tail)
+
+        return f'{head}\n[... {omitted_count} characters omitted ...]\n{tail}'
@@ -0,0 +1,151 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+import threading
+import weakref
+
+from ..types import SysExcInfoType
+
+
+class _Entry:
+    """Rendered tracebacks of one exception."""
+
+    __slots__ = ('get_exception', 'traceback_id', 'texts')
+
+    def __init__(
+        self,
+        get_exception: Callable[[], BaseException | None],
+        traceback_id: int,
+    ) -> None:
+        self.get_exception = get_exception
+        self.traceback_id = traceback_id
+        self.texts: dict[Hashable, str] = {}
+
+
+class TracebackCache:
+    """Cache of rendered tracebacks.
+
+    The same exception is often logged by several handlers or several times while the error storm
+    lasts. The cache keeps the traceback text already rendered, escaped and marked up by
+    a formatter, so that it is rendered once per exception instead of once per log record.
+
+    Texts are keyed by the exception identity and by a key of the formatter configuration, so
+    formatters with the same configuration share the rendered text. An entry is only valid for the
+    traceback the exception had when it was rendered: if the exception is raised again and its
+    traceback grows, it is rendered again.
+
+    The cache does not prolong the life of the exceptions that support weak references, such as
+    instances of user-defined exception classes. Built-in exceptions do not support weak references
+    and are kept alive until evicted, so the number of entries is bounded by `max_size` and the
+    least recently used entries are evicted first.
+
+    Thread-safe.
+    """
+
+    def __init__(self, max_size: int = 64) -> None:
+        """
+        Args:
+            max_size: The maximum number of exceptions whose tracebacks are cached.
+
+        Raises:
+            ValueError: Invalid `max_size` value.
+        """
+
+        if max_size < 1:
+            raise ValueError('The traceback cache size must be positive')
+
+        self._max_size = max_size
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, exc_info: SysExcInfoType, key: Hashable) -> str | None:
+        """Get the rendered traceback of the exception.
+
+        Args:
+            exc_info: Exception info of the log record.
+            key: Key of the formatter configuration.
+
+        Returns:
+            `None` if the traceback has not been rendered with this configuration.
+        """
+
+        exception, traceback = exc_info[1], exc_info[2]
+        if exception is None or traceback is not exception.__traceback__:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(id(exception))
+
+            if not self._is_valid(entry, exception):
+                return None
+
+            assert entry is not None
+            self._entries.move_to_end(id(exception))
+
+            return entry.texts.get(key)
+
+    def put(self, exc_info: SysExcInfoType, key: Hashable, text: str) -> None:
+        """Store the rendered traceback of the exception.
+
+        Exception info with a traceback that is not the current traceback of the exception is not
+        cached.
+
+        Args:
+            exc_info: Exception info of the log record.
+            key: Key of the formatter configuration.
+            text: The rendered traceback.
+        """
+
+        exception, traceback = exc_info[1], exc_info[2]
+        if exception is None or traceback is not exception.__traceback__:
+            return
+
+        with self._lock:
+            entry = self._entries.get(id(exception))
+
+            if not self._is_valid(entry, exception):
+                entry = _Entry(_reference(exception), id(traceback))
+                self._entries[id(exception)] = entry
+
+            assert entry is not None
+            self._entries.move_to_end(id(exception))
+            entry.texts[key] = text
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _is_valid(entry: _Entry | None, exception: BaseException) -> bool:
+        """Check whether the entry belongs to the exception with its current traceback.
+
+        The identifier of a dead exception can be reused by another object, so the entry must
+        refer to the same exception.
+        """
+
+        return (
+            entry is not None
+            and entry.get_exception() is exception
+            and entry.traceback_id == id(exception.__traceback__)
+        )
+
+
+def _reference(exception: BaseException) -> Callable[[], BaseException | None]:
+    """Make a weak reference to the exception or a strong one if weak references are not
+    supported."""
+
+    try:
+        return weakref.ref(exception)
+    except TypeError:
+        return lambda: exception
+
+
+TRACEBACK_CACHE = TracebackCache()
+"""Traceback cache shared by the library formatters."""
@@ -1,16 +1,26 @@
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from importlib.util import find_spec
+from itertools import islice
 from logging import Handler, LogRecord
+import threading
 from typing import Any, override
 
-from .exceptions import SenderError
+from .admissions import AdmissionChain
+from .deduplicator import RecordDeduplicator
+from .delivery import DeliveryQueue, DeliveryTask
+from .document_fallback import Document, DocumentFallback
+from .exceptions import DeliveryError, SenderError
 from .formatters import BaseMarkupFormatter
-from .interfaces import INotifier, ITelegramSender
-from .interfaces import ITelegramSender
+from .interfaces import IAdmission, INotifier, ITelegramSender
 from .message_splitters.factory import MessageSplitterFactory, ParseModeToSplitter
 from .notifiers import StaticNotifier
 from .resolve_object_from_config import resolve_object_from_config
 from .types import ParseMode
 
+AdmissionConfig = IAdmission | dict[str, Any] | list[IAdmission | dict[str, Any]]
+
 DefaultTelegramSender: type[ITelegramSender]
 
 if find_spec('requests') is None:
@@ -21,16 +31,13 @@ else:
     DefaultTelegramSender = RequestsTelegramSender
 
 
-class TelegramHandler(Handler):
-    """Logger handler that sends messages via a bot to Telegram.
+class BaseTelegramHandler(Handler, ABC):
+    """Base class of the library handlers.
+
+    Contains the settings shared by the synchronous `TelegramHandler` and the asynchronous
+    `AsyncTelegramHandler`: recipients, notifications, message splitting and additional parameters
+    of the `sendMessage` method. Derived classes implement the delivery of messages.
 
-    - Allows you to send logs to multiple chats at once.
-    - When set as a formatter to `BaseMarkupFormatter` and derived classes, allows you to use
-    Telegram-supported markup languages.
-    - Splits overly long log entries into multiple messages that do not exceed the character limit,
-    using `IMessageSplitter` implementations.
-    - Allows you to customize message notifications using `INotifier` implementations.
-    
     Docs:
         Handler: https://docs.python.org/3/library/logging.html#logging.Handler
     """
@@ -41,8 +48,9 @@ class TelegramHandler(Handler):
         chat_id: int | str | set[int | str] | list[int | str],
         disable_notification: bool | dict[str, Any] | INotifier = False,
         message_splitter_factory: MessageSplitterFactory | ParseModeToSplitter | None = None,
-        sender: ITelegramSender | dict[str, Any] = DefaultTelegramSender(),
         force_send_on_exception: bool = False,
+        deduplicator: RecordDeduplicator | dict[str, Any] | None = None,
+        admission: AdmissionConfig | None = None,
         **params: Any
     ) -> None:
         """
@@ -57,36 +65,19 @@ class TelegramHandler(Handler):
                 language or a dictionary with `ParseMode` to `IMessageSplitter` mappings that
                 will be passed to the constructor of the `MessageSplitterFactory`. See the
                 `MessageSplitterFactory` constructor documentation for details.
-            sender: Telegram Bot API adapter that sends messages to Telegram. A dictionary can be
-                specified to support configuration from a file.
             force_send_on_exception: If `True`, in case the handler sends a message to multiple
                 recipients and an exception occurs during the process, the handler will forcefully
                 continue sending messages to the remaining recipients. By default, if an exception
                 occurs, the mailing is interrupted.
+            deduplicator: Suppressor of repeated log records. Duplicates are dropped before
+                formatting, and summaries with the number of suppressed duplicates are emitted
+                instead when their window expires. If `None` (the default), all records are
+                emitted. A dictionary can be specified to support configuration from a file.
+            admission: Filter of log records checked before formatting, so that rejected records
+                cost neither formatting nor splitting. A list is combined into `AdmissionChain`.
+                If `None` (the default), all records are admitted. A dictionary can be specified
+                to support configuration from a file.
             **params: Other parameters of the Telegram Bot API `sendMessage` method.
-
-        Initialization from the configuration dictionary:
-            Arguments `disable_notification` and `sender` support the configuration dictionary
-            format. The dictionary must contain the `'()'` key with the import path for the
-            requested class as a string. The remaining dictionary keys will be passed to the
-            constructor of the specified class.   
-            
-            Example with a sender: 
-            ```python
-            sender = {
-                '()': 'markup_tg_logger.telegram_senders.http_client.HttpClientTelegramSender'
-            }
-            ```
-
-            Example with a notifier:
-            ```python
-            disable_notification = {
-                '()': 'markup_tg_logger.notifiers.level.LevelNotifier',
-                'level': 'WARNING',
-            }
-            ```
-
-            You can also pass your custom classes in the same way.
         """
 
         super().__init__()
@@ -95,9 +86,13 @@ class TelegramHandler(Handler):
         self._chat_ids: set[int | str]
         self._notifier: INotifier
         self._message_splitter_factory: MessageSplitterFactory
-        self._sender: ITelegramSender
         self._force_send_on_exception = force_send_on_exception
+        self._deduplicator: RecordDeduplicator | None
+        self._admission: IAdmission | None
         self._params = params
+        # Cancels the scheduled emission of the deduplication summaries. Guarded by the handler
+        # lock.
+        self._cancel_summary_timer: Callable[[], None] | None = None
 
         if isinstance(chat_id, (int, str)):
             self._chat_ids = {chat_id, }
@@ -117,15 +112,6 @@ class TelegramHandler(Handler):
         else:
             self._notifier = disable_notification
 
-        if isinstance(sender, dict):
-            self._sender = resolve_object_from_config(
-                sender,
-                ITelegramSender, # type: ignore[type-abstract]
-                                 # https://github.com/python/mypy/issues/4717
-            )
-        else:
-            self._sender = sender
-
         if message_splitter_factory is None:
             self._message_splitter_factory = MessageSplitterFactory()
         elif isinstance(message_splitter_factory, dict):
@@ -133,39 +119,153 @@ class TelegramHandler(Handler):
         else:
             self._message_splitter_factory = message_splitter_factory
 
+        if isinstance(deduplicator, dict):
+            self._deduplicator = resolve_object_from_config(deduplicator, RecordDeduplicator)
+        else:
+            self._deduplicator = deduplicator
+
+        if isinstance(admission, list):
+            self._admission = AdmissionChain(admission)
+        elif isinstance(admission, dict):
+            self._admission = resolve_object_from_config(
+                admission,
+                IAdmission, # type: ignore[type-abstract]
+                            # https://github.com/python/mypy/issues/4717
+            )
+        else:
+            self._admission = admission
+
     @override
     def emit(self, record: LogRecord) -> None:
-        """Format log record, split to messages and send to Telegram."""
+        """Pass the log record through the admission and the deduplicator and emit it if it is
+        admitted and is not a duplicate.
+        
+        Summaries of the suppressed duplicates whose window has expired are emitted before it
+        regardless of the admission. Records rejected by the admission are not counted by the
+        deduplicator.
+        """
 
-        text = self.format(record)
+        if self._deduplicator is not None:
+            for summary in self._deduplicator.pop_summaries():
+                self._emit_record(summary)
 
-        parse_mode = self._get_parse_mode()
-        splitter = self._message_splitter_factory.get(parse_mode)
-        messages = splitter.split(text)
+        if self._admission is not None and not self._admission.admit(record):
+            return
 
-        disable_notification = self._notifier.disable_notification(record)
+        if self._deduplicator is None or self._deduplicator.admit(record):
+            self._emit_record(record)
+        else:
+            self._schedule_summaries()
+
+    @override
+    def close(self) -> None:
+        """Cancel the scheduled emission of the deduplication summaries and close the handler."""
+
+        self.acquire()
+        try:
+            if self._cancel_summary_timer is not None:
+                self._cancel_summary_timer()
+                self._cancel_summary_timer = None
+        finally:
+            self.release()
+
+        super().close()
+
+    @abstractmethod
+    def _emit_record(self, record: LogRecord) -> None:
+        """Format the log record and deliver it to Telegram."""
 
+    def _emit_summaries(self, force: bool = False) -> None:
+        """Emit summaries of the suppressed duplicates.
+
+        Args:
+            force: Emit summaries of all windows, including those that have not yet expired.
+        """
+
+        if self._deduplicator is None:
+            return
+
+        self.acquire()
         try:
-            for message in messages:
+            for summary in self._deduplicator.pop_summaries(force=force):
                 try:
-                    for chat_id in self._chat_ids:
-                        try:
-                            self._sender.send(
-                                bot_token = self._bot_token,
-                                chat_id = chat_id,
-                                text = message,
-                                parse_mode = parse_mode,
-                                disable_notification = disable_notification,
-                                **self._params
-                            )
-                        except SenderError:
-                            if not self._force_send_on_exception: raise
-                except SenderError:
-                    if not self._force_send_on_exception: raise
-
-        except SenderError:
-            self.handleError(record)
-        
+                    self._emit_record(summary)
+                except Exception:
+                    self.handleError(summary)
+        finally:
+            self.release()
+
+    def _schedule_summaries(self) -> None:
+        """Schedule the emission of the deduplication summaries at the end of the earliest window
+        with suppressed duplicates.
+
+        Otherwise, the summary of a burst of duplicates would wait for the next logging call.
+        Called under the handler lock.
+        """
+
+        if self._deduplicator is None or self._cancel_summary_timer is not None:
+            return
+
+        delay = self._deduplicator.get_summary_delay()
+        if delay is not None:
+            self._cancel_summary_timer = self._start_timer(delay, self._on_summary_timer)
+
+    def _on_summary_timer(self) -> None:
+        """Emit the summaries of the expired windows and schedule the next emission."""
+
+        self.acquire()
+        try:
+            # The timer has been cancelled by `close()` while waiting for the lock.
+            if self._cancel_summary_timer is None:
+                return
+
+            self._cancel_summary_timer = None
+            self._emit_summaries()
+            self._schedule_summaries()
+        finally:
+            self.release()
+
+    def _start_timer(
+        self,
+        delay: float,
+        callback: Callable[[], None],
+    ) -> Callable[[], None] | None:
+        """Call the function after the delay in a daemon thread.
+
+        Returns:
+            The function cancelling the call, or `None` if the call cannot be scheduled.
+        """
+
+        timer = threading.Timer(delay, callback)
+        timer.daemon = True
+        timer.start()
+
+        return timer.cancel
+
+    def _make_task(self, record: LogRecord) -> DeliveryTask:
+        """Format the log record and collect the parameters of its delivery."""
+
+        return DeliveryTask(
+            record = record,
+            text = self.format(record),
+            parse_mode = self._get_parse_mode(),
+            disable_notification = self._notifier.disable_notification(record),
+        )
+
+    def _split(self, task: DeliveryTask) -> list[str]:
+        """Split the formatted log entry into messages according to its markup language."""
+
+        splitter = self._message_splitter_factory.get(task.parse_mode)
+
+        return splitter.split(task.text)
+
+    def _iter_split(self, task: DeliveryTask) -> Iterator[str]:
+        """Split the formatted log entry into messages lazily according to its markup language."""
+
+        splitter = self._message_splitter_factory.get(task.parse_mode)
+
+        return splitter.iter_split(task.text)
+
     def _get_parse_mode(self) -> ParseMode:
         """Extract parse mode from formatter.
         
@@ -178,3 +278,373 @@ class TelegramHandler(Handler):
             parse_mode = self.formatter.parse_mode
 
         return parse_mode
+
+
+class TelegramHandler(BaseTelegramHandler):
+    """Logger handler that sends messages via a bot to Telegram.
+
+    - Allows you to send logs to multiple chats at once.
+    - When set as a formatter to `BaseMarkupFormatter` and derived classes, allows you to use
+    Telegram-supported markup languages.
+    - Splits overly long log entries into multiple messages that do not exceed the character limit,
+    using `IMessageSplitter` implementations.
+    - Allows you to customize message notifications using `INotifier` implementations.
+    - Optionally delivers messages in background threads using `DeliveryQueue`, so that logging
+    calls do not wait for the Telegram API.
+    - Optionally sends messages to multiple chats concurrently using a thread pool.
+    - Optionally uploads oversized log entries as documents using `DocumentFallback`.
+    
+    Docs:
+        Handler: https://docs.python.org/3/library/logging.html#logging.Handler
+    """
+
+    def __init__(
+        self,
+        bot_token: str,
+        chat_id: int | str | set[int | str] | list[int | str],
+        disable_notification: bool | dict[str, Any] | INotifier = False,
+        message_splitter_factory: MessageSplitterFactory | ParseModeToSplitter | None = None,
+        sender: ITelegramSender | dict[str, Any] | None = None,
+        force_send_on_exception: bool = False,
+        delivery_queue: DeliveryQueue | dict[str, Any] | None = None,
+        deduplicator: RecordDeduplicator | dict[str, Any] | None = None,
+        fan_out_workers: int = 1,
+        document_fallback: DocumentFallback | dict[str, Any] | None = None,
+        admission: AdmissionConfig | None = None,
+        **params: Any
+    ) -> None:
+        """
+        Args:
+            bot_token: Telegram bot API token.
+            chat_id: Unique identifier for the target chat or username of the target channel (in
+                the format `@channelusername`) or list/set for multiple recipients. 
+            disable_notification: Customize notifications. In case of bool values, notifications
+                will be always on or off. For more flexible customization, use `INotifier`
+                implementations. A dictionary can be specified to support configuration from a file.
+            message_splitter_factory: Factory for creating splitters depending on the markup 
+                language or a dictionary with `ParseMode` to `IMessageSplitter` mappings that
+                will be passed to the constructor of the `MessageSplitterFactory`. See the
+                `MessageSplitterFactory` constructor documentation for details.
+            sender: Telegram Bot API adapter that sends messages to Telegram. If `None` (the
+                default), `RequestsTelegramSender` is created if the `requests` library is
+                installed, otherwise `HttpClientTelegramSender`. A dictionary can be specified to
+                support configuration from a file.
+            force_send_on_exception: If `True`, in case the handler sends a message to multiple
+                recipients and an exception occurs during the process, the handler will forcefully
+                continue sending messages to the remaining recipients. By default, if an exception
+                occurs, the mailing is interrupted.
+            delivery_queue: Queue for non-blocking delivery. If specified, `emit()` only formats
+                the log entry and puts it in the queue, and splitting and sending messages is
+                performed by the queue worker threads. Use `flush()` to wait for delivery of the
+                queued entries. `close()` delivers the remaining entries and stops the workers.
+                If `None` (the default), messages are sent synchronously in `emit()`. A dictionary
+                can be specified to support configuration from a file.
+            deduplicator: Suppressor of repeated log records. Duplicates are dropped before
+                formatting, and summaries with the number of suppressed duplicates are emitted
+                instead when their window expires. Pending summaries are also emitted by `flush()`
+                and `close()`. If `None` (the default), all records are emitted. A dictionary can
+                be specified to support configuration from a file.
+            fan_out_workers: The number of threads sending messages to multiple recipients
+                concurrently. Each recipient receives the parts of a long log entry in order. The
+                sender must be thread-safe, which is true for the library senders. If `1` (the
+                default), recipients are served one by one.
+            document_fallback: Policy of uploading log entries that exceed the given number of
+                messages or size as a single document via the `sendDocument` method instead of
+                sending all parts. The sender must support `send_document()`, which is true for
+                the library senders. If `None` (the default), all parts are sent as messages.
+                A dictionary can be specified to support configuration from a file.
+            admission: Filter of log records checked before formatting, so that rejected records
+                cost neither formatting, splitting nor sending. A list is combined into
+                `AdmissionChain`. If `None` (the default), all records are admitted. A dictionary
+                can be specified to support configuration from a file.
+            **params: Other parameters of the Telegram Bot API `sendMessage` method. They are also
+                passed to the `sendDocument` method.
+
+        Initialization from the configuration dictionary:
+            Arguments `disable_notification`, `sender`, `delivery_queue`, `deduplicator`,
+            `document_fallback` and `admission` support the configuration dictionary format. The
+            dictionary must contain the `'()'` key with the import path for the requested class as
+            a string. The remaining dictionary keys will be passed to the constructor of the
+            specified class.
+            
+            Example with a sender: 
+            ```python
+            sender = {
+                '()': 'markup_tg_logger.telegram_senders.http_client.HttpClientTelegramSender'
+            }
+            ```
+
+            Example with a notifier:
+            ```python
+            disable_notification = {
+                '()': 'markup_tg_logger.notifiers.level.LevelNotifier',
+                'level': 'WARNING',
+            }
+            ```
+
+            You can also pass your custom classes in the same way.
+        """
+
+        super().__init__(
+            bot_token = bot_token,
+            chat_id = chat_id,
+            disable_notification = disable_notification,
+            message_splitter_factory = message_splitter_factory,
+            force_send_on_exception = force_send_on_exception,
+            deduplicator = deduplicator,
+            admission = admission,
+            **params
+        )
+
+        self._sender: ITelegramSender
+        self._delivery_queue: DeliveryQueue | None
+        self._fan_out_executor: ThreadPoolExecutor | None = None
+        self._document_fallback: DocumentFallback | None
+
+        if sender is None:
+            self._sender = DefaultTelegramSender()
+        elif isinstance(sender, dict):
+            self._sender = resolve_object_from_config(
+                sender,
+                ITelegramSender, # type: ignore[type-abstract]
+                                 # https://github.com/python/mypy/issues/4717
+            )
+        else:
+            self._sender = sender
+
+        if isinstance(delivery_queue, dict):
+            self._delivery_queue = resolve_object_from_config(delivery_queue, DeliveryQueue)
+        else:
+            self._delivery_queue = delivery_queue
+
+        if isinstance(document_fallback, dict):
+            self._document_fallback = resolve_object_from_config(
+                document_fallback, DocumentFallback
+            )
+        else:
+            self._document_fallback = document_fallback
+
+        if fan_out_workers > 1 and len(self._chat_ids) > 1:
+            self._fan_out_executor = ThreadPoolExecutor(
+                max_workers = min(fan_out_workers, len(self._chat_ids)),
+                thread_name_prefix = 'markup-tg-logger-fan-out',
+            )
+
+        if self._delivery_queue is not None:
+            self._delivery_queue.start(self._deliver_queued)
+
+    @override
+    def _emit_record(self, record: LogRecord) -> None:
+        """Format log record, split to messages and send to Telegram.
+        
+        If the delivery queue is used, the formatted log record is put in the queue, and splitting
+        and sending is performed in the background.
+        """
+
+        task = self._make_task(record)
+
+        if self._delivery_queue is not None and self._delivery_queue.is_running:
+            self._delivery_queue.put(task)
+        else:
+            self._deliver(task)
+
+    @override
+    def flush(self) -> None:
+        """Emit summaries of the expired deduplication windows and wait for delivery of the log
+        entries put in the delivery queue.
+        """
+
+        self._emit_summaries()
+
+        if self._delivery_queue is not None:
+            self._delivery_queue.flush()
+
+    @override
+    def close(self) -> None:
+        """Close the handler.
+
+        Emits all pending deduplication summaries, delivers the queued log entries, stops the
+        delivery queue and releases the sender resources.
+        """
+
+        self._emit_summaries(force=True)
+
+        if self._delivery_queue is not None:
+            self._delivery_queue.close()
+
+        if self._fan_out_executor is not None:
+            self._fan_out_executor.shutdown()
+            self._fan_out_executor = None
+
+        self._sender.close()
+
+        super().close()
+
+    def _deliver(self, task: DeliveryTask) -> None:
+        """Split the formatted log entry into messages and send them to all recipients.
+
+        When recipients are served one by one, the first message is sent while the following ones
+        are still being split. Sender errors are reported via `handleError()` as a single
+        `DeliveryError`.
+        """
+
+        parts = self._make_parts(task)
+
+        if self._fan_out_executor is None:
+            errors = self._send_sequentially(parts, task)
+        else:
+            errors = self._send_concurrently(self._fan_out_executor, parts, task)
+
+        if errors:
+            try:
+                raise DeliveryError(errors) from next(iter(errors.values()))
+            except DeliveryError:
+                self.handleError(task.record)
+
+    def _make_parts(self, task: DeliveryTask) -> Iterable[str | Document]:
+        """Split the formatted log entry into messages lazily or, if it is oversized according to
+        the document fallback policy, prepare it for uploading as a single document.
+
+        To check the number of messages, no more than `max_messages + 1` messages are split.
+        """
+
+        fallback = self._document_fallback
+        if fallback is None:
+            return self._iter_split(task)
+
+        if fallback.exceeds_size(task.text):
+            return [fallback.make_document(task)]
+
+        messages = self._iter_split(task)
+        if fallback.max_messages is None:
+            return messages
+
+        head = list(islice(messages, fallback.max_messages + 1))
+        if fallback.exceeds_messages(len(head)):
+            return [fallback.make_document(task)]
+
+        return head
+
+    def _send_part(self, chat_id: int | str, part: str | Document, task: DeliveryTask) -> None:
+        """Send a message or upload a document to one recipient."""
+
+        if isinstance(part, str):
+            self._sender.send(
+                bot_token = self._bot_token,
+                chat_id = chat_id,
+                text = part,
+                parse_mode = task.parse_mode,
+                disable_notification = task.disable_notification,
+                **self._params
+            )
+        else:
+            self._sender.send_document(
+                bot_token = self._bot_token,
+                chat_id = chat_id,
+                document = part.content,
+                filename = part.filename,
+                caption = part.caption,
+                disable_notification = task.disable_notification,
+                **self._params
+            )
+
+    def _send_sequentially(
+        self,
+        parts: Iterable[str | Document],
+        task: DeliveryTask,
+    ) -> dict[int | str, SenderError]:
+        """Send each part to all recipients in turn.
+
+        Returns:
+            The first error for each recipient that did not receive the log entry in full.
+        """
+
+        errors: dict[int | str, SenderError] = {}
+
+        for part in parts:
+            for chat_id in self._chat_ids:
+                try:
+                    self._send_part(chat_id, part, task)
+                except SenderError as e:
+                    errors.setdefault(chat_id, e)
+                    if not self._force_send_on_exception:
+                        return errors
+
+        return errors
+
+    def _send_concurrently(
+        self,
+        executor: ThreadPoolExecutor,
+        parts: Iterable[str | Document],
+        task: DeliveryTask,
+    ) -> dict[int | str, SenderError]:
+        """Send parts to all recipients concurrently in the fan-out thread pool.
+
+        All parts are split before sending, since each recipient iterates over them independently.
+
+        Returns:
+            The first error for each recipient that did not receive the log entry in full.
+        """
+
+        parts = list(parts)
+        interrupted = threading.Event()
+
+        futures = {
+            chat_id: executor.submit(self._send_to_chat, chat_id, parts, task, interrupted)
+            for chat_id in self._chat_ids
+        }
+
+        errors: dict[int | str, SenderError] = {}
+        for chat_id, future in futures.items():
+            error = future.result()
+            if error is not None:
+                errors[chat_id] = error
+
+        return errors
+
+    def _send_to_chat(
+        self,
+        chat_id: int | str,
+        parts: Sequence[str | Document],
+        task: DeliveryTask,
+        interrupted: threading.Event,
+    ) -> SenderError | None:
+        """Send parts to one recipient in order. Called in the fan-out thread pool.
+
+        Args:
+            chat_id: The recipient.
+            parts: Messages of the log entry or the document.
+            task: Delivery parameters.
+            interrupted: Set when the mailing is interrupted due to an error in another recipient.
+
+        Returns:
+            The first error, if any.
+        """
+
+        first_error: SenderError | None = None
+
+        for part in parts:
+            if interrupted.is_set():
+                break
+
+            try:
+                self._send_part(chat_id, part, task)
+            except SenderError as e:
+                first_error = first_error or e
+                if not self._force_send_on_exception:
+                    interrupted.set()
+                    break
+
+        return first_error
+
+    def _deliver_queued(self, task: DeliveryTask) -> None:
+        """Deliver a task in the delivery queue worker thread.
+        
+        Unlike synchronous delivery, there is no caller to propagate exceptions to, so any error is
+        reported via `handleError()`.
+        """
+
+        try:
+            self._deliver(task)
+        except Exception:
+            self.handleError(task.record)
@@ -0,0 +1,201 @@
+from collections.abc import Iterable, Iterator
+import re
+from typing import Literal, TypeAlias
+
+from .exceptions import InvalidMarkupError
+
+
+HtmlAttribute: TypeAlias = tuple[str, str | None]
+HtmlTokenKind: TypeAlias = Literal['text', 'start_tag', 'end_tag']
+
+_NAME = r'''[^\s"'<>/=]+'''
+_ATTRIBUTE = rf'''{_NAME}(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'<>=`]+))?'''
+
+_TAG_PATTERN = re.compile(rf'<(?:/({_NAME})\s*|({_NAME})((?:\s+{_ATTRIBUTE})*)\s*)>')
+_ATTRIBUTE_PATTERN = re.compile(
+    rf'''({_NAME})(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'<>=`]+)))?'''
+)
+_QUOTE_ENTITY = '&quot;'
+_TAG_CACHE_MAX_SIZE = 1024
+
+
+class HtmlTagContainer:
+    """Container for HTML tag.
+
+    Contains attributes. Does not contain the content of the element.
+
+    Immutable. The opening and closing tags are rendered once on creation, so that they can be
+    reused on every cut. Containers of the parsed tags are cached and shared between splits.
+    """
+
+    __slots__ = (
+        '_tag_name', '_attrs', '_start_tag', '_end_tag', '_start_tag_length', '_end_tag_length',
+    )
+
+    def __init__(self, tag_name: str, attrs: Iterable[HtmlAttribute]) -> None:
+        """
+        Args:
+            tag_name: Tag name without `<`, `>` and `/` symbols.
+            attrs: HTML element attributes. Each attribute must be represented as a key-value pair.
+                The value can be `None`.
+        """
+
+        self._tag_name = tag_name
+        self._attrs = tuple(attrs)
+
+        attrs_text = ' '.join(
+            name if value is None else f'{name}="{value.replace('"', _QUOTE_ENTITY)}"'
+            for name, value in self._attrs
+        )
+
+        self._start_tag = f'<{tag_name}>' if attrs_text == '' else f'<{tag_name} {attrs_text}>'
+        self._end_tag = f'</{tag_name}>'
+        self._start_tag_length = len(self._start_tag)
+        self._end_tag_length = len(self._end_tag)
+
+    @property
+    def tag_name(self) -> str:
+        """Tag name without `<`, `>` and `/` symbols."""
+
+        return self._tag_name
+
+    @property
+    def attrs(self) -> tuple[HtmlAttribute, ...]:
+        """HTML element attributes."""
+
+        return self._attrs
+
+    @property
+    def start_tag(self) -> str:
+        """Opening tag with attributes."""
+
+        return self._start_tag
+
+    @property
+    def end_tag(self) -> str:
+        """Closing tag."""
+
+        return self._end_tag
+
+    @property
+    def start_tag_length(self) -> int:
+        """Length of the opening tag in characters."""
+
+        return self._start_tag_length
+
+    @property
+    def end_tag_length(self) -> int:
+        """Length of the closing tag in characters."""
+
+        return self._end_tag_length
+
+
+HtmlToken: TypeAlias = tuple[HtmlTokenKind, int, int, HtmlTagContainer | None]
+"""A fragment of text with HTML markup: `(kind, start, end, tag)`.
+
+`kind` is `text` for plain text, `start_tag` or `end_tag` for a tag. `start` and `end` are the
+indices of the fragment in the source text. `tag` is the parsed tag, `None` for plain text. Closing
+tags have no attributes.
+"""
+
+# Parsed tags by their text. Bounded by `_TAG_CACHE_MAX_SIZE`.
+_tag_cache: dict[str, tuple[HtmlTokenKind, HtmlTagContainer]] = {}
+
+
+def tokenize_html(text: str) -> Iterator[HtmlToken]:
+    """Split text with HTML markup into plain text fragments and tags.
+
+    Plain text is skipped with `str.find()`, so the text is scanned once. Tags are parsed with
+    a precompiled regular expression and cached by their text, so frequent tags such as `<b>`,
+    `<code>` and `<pre>` are parsed once and share one container. Attribute values can be enclosed
+    in double or single quotes and contain spaces, `=` and `>`. Plain text is not copied, text
+    tokens only contain its positions. HTML entities are part of plain text.
+
+    Args:
+        text: Source text.
+
+    Raises:
+        InvalidMarkupError: A `<` or `>` character does not form a tag, i.e. the text is not
+            escaped.
+    """
+
+    find = text.find
+    position = 0
+
+    while True:
+        tag_start = find('<', position)
+        # The first `>` after the text must close the tag.
+        gt_index = find('>', position)
+
+        if gt_index == -1:
+            if tag_start != -1:
+                raise InvalidMarkupError(parse_mode='HTML', char='<', index=tag_start, text=text)
+            if position < len(text):
+                yield ('text', position, len(text), None)
+            return
+
+        if tag_start == -1 or gt_index < tag_start:
+            raise InvalidMarkupError(parse_mode='HTML', char='>', index=gt_index, text=text)
+
+        if tag_start > position:
+            yield ('text', position, tag_start, None)
+
+        cached_tag = _tag_cache.get(text[tag_start:gt_index + 1])
+
+        if cached_tag is None:
+            kind, tag_container, position = _parse_tag(text, tag_start)
+        else:
+            kind, tag_container = cached_tag
+            position = gt_index + 1
+
+        yield (kind, tag_start, position, tag_container)
+
+
+def _parse_tag(text: str, start: int) -> tuple[HtmlTokenKind, HtmlTagContainer, int]:
+    """Parse the tag at the `start` index and cache it.
+
+    Returns:
+        The kind of the tag, the tag container and the end index of the tag.
+
+    Raises:
+        InvalidMarkupError: The `<` character at the `start` index does not form a tag.
+    """
+
+    match = _TAG_PATTERN.match(text, start)
+    if match is None:
+        raise InvalidMarkupError(parse_mode='HTML', char='<', index=start, text=text)
+
+    end_tag_name, tag_name, attrs_text = match.groups()
+    kind: HtmlTokenKind
+    if end_tag_name is not None:
+        kind, tag_container = 'end_tag', HtmlTagContainer(end_tag_name, ())
+    else:
+        kind, tag_container = 'start_tag', HtmlTagContainer(tag_name, _parse_attrs(attrs_text))
+
+    # Tags with `>` inside attribute values are not cached, since they are looked up by the text
+    # up to the first `>`.
+    tag_text = match[0]
+    if tag_text.find('>') == len(tag_text) - 1:
+        if len(_tag_cache) >= _TAG_CACHE_MAX_SIZE:
+            _tag_cache.clear()
+        _tag_cache[tag_text] = (kind, tag_container)
+
+    return kind, tag_container, match.end()
+
+
+def _parse_attrs(attrs_text: str) -> list[HtmlAttribute]:
+    """Parse the attributes of a tag."""
+
+    attrs: list[HtmlAttribute] = []
+
+    for match in _ATTRIBUTE_PATTERN.finditer(attrs_text):
+        name, double_quoted, single_quoted, unquoted = match.groups()
+
+        if double_quoted is not None:
+            attrs.append((name, double_quoted))
+        elif single_quoted is not None:
+            attrs.append((name, single_quoted))
+        else:
+            attrs.append((name, unquoted))
+
+    return attrs
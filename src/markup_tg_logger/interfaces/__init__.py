@@ -1,8 +1,14 @@
+from .admission import IAdmission
+from .async_telegram_sender import IAsyncTelegramSender
+from .length_model import ILengthModel
 from .message_splitter import IMessageSplitter
 from .notifier import INotifier
 from .telegram_sender import ITelegramSender
 
 __all__ = [
+    'IAdmission',
+    'IAsyncTelegramSender',
+    'ILengthModel',
     'IMessageSplitter',
     'INotifier',
     'ITelegramSender',
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from logging import LogRecord
+
+
+class IAdmission(ABC):
+    """Admission control abstraction.
+
+    Class decides whether a log record must be delivered to Telegram. It is called by the handler
+    before the record is formatted and split, so it must only look at the raw `LogRecord` and be
+    cheap: rejected records do not cost formatting, splitting or sending.
+    """
+
+    @abstractmethod
+    def admit(self, record: LogRecord) -> bool:
+        """Determine whether the log record must be delivered."""
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+
+
+class ILengthModel(ABC):
+    """Interface for measuring text length in the units of the message length limit.
+
+    Telegram counts the message length limit in UTF-16 code units, while Python strings consist of
+    code points. The length model lets the splitters count the length the same way as Telegram.
+    """
+
+    @abstractmethod
+    def length(self, text: str) -> int:
+        """Get the length of the text in the units of the model."""
+
+    @abstractmethod
+    def fit(self, text: str, start: int, end: int, limit: int) -> tuple[int, int]:
+        """Find the longest prefix of `text[start:end]` that does not exceed the limit.
+
+        The prefix never ends between the two halves of a surrogate pair.
+
+        Args:
+            text: Source text.
+            start: Start index of the fragment.
+            end: End index of the fragment.
+            limit: The maximum length of the prefix in the units of the model.
+
+        Returns:
+            The end index of the prefix and its length in the units of the model. If not even one
+            character fits, `(start, 0)`.
+        """
+
+    def counts_code_points(self, text: str) -> bool:
+        """Check whether the length of any fragment of the text equals its number of characters.
+
+        Allows the splitters to measure such texts by plain indexing, which is faster. Returns
+        `False` by default.
+        """
+
+        return False
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 
 from ..types import ParseMode
 
@@ -21,3 +22,21 @@ class IMessageSplitter(ABC):
         Raises:
             SplitterException: Base exception when working with a splitter.
         """
+
+    def iter_split(self, text: str) -> Iterator[str]:
+        """Split text into messages lazily.
+
+        Messages are produced one by one while the text is processed, so the first message can be
+        sent before the following ones are ready, and the produced messages are not kept by the
+        splitter. Exceptions are raised during iteration.
+
+        By default, returns an iterator over the result of `split()`.
+
+        Args:
+            text: Source text to split.
+
+        Raises:
+            SplitterException: Base exception when working with a splitter.
+        """
+
+        return iter(self.split(text))
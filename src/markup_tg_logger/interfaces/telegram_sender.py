@@ -1,12 +1,18 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+from ..exceptions import SenderError
+
 
 class ITelegramSender(ABC):
     """Interface for Telegram Bot API implementations of the `sendMessage` method.
+
+    Implementations can also support the `sendDocument` method used to upload oversized log
+    entries as files.
     
     Docs:
         https://core.telegram.org/bots/api#sendmessage
+        https://core.telegram.org/bots/api#senddocument
     """
 
     @abstractmethod
@@ -38,3 +44,47 @@ class ITelegramSender(ABC):
             https://core.telegram.org/bots/api#sendmessage
         """
         pass
+
+    def send_document(
+        self,
+        bot_token: str,
+        chat_id: int | str,
+        document: bytes,
+        filename: str,
+        caption: str = '',
+        parse_mode: str = '',
+        disable_notification: bool = False,
+        **params: Any
+    ) -> None:
+        """Upload a file via Telegram Bot API.
+
+        Not supported by default.
+
+        Args:
+            bot_token: Telegram bot API token.
+            chat_id: Unique identifier for the target chat or username of the target channel (in
+                the format `@channelusername`).
+            document: Contents of the file, up to 50 MB.
+            filename: Name of the file displayed in the chat.
+            caption: Document caption, 0-1024 characters after entities parsing.
+            parse_mode: Mode for parsing entities in the document caption.
+            disable_notifications: Sends the message silently. Users will receive a notification
+                with no sound.
+            **params: Other parameters of the Telegram API method.
+
+        Raises:
+            SenderError: Error interacting with Telegram API or the sender does not support
+                uploading documents.
+
+        Docs:
+            https://core.telegram.org/bots/api#senddocument
+        """
+
+        raise SenderError(f'{type(self).__name__} does not support sending documents')
+
+    def close(self) -> None:
+        """Release resources held by the sender, such as open connections.
+
+        Called by `TelegramHandler.close()`. The sender must remain usable after closing, since it
+        can be shared between several handlers. Does nothing by default.
+        """
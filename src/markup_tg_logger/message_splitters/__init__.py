@@ -1,9 +1,15 @@
 from .base import BaseMessageSplitter
 from .html import HtmlMessageSplitter
+from .markdown import MarkdownMessageSplitter, MarkdownV2MessageSplitter
 from .factory import MessageSplitterFactory
+from .length_models import CodePointLengthModel, Utf16LengthModel
 
 __all__ = [
     'BaseMessageSplitter',
     'HtmlMessageSplitter',
+    'MarkdownMessageSplitter',
+    'MarkdownV2MessageSplitter',
     'MessageSplitterFactory',
+    'CodePointLengthModel',
+    'Utf16LengthModel',
 ]
@@ -1,8 +1,15 @@
-from typing import override
+from collections.abc import Iterator
+from typing import Any, override
 
 from ..config import MAX_MESSAGE_LENGTH
-from ..interfaces import IMessageSplitter
+from ..exceptions import SplitterException
+from ..interfaces import IMessageSplitter, ILengthModel
+from ..resolve_object_from_config import resolve_object_from_config
 from ..types import ParseMode
+from .length_models import CodePointLengthModel, Utf16LengthModel
+
+
+_CODE_POINT_LENGTH_MODEL = CodePointLengthModel()
 
 
 class BaseMessageSplitter(IMessageSplitter):
@@ -10,23 +17,49 @@ class BaseMessageSplitter(IMessageSplitter):
 
     Splits messages into parts exactly according to the limit without taking into account the
     markup features. To customize the splitting process, you need to create a derived class
-    and override the `split` method.
+    and override the `split` and `iter_split` methods.
+
+    The length is measured by an `ILengthModel` implementation. By default, in UTF-16 code units,
+    as Telegram does.
     """
 
     def __init__(
         self,
         max_message_length: int = MAX_MESSAGE_LENGTH,
-        parse_mode: ParseMode = ''
+        parse_mode: ParseMode = '',
+        length_model: ILengthModel | dict[str, Any] | None = None,
+        boundary_lookback: int = 0,
     ) -> None:
         """
-        Args: 
-            max_message_length: The maximum number of characters allowed in one message.
+        Args:
+            max_message_length: The maximum length of one message in the units of the length
+                model.
             parse_mode: Text markup language. In this implementation, it does not affect
                 the splitting process.
+            length_model: The way to measure the length of messages. If `None` (the default),
+                `Utf16LengthModel` is used. Use `CodePointLengthModel` to count Python string
+                characters. A dictionary can be specified to support configuration from a file.
+            boundary_lookback: The maximum number of characters by which a cut can be moved back
+                to end the message at a line break or, failing that, at a space or a tab. If there
+                is no such boundary within this window, the text is cut exactly at the limit.
+                `0` (the default) always cuts at the limit.
         """
 
         self._max_message_length = max_message_length
         self._parse_mode: ParseMode = parse_mode
+        self._boundary_lookback = boundary_lookback
+        self._length_model: ILengthModel
+
+        if length_model is None:
+            self._length_model = Utf16LengthModel()
+        elif isinstance(length_model, dict):
+            self._length_model = resolve_object_from_config(
+                length_model,
+                ILengthModel, # type: ignore[type-abstract]
+                              # https://github.com/python/mypy/issues/4717
+            )
+        else:
+            self._length_model = length_model
 
     @property
     @override
@@ -35,5 +68,96 @@ class BaseMessageSplitter(IMessageSplitter):
 
     @override
     def split(self, text: str) -> list[str]:
-        return [text[i : i + self._max_message_length] for i in range(0, len(text), self._max_message_length)] 
-    
+        """Split text into list of messages.
+
+        Raises:
+            SplitterException: A single character does not fit into the limit.
+        """
+
+        if self._can_slice(self._get_length_model(text)):
+            return [
+                text[i:i + self._max_message_length]
+                for i in range(0, len(text), self._max_message_length)
+            ]
+
+        return list(self.iter_split(text))
+
+    @override
+    def iter_split(self, text: str) -> Iterator[str]:
+        """Split text into messages lazily.
+
+        Raises:
+            SplitterException: A single character does not fit into the limit.
+        """
+
+        length_model = self._get_length_model(text)
+
+        if self._can_slice(length_model):
+            for i in range(0, len(text), self._max_message_length):
+                yield text[i:i + self._max_message_length]
+            return
+
+        start = 0
+
+        while start < len(text):
+            end, _ = length_model.fit(text, start, len(text), self._max_message_length)
+            if end == start:
+                raise SplitterException(
+                    f'Character at index {start} does not fit into the message length limit'
+                )
+
+            if end < len(text):
+                end = self._find_boundary(text, start, end)
+
+            yield text[start:end]
+            start = end
+
+    def _can_slice(self, length_model: ILengthModel) -> bool:
+        """Check whether the text measured by the length model can be cut into equal slices of
+        `max_message_length` characters.
+        """
+
+        return (
+            length_model is _CODE_POINT_LENGTH_MODEL
+            and self._max_message_length > 0
+            and self._boundary_lookback <= 0
+        )
+
+    def _find_boundary(self, text: str, start: int, stop: int) -> int:
+        """Move the cut point back to the nearest line break or whitespace.
+
+        Only the last `boundary_lookback` characters before the cut are searched, so the total time
+        of splitting stays linear.
+
+        Args:
+            text: Source text.
+            start: Start index of the fragment that goes into the message.
+            stop: The cut point at the limit. Must be greater than `start`.
+
+        Returns:
+            Index after the found boundary character, so that it ends the message, or `stop`
+            if there is no boundary within the window.
+        """
+
+        if self._boundary_lookback <= 0:
+            return stop
+
+        window_start = max(start, stop - self._boundary_lookback)
+
+        index = text.rfind('\n', window_start, stop)
+        if index == -1:
+            index = max(text.rfind(' ', window_start, stop), text.rfind('\t', window_start, stop))
+
+        return stop if index == -1 else index + 1
+
+    def _get_length_model(self, text: str) -> ILengthModel:
+        """Get the length model for the text.
+
+        If the configured model counts the text in characters, the faster `CodePointLengthModel`
+        is returned instead.
+        """
+
+        if self._length_model.counts_code_points(text):
+            return _CODE_POINT_LENGTH_MODEL
+
+        return self._length_model
@@ -4,6 +4,7 @@ from ..resolve_object_from_config import resolve_object_from_config
 from ..types import ParseMode
 from .base import BaseMessageSplitter
 from .html import HtmlMessageSplitter
+from .markdown import MarkdownMessageSplitter, MarkdownV2MessageSplitter
 
 
 ParseModeToSplitter = dict[ParseMode, IMessageSplitter | dict]
@@ -21,8 +22,8 @@ class MessageSplitterFactory:
         """
         Args:
             parse_mode_to_splitter: Splitter mapping for each supported markup language. If `None`,
-                then splitters will be assigned for plain text (`''`) and HTML, as for the most
-                popular options. To support configuration from a file, a dictionary can be
+                then the built-in splitters will be assigned for plain text (`''`), HTML, Markdown
+                and MarkdownV2. To support configuration from a file, a dictionary can be
                 specified instead of an `IMessageSplitter` instance. The dictionary must contain
                 the `'()'` key with the import path for the requested class as a string. The
                 remaining dictionary keys will be passed to the constructor of the specified class.
@@ -34,7 +35,9 @@ class MessageSplitterFactory:
         if parse_mode_to_splitter is None:
             self._parse_mode_to_splitter = {
                 '': BaseMessageSplitter(),
-                'HTML': HtmlMessageSplitter(), 
+                'HTML': HtmlMessageSplitter(),
+                'Markdown': MarkdownMessageSplitter(),
+                'MarkdownV2': MarkdownV2MessageSplitter(),
             }
         else:
             for parse_mode, splitter in parse_mode_to_splitter.items():
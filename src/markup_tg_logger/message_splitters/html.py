@@ -1,58 +1,35 @@
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass, field
-from typing import override, TypeAlias
+from functools import lru_cache
+import html
+from itertools import repeat
+import re
+import sys
+from typing import Any, override, TypeAlias
 
 from ..config import MAX_MESSAGE_LENGTH
-from ..exceptions import ImpossibleToSplitError, TagMismatchError, InvalidMarkupError
+from ..exceptions import ImpossibleToSplitError, TagMismatchError
+from ..html_tokenizer import HtmlTagContainer, tokenize_html
+from ..interfaces import ILengthModel
 from .base import BaseMessageSplitter
+from .length_models import CodePointLengthModel
 
 
 HtmlNode: TypeAlias = str
-HtmlAttribute: TypeAlias = tuple[str, str | None]
 
+_ENTITY_PATTERN = re.compile(r'&(?:#[0-9]+|#[xX][0-9a-fA-F]+|[a-zA-Z][a-zA-Z0-9]*);')
+# Longer entities may be cut in the default mode, so that the search before a cut stays bounded.
+_MAX_ENTITY_LENGTH = 32
 
-class HtmlTagContainer:
-    """Container for HTML tag.
 
-    Contains attributes. Does not contain the content of the element.
-    """
-
-    def __init__(self, tag_name: str, attrs: list[HtmlAttribute]) -> None:
-        """
-        Args:
-            tag_name: Tag name without `<`, `>` and `/` symbols.
-            attrs: HTML element attributes. Each attribute must be represented as a key-value pair.
-                The value can be `None`.
-        """
-
-        self._tag_name = tag_name
-        self._attrs = attrs
-
-    @property
-    def tag_name(self) -> str:
-        """Tag name without `<`, `>` and `/` symbols."""
-
-        return self._tag_name
-
-    @property
-    def start_tag(self) -> str:
-        """Opening tag with attributes."""
-
-        attr_texts: list[str] = []
-        for attr in self._attrs:
-            if attr[1] is None:
-                attr_texts.append(f'{attr[0]}')
-            else:
-                attr_texts.append(f'{attr[0]}="{attr[1]}"')
+@lru_cache(maxsize=1024)
+def _get_entity_length(entity: str, length_model: ILengthModel) -> int:
+    """Get the length of the text denoted by an HTML entity.
 
-        attrs_text = ' '.join(attr_texts)
-
-        return f'<{self._tag_name}>' if attrs_text == '' else f'<{self._tag_name} {attrs_text}>'
-    
-    @property
-    def end_tag(self) -> str:
-        """Closing tag."""
+    Entities are ASCII, but may denote characters that take two UTF-16 code units.
+    """
 
-        return f'</{self._tag_name}>'
+    return length_model.length(html.unescape(entity))
 
 
 @dataclass
@@ -60,19 +37,116 @@ class SplitContext:
     """Current splitter operation data.
     
     Attributes:
-        messages: List of already split messages that do not exceed the limit.
+        messages: List of already split messages that do not exceed the limit and have not yet
+            been taken by the `pop_messages()` method.
         current_message_nodes: A list of individual nodes from which the next message will be
             composed. The nodes are at the maximum nesting level. The closing tags are stored
             in the `stack`. To get the current message with closing tags, use the
             `complete_current_message_nodes()` method.
         stack: A quasi-LIFO stack of current HTML tags. LIFO may be violated when elements overlap.
             For example, `<b> bold <i> italic-bold </b> italic </i>`. 
+        current_message_length: Total length of `current_message_nodes`.
+        end_tags_length: Total length of the closing tags of the `stack`.
+        visible_length: Total length of the text of the current message as displayed by Telegram,
+            i.e. without tags and with each HTML entity counted as the character it denotes.
+            Tracked by the `append_text()` method.
+        length_model: The way to measure the length of nodes.
+        counts_code_points: `True` if the length of nodes equals their number of characters, so
+            they can be measured with `len()`. Set automatically for `CodePointLengthModel`.
+
+    Nodes and tags must be added and removed using the context methods, which keep the lengths up
+    to date, so the length of the current message is known without joining its nodes.
     """
 
     messages: list[str] = field(default_factory = lambda: [])
     current_message_nodes: list[HtmlNode] = field(default_factory = lambda: [])
     stack: list[HtmlTagContainer] = field(default_factory = lambda: [])
-    
+    current_message_length: int = 0
+    end_tags_length: int = 0
+    visible_length: int = 0
+    length_model: ILengthModel = field(default_factory = CodePointLengthModel)
+    counts_code_points: bool = field(init = False)
+    _measure: Callable[[str], int] = field(init = False, repr = False)
+
+    def __post_init__(self) -> None:
+        self.counts_code_points = isinstance(self.length_model, CodePointLengthModel)
+        self._measure = len if self.counts_code_points else self.length_model.length
+
+    @property
+    def completed_message_length(self) -> int:
+        """Length of the current message with the closing tags."""
+
+        return self.current_message_length + self.end_tags_length
+
+    def append_node(self, node: HtmlNode, length: int | None = None) -> None:
+        """Add a node to the current message.
+
+        Args:
+            node: The node to add.
+            length: The length of the node, if already known.
+        """
+
+        self.current_message_nodes.append(node)
+        self.current_message_length += self._measure(node) if length is None else length
+
+    def append_start_tag(self, tag_container: HtmlTagContainer) -> None:
+        """Add an opening tag to the current message."""
+
+        self.current_message_nodes.append(tag_container.start_tag)
+        self.current_message_length += (
+            tag_container.start_tag_length if self.counts_code_points
+            else self._measure(tag_container.start_tag)
+        )
+
+    def append_text(self, node: HtmlNode, length: int, visible_length: int) -> None:
+        """Add a text node to the current message.
+
+        Args:
+            node: The text node to add. Must not contain markup.
+            length: The length of the node.
+            visible_length: The length of the node as displayed by Telegram.
+        """
+
+        self.current_message_nodes.append(node)
+        self.current_message_length += length
+        self.visible_length += visible_length
+
+    def pop_node(self) -> HtmlNode:
+        """Remove the last node from the current message and return it."""
+
+        node = self.current_message_nodes.pop()
+        self.current_message_length -= self._measure(node)
+
+        return node
+
+    def push_tag(self, tag_container: HtmlTagContainer) -> None:
+        """Add an opened tag to the stack."""
+
+        self.stack.append(tag_container)
+        self.end_tags_length += (
+            tag_container.end_tag_length if self.counts_code_points
+            else self._measure(tag_container.end_tag)
+        )
+
+    def pop_tag(self, index: int = -1) -> HtmlTagContainer:
+        """Remove a tag from the stack by index and return it."""
+
+        tag_container = self.stack.pop(index)
+        self.end_tags_length -= (
+            tag_container.end_tag_length if self.counts_code_points
+            else self._measure(tag_container.end_tag)
+        )
+
+        return tag_container
+
+    def pop_messages(self) -> list[str]:
+        """Take the already split messages, so that the context does not keep them."""
+
+        messages = self.messages
+        self.messages = []
+
+        return messages
+
     def complete_current_message_nodes(self) -> list[HtmlNode]:
         """Append closing tags to the current message's node list and return that list."""
 
@@ -85,17 +159,18 @@ class SplitContext:
             ImpossibleToSplitError: `current_message_nodes` empty.
         """
 
-        completed_message_nodes = self.complete_current_message_nodes()
-        completed_message = ''.join(completed_message_nodes)
-
-        if completed_message == '':
+        if self.completed_message_length == 0:
             raise ImpossibleToSplitError(parse_mode='HTML')
 
+        completed_message = ''.join(self.complete_current_message_nodes())
+
         self.messages.append(completed_message)
         self.current_message_nodes = []
+        self.current_message_length = 0
+        self.visible_length = 0
         
         for tag_container in self.stack:
-            self.current_message_nodes.append(tag_container.start_tag)
+            self.append_start_tag(tag_container)
 
     def _compile_end_tags(self) -> list[HtmlNode]:
         """Compile a list of closing tags from the stack."""
@@ -109,28 +184,77 @@ class SplitContext:
 class HtmlMessageSplitter(BaseMessageSplitter):
     """A text splitter with HTML markup for a list of messages not exceeding a given length limit.
     
-    Each message contains all necessary opening and closing tags at the cut points. The length of
-    messages does not exceed the limit taking into account the markup (before parsing entities).
+    Each message contains all necessary opening and closing tags at the cut points. By default,
+    the length of messages does not exceed the limit taking into account the markup (before parsing
+    entities). This is always accepted by Telegram, but markup-heavy texts are split into more
+    messages than necessary.
+
+    Telegram applies the limit to the text after parsing entities. With `count_visible_length`,
+    the splitter measures the same way: tags are not counted, and each HTML entity such as `&lt;`
+    is counted as the character it denotes and is never split. Telegram does not document a limit
+    for the text with markup, so its length is only limited if `max_payload_length` is specified.
+
+    The length is measured in UTF-16 code units by default.
     """
 
-    def __init__(self, max_message_length: int = MAX_MESSAGE_LENGTH) -> None:
+    def __init__(
+        self,
+        max_message_length: int = MAX_MESSAGE_LENGTH,
+        length_model: ILengthModel | dict[str, Any] | None = None,
+        count_visible_length: bool = False,
+        max_payload_length: int | None = None,
+        boundary_lookback: int = 0,
+    ) -> None:
         """
         Args:
-            max_message_length: The maximum number of characters allowed in one message.
+            max_message_length: The maximum length of one message in the units of the length
+                model.
+            length_model: The way to measure the length of messages. If `None` (the default),
+                `Utf16LengthModel` is used. A dictionary can be specified to support configuration
+                from a file.
+            count_visible_length: Apply `max_message_length` to the text as displayed by Telegram
+                instead of the text with markup.
+            max_payload_length: The maximum length of one message with markup in the units of
+                the length model, for example, to bound the size of requests in the visible length
+                mode. In the default mode the smaller of the two limits applies. If `None` (the
+                default), only `max_message_length` is applied.
+            boundary_lookback: The maximum number of characters by which a cut inside a text node
+                can be moved back to end the message at a line break or, failing that, at a space
+                or a tab. `0` (the default) always cuts at the limit.
         """
 
-        super().__init__(max_message_length=max_message_length, parse_mode='HTML')
+        super().__init__(
+            max_message_length = max_message_length,
+            parse_mode = 'HTML',
+            length_model = length_model,
+            boundary_lookback = boundary_lookback,
+        )
+
+        self._count_visible_length = count_visible_length
+        if max_payload_length is None:
+            max_payload_length = sys.maxsize
+
+        self._max_payload_length = (
+            max_payload_length if count_visible_length
+            else min(max_message_length, max_payload_length)
+        )
 
     @override
     def split(self, text: str) -> list[str]:
-        context = SplitContext()
-        self._start_parsing(text, context)
+        return list(self.iter_split(text))
 
-        return context.messages
+    @override
+    def iter_split(self, text: str) -> Iterator[str]:
+        context = SplitContext(length_model=self._get_length_model(text))
+
+        return self._start_parsing(text, context)
     
-    def _start_parsing(self, text: str, context: SplitContext) -> None:
+    def _start_parsing(self, text: str, context: SplitContext) -> Iterator[str]:
         """Start parsing text with HTML markup.
 
+        The text is scanned once by `tokenize_html()`, without copying the unprocessed remainder.
+        Messages are yielded as soon as they are cut.
+
         Args:
             text: Source text for parsing.
             context: Splitter operation data.
@@ -141,91 +265,49 @@ class HtmlMessageSplitter(BaseMessageSplitter):
             InvalidMarkupError: Invalid HTML or not escaped text.
         """
 
-        source_text = text
-
-        while '>' in text:
-            lt_index = text.find('<')
-            gt_index = text.index('>')
-            if lt_index == -1 or lt_index > gt_index:
-                raise InvalidMarkupError(
-                    parse_mode = 'HTML',
-                    char = '>',
-                    index = len(source_text) - len(text) + gt_index,
-                    text = source_text,
-                )
-
-            # Text before the found tag.
-            pop, text = text[:lt_index], text[lt_index+1:]
-            if pop:
-                self._handle_text_node(pop, context)
-
-            # Text inside the tag.
-            gt_index = text.index('>')
-            if gt_index == 0:
-                raise InvalidMarkupError(
-                    parse_mode = 'HTML',
-                    char = '>',
-                    index = len(source_text) - len(text),
-                    text = source_text,
-                )
-
-            pop, text = text[:gt_index], text[gt_index+1:]
-
-            if pop[0] == '/':
-                self._handle_end_tag(tag_name=pop[1:], context=context)
+        for kind, start, end, tag_container in tokenize_html(text):
+            if tag_container is None:
+                self._handle_text_node(text, start, end, context)
+            elif kind == 'start_tag':
+                self._handle_start_tag(tag_container, context)
             else:
-                units = pop.split(' ')
-                tag_name = units[0]
-                attrs: list[HtmlAttribute] = []
-                if len(units) > 1:
-                    for unit in units[1:]:
-                        if '=' in unit:
-                            attr_0, attr_1 = unit.split('=')
-                            attr_1 = attr_1[1:-1]
-                        else:
-                            attr_0 = unit
-                            attr_1 = None
-                        attrs.append((attr_0, attr_1))
-
-                self._handle_start_tag(tag_name, attrs, context)
-
-        # Text after the last tag.
-        if text:
-            self._handle_text_node(text, context)
+                self._handle_end_tag(tag_name=tag_container.tag_name, context=context)
+
+            if context.messages:
+                yield from context.pop_messages()
 
         # Create last message from rest.
         context.cut_current_message()
+        yield from context.pop_messages()
 
-    def _handle_start_tag(self, tag_name: str, attrs: list[HtmlAttribute], context: SplitContext) -> None:
+    def _handle_start_tag(self, tag_container: HtmlTagContainer, context: SplitContext) -> None:
         """Process the found opening HTML tag.
 
-        Create an instance of the `HtmlTagContainer` class and add it to the stack. If the current
-        message exceeds the limit when opening and closing the added tag, then make a message cut.
+        Add the tag container to the stack. If the current message exceeds the limit when opening
+        and closing the added tag, then make a message cut.
         
         Args:
-            tag_name: Tag name without `<`, `>` and `/` symbols.
-            attrs: Tag attributes in key-value list format. Value can be `None`.
+            tag_container: The parsed opening tag.
             context: Splitter operation data.
 
         Raises:
             ImpossibleToSplitError: Unable to split text - markup length alone exceeds limit.
         """
 
-        tag_container = HtmlTagContainer(tag_name, attrs)
-        context.stack.append(tag_container)
-        context.current_message_nodes.append(tag_container.start_tag)
+        context.push_tag(tag_container)
+        context.append_start_tag(tag_container)
 
         # Check that the new opening tag does not immediately exceed the limit when closing.
-        if self._get_length_over_limit(context) >= 0:
-            current_tag = context.stack.pop()
-            current_node = context.current_message_nodes.pop()
+        if self._get_available_length(context) <= 0:
+            context.pop_tag()
+            context.pop_node()
 
             context.cut_current_message()
 
-            context.stack.append(current_tag)
-            context.current_message_nodes.append(current_node)
+            context.push_tag(tag_container)
+            context.append_start_tag(tag_container)
 
-            if self._get_length_over_limit(context) >= 0:
+            if self._get_available_length(context) <= 0:
                 raise ImpossibleToSplitError(parse_mode='HTML')
  
     def _handle_end_tag(self, tag_name: str, context: SplitContext) -> None:
@@ -244,55 +326,283 @@ class HtmlMessageSplitter(BaseMessageSplitter):
         if len(context.stack) == 0:
             raise TagMismatchError(f'Invalid HTML. Extra closing tag found: "</{tag_name}>".')
         
-        tag_names = [tag.tag_name for tag in context.stack]
-
-        if tag_name not in tag_names:
+        # Find the index of the last occurrence of the corresponding opening tag in the stack.
+        for start_tag_index in range(len(context.stack) - 1, -1, -1):
+            if context.stack[start_tag_index].tag_name == tag_name:
+                break
+        else:
             raise TagMismatchError(
                 f'Invalid HTML. The closing tag "</{tag_name}>" does not have a corresponding '
                 f'opening tag in the stack.'
             )
-        
-        # Find the index of the last occurrence of the corresponding opening tag in the stack.
-        start_tag_index = len(tag_names) - 1 - tag_names[::-1].index(tag_name)
 
         # Extract a tag by index from the stack and add it to the current message.
-        tag_container = context.stack.pop(start_tag_index)
-        context.current_message_nodes.append(tag_container.end_tag)
+        tag_container = context.pop_tag(start_tag_index)
+        context.append_node(
+            tag_container.end_tag,
+            tag_container.end_tag_length if context.counts_code_points else None,
+        )
 
-    def _handle_text_node(self, text: str, context: SplitContext) -> None:
+    def _handle_text_node(self, text: str, start: int, end: int, context: SplitContext) -> None:
         """Process plain text inside or outside tags.
-        
+
+        The text node is the `text[start:end]` slice. Only the parts that go into messages are
+        copied.
+
         Args:
-            text: Text that does not contain markup.
+            text: Source text.
+            start: Start index of the text node.
+            end: End index of the text node. The node does not contain markup.
             context: Splitter operation data.
 
         Raises:
             ImpossibleToSplitError: Unable to split text - markup length alone exceeds limit.
         """
 
-        context.current_message_nodes.append(text)
+        if not self._count_visible_length:
+            self._handle_raw_text_node(text, start, end, context)
+            return
+
+        is_cut = False
+
+        while True:
+            stop, length, visible_length = self._fit_visible_text(text, start, end, context)
+
+            if stop == end:
+                context.append_text(text[start:end], length, visible_length)
+                return
+
+            if stop > start:
+                # Entities do not contain whitespace, so the boundary is never inside an entity.
+                boundary = self._find_boundary(text, start, stop)
+                if boundary < stop:
+                    cut_length, cut_visible_length = self._measure_visible_text(
+                        text, boundary, stop, context
+                    )
+                    length -= cut_length
+                    visible_length -= cut_visible_length
+                    stop = boundary
+
+                context.append_text(text[start:stop], length, visible_length)
+                start = stop
+                is_cut = False
+            elif is_cut:
+                # The reopened tags alone leave no room for the text.
+                raise ImpossibleToSplitError(parse_mode='HTML')
+
+            context.cut_current_message()
+            is_cut = True
+
+    def _fit_visible_text(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        context: SplitContext,
+    ) -> tuple[int, int, int]:
+        """Find the longest prefix of the text node that fits into the current message in
+        the visible length mode.
+
+        HTML entities are counted as the characters they denote and are never split.
+
+        Args:
+            text: Source text.
+            start: Start index of the text node.
+            end: End index of the text node. The node does not contain markup.
+            context: Splitter operation data.
 
-        length_over_limit = self._get_length_over_limit(context)
-        while length_over_limit > 0:
-            text = context.current_message_nodes.pop()
+        Returns:
+            The end index of the prefix, its length with markup and its visible length.
+        """
 
-            current_text = text[:-1*length_over_limit]
-            next_text = text[-1*length_over_limit:]
+        length_model = context.length_model
+        available_length = self._max_payload_length - context.completed_message_length
+        available_visible_length = self._max_message_length - context.visible_length
+
+        # Most text nodes fit as a whole, so first try to measure without iterating over entities.
+        length, visible_length = self._measure_visible_text(text, start, end, context)
+        if length <= available_length and visible_length <= available_visible_length:
+            return end, length, visible_length
+
+        length = 0
+        visible_length = 0
+        position = start
+
+        for match in _ENTITY_PATTERN.finditer(text, start, end):
+            entity_start = match.start()
+
+            # Outside entities, the text is displayed as is.
+            if entity_start > position:
+                stop, fragment_length = length_model.fit(
+                    text,
+                    position,
+                    entity_start,
+                    min(available_length - length, available_visible_length - visible_length),
+                )
+                length += fragment_length
+                visible_length += fragment_length
+                if stop < entity_start:
+                    return stop, length, visible_length
+
+            entity = match.group()
+            entity_length = len(entity)
+            entity_visible_length = _get_entity_length(entity, self._length_model)
+
+            if (
+                length + entity_length > available_length
+                or visible_length + entity_visible_length > available_visible_length
+            ):
+                return entity_start, length, visible_length
+
+            length += entity_length
+            visible_length += entity_visible_length
+            position = match.end()
+
+        stop, fragment_length = length_model.fit(
+            text,
+            position,
+            end,
+            min(available_length - length, available_visible_length - visible_length),
+        )
+
+        return stop, length + fragment_length, visible_length + fragment_length
+
+    def _measure_visible_text(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        context: SplitContext,
+    ) -> tuple[int, int]:
+        """Measure a fragment of a text node in the visible length mode.
+
+        Args:
+            text: Source text.
+            start: Start index of the fragment. Must not be inside an HTML entity.
+            end: End index of the fragment. Must not be inside an HTML entity.
+            context: Splitter operation data.
+
+        Returns:
+            The length of the fragment with markup and its visible length.
+        """
+
+        if context.counts_code_points:
+            length = end - start
+        else:
+            length = context.length_model.length(text[start:end])
+
+        entities = _ENTITY_PATTERN.findall(text, start, end)
+        if not entities:
+            return length, length
+
+        visible_length = (
+            length
+            - sum(map(len, entities))
+            + sum(map(_get_entity_length, entities, repeat(self._length_model)))
+        )
+
+        return length, visible_length
+
+    def _handle_raw_text_node(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        context: SplitContext,
+    ) -> None:
+        """Process a text node in the default mode, in which HTML entities are counted as text.
+
+        Args:
+            text: Source text.
+            start: Start index of the text node.
+            end: End index of the text node. The node does not contain markup.
+            context: Splitter operation data.
+
+        Raises:
+            ImpossibleToSplitError: Unable to split text - markup length alone exceeds limit.
+        """
+
+        is_cut = False
+        length_model = context.length_model
+
+        while True:
+            available_length = self._get_available_length(context)
+
+            if context.counts_code_points and end - start <= available_length:
+                context.append_text(text[start:end], end - start, end - start)
+                return
+
+            fit_end, fit_length = length_model.fit(text, start, end, available_length)
+
+            if fit_end == end:
+                context.append_text(text[start:end], fit_length, fit_length)
+                return
+
+            if fit_end > start:
+                # Entities do not contain whitespace, so the boundary is never inside an entity,
+                # but the cut at the limit may be.
+                boundary = self._find_boundary(text, start, fit_end)
+                if boundary == fit_end:
+                    entity_start = self._find_entity_start(text, start, fit_end)
+                    # The entity is moved to the next message only if the current one has text,
+                    # an entity that does not fit even into a new message is cut.
+                    if entity_start > start or context.visible_length > 0:
+                        boundary = entity_start
+
+                if boundary < fit_end:
+                    fit_length -= length_model.length(text[boundary:fit_end])
+                    fit_end = boundary
+
+            if fit_end > start:
+                context.append_text(text[start:fit_end], fit_length, fit_length)
+                start = fit_end
+                is_cut = False
+            elif is_cut:
+                # The reopened tags alone leave no room for the text.
+                raise ImpossibleToSplitError(parse_mode='HTML')
 
-            context.current_message_nodes.append(current_text)
             context.cut_current_message()
+            is_cut = True
 
-            context.current_message_nodes.append(next_text)
-            length_over_limit = self._get_length_over_limit(context)
+    @staticmethod
+    def _find_entity_start(text: str, start: int, stop: int) -> int:
+        """Move the cut point back to the start of the HTML entity that it splits.
+
+        Args:
+            text: Source text.
+            start: Start index of the fragment that goes into the message.
+            stop: The cut point.
+
+        Returns:
+            Index of the `&` of the split entity, or `stop` if the cut point is not inside
+            an entity.
+        """
+
+        index = text.rfind('&', max(start, stop - _MAX_ENTITY_LENGTH + 1), stop)
+        if index == -1:
+            return stop
+
+        match = _ENTITY_PATTERN.match(text, index)
+        if match is None or match.end() <= stop:
+            return stop
+
+        return index
+
+    def _get_available_length(self, context: SplitContext) -> int:
+        """Get the length of text that can still be added to the current message.
+
+        Negative if the current message already exceeds the limit.
 
-    def _get_length_over_limit(self, context: SplitContext) -> int:
-        """Get the number of characters by which the current message exceeds the limit.
-        
         Args:
             context: Splitter operation data.
         """
 
-        closed_message_elements = context.complete_current_message_nodes()
-        closed_message_str = ''.join(closed_message_elements)
+        available_length = self._max_payload_length - context.completed_message_length
+
+        if self._count_visible_length:
+            available_length = min(
+                available_length,
+                self._max_message_length - context.visible_length,
+            )
 
-        return len(closed_message_str) - self._max_message_length
+        return available_length
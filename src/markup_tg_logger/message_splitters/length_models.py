@@ -0,0 +1,113 @@
+from typing import override
+
+from ..interfaces import ILengthModel
+
+
+_HIGH_SURROGATES = ('\ud800', '\udbff')
+_LOW_SURROGATES = ('\udc00', '\udfff')
+_MAX_BMP_CHAR = '\uffff'
+_UTF16_ENCODING = 'utf-16-le'
+_UTF16_UNIT_SIZE = 2
+
+
+def _is_inside_surrogate_pair(text: str, index: int) -> bool:
+    """Check whether the index falls between the halves of a surrogate pair.
+
+    Python strings store non-BMP characters as single code points, so pairs occur only in strings
+    with surrogates decoded separately, for example with the `surrogatepass` error handler.
+    """
+
+    if index <= 0 or index >= len(text):
+        return False
+
+    return (
+        _HIGH_SURROGATES[0] <= text[index - 1] <= _HIGH_SURROGATES[1]
+        and _LOW_SURROGATES[0] <= text[index] <= _LOW_SURROGATES[1]
+    )
+
+
+class CodePointLengthModel(ILengthModel):
+    """Length in Python string characters (Unicode code points).
+
+    Matches Telegram only for texts without characters outside the Basic Multilingual Plane, such
+    as most emoji.
+    """
+
+    @override
+    def length(self, text: str) -> int:
+        return len(text)
+
+    @override
+    def counts_code_points(self, text: str) -> bool:
+        return True
+
+    @override
+    def fit(self, text: str, start: int, end: int, limit: int) -> tuple[int, int]:
+        stop = max(start, min(end, start + limit))
+
+        if _is_inside_surrogate_pair(text, stop):
+            stop -= 1
+
+        return stop, stop - start
+
+
+class Utf16LengthModel(ILengthModel):
+    """Length in UTF-16 code units, as Telegram counts the message length limit.
+
+    Characters outside the Basic Multilingual Plane, such as most emoji, take two units. ASCII text
+    is measured without encoding.
+
+    Docs:
+        https://core.telegram.org/api/entities#entity-length
+    """
+
+    @override
+    def length(self, text: str) -> int:
+        if text.isascii():
+            return len(text)
+
+        return len(text.encode(_UTF16_ENCODING, 'surrogatepass')) // _UTF16_UNIT_SIZE
+
+    @override
+    def counts_code_points(self, text: str) -> bool:
+        if text.isascii():
+            return True
+
+        try:
+            # Surrogates are not encodable without `surrogatepass`.
+            encoded = text.encode(_UTF16_ENCODING)
+        except UnicodeEncodeError:
+            return False
+
+        # No character takes two units.
+        return len(encoded) == len(text) * _UTF16_UNIT_SIZE
+
+    @override
+    def fit(self, text: str, start: int, end: int, limit: int) -> tuple[int, int]:
+        # Each character takes at least one unit, so the prefix is not longer than `limit` chars.
+        stop = max(start, min(end, start + limit))
+        if stop == start:
+            return start, 0
+
+        length = self.length(text[start:stop])
+
+        # Cut off at least half of the excess at a time: each character takes at most two units.
+        while length > limit:
+            new_stop = stop - (length - limit + 1) // 2
+            length -= self.length(text[new_stop:stop])
+            stop = new_stop
+
+        # The last cut may have removed one unit more than necessary.
+        while stop < end:
+            char_length = 2 if text[stop] > _MAX_BMP_CHAR else 1
+            if length + char_length > limit:
+                break
+
+            stop += 1
+            length += char_length
+
+        if _is_inside_surrogate_pair(text, stop):
+            stop -= 1
+            length -= 1
+
+        return stop, length
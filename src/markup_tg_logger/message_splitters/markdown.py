@@ -0,0 +1,690 @@
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+import re
+from typing import Any, override
+
+from ..config import MAX_MESSAGE_LENGTH
+from ..exceptions import ImpossibleToSplitError, InvalidMarkupError
+from ..interfaces import ILengthModel
+from ..types import ParseMode
+from .base import BaseMessageSplitter
+from .length_models import CodePointLengthModel
+
+
+@dataclass(frozen=True)
+class MarkdownEntity:
+    """Opened Markdown entity.
+
+    Attributes:
+        kind: Entity type, for example `'bold'` or `'pre'`.
+        start_marker: Markup that opens the entity, including the language line of a code block.
+        end_marker: Markup that closes the entity, including the URL of a link.
+        end_index: Index of the end marker in the source text, if it is known in advance.
+    """
+
+    kind: str
+    start_marker: str
+    end_marker: str
+    end_index: int = -1
+
+
+@dataclass
+class MarkdownSplitContext:
+    """Current splitter operation data.
+
+    Attributes:
+        parse_mode: Markup language of the text.
+        length_model: The way to measure the length of nodes.
+        messages: List of already split messages that do not exceed the limit and have not yet
+            been taken by the `pop_messages()` method.
+        current_message_nodes: A list of individual nodes from which the next message will be
+            composed. The end markers of the opened entities are stored in the `stack`.
+        stack: Opened entities in the order of opening.
+        current_message_length: Total length of `current_message_nodes`.
+        end_markers_length: Total length of the end markers of the `stack`.
+        is_reopened: `True` if the current message contains only the start markers of the entities
+            reopened after a cut.
+        counts_code_points: `True` if the length of nodes equals their number of characters.
+        measure: Function to measure the length of a node.
+
+    Nodes and entities must be added and removed using the context methods, which keep the lengths
+    up to date.
+    """
+
+    parse_mode: ParseMode
+    length_model: ILengthModel = field(default_factory = CodePointLengthModel)
+    messages: list[str] = field(default_factory = lambda: [])
+    current_message_nodes: list[str] = field(default_factory = lambda: [])
+    stack: list[MarkdownEntity] = field(default_factory = lambda: [])
+    current_message_length: int = 0
+    end_markers_length: int = 0
+    is_reopened: bool = False
+    counts_code_points: bool = field(init = False)
+    measure: Callable[[str], int] = field(init = False, repr = False)
+
+    def __post_init__(self) -> None:
+        self.counts_code_points = isinstance(self.length_model, CodePointLengthModel)
+        self.measure = len if self.counts_code_points else self.length_model.length
+
+    @property
+    def completed_message_length(self) -> int:
+        """Length of the current message with the end markers."""
+
+        return self.current_message_length + self.end_markers_length
+
+    def append_node(self, node: str, length: int | None = None) -> None:
+        """Add a node to the current message.
+
+        Args:
+            node: The node to add.
+            length: The length of the node, if already known.
+        """
+
+        self.current_message_nodes.append(node)
+        self.current_message_length += self.measure(node) if length is None else length
+        self.is_reopened = False
+
+    def pop_node(self) -> str:
+        """Remove the last node from the current message and return it."""
+
+        node = self.current_message_nodes.pop()
+        self.current_message_length -= self.measure(node)
+
+        return node
+
+    def push_entity(self, entity: MarkdownEntity) -> None:
+        """Add an opened entity to the stack."""
+
+        self.stack.append(entity)
+        self.end_markers_length += self.measure(entity.end_marker)
+
+    def pop_entity(self, index: int = -1) -> MarkdownEntity:
+        """Remove an entity from the stack by index and return it."""
+
+        entity = self.stack.pop(index)
+        self.end_markers_length -= self.measure(entity.end_marker)
+
+        return entity
+
+    def find_entity(self, kind: str) -> int:
+        """Get the index of the last opened entity of the given type, or `-1` if there is none."""
+
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index].kind == kind:
+                return index
+
+        return -1
+
+    def pop_messages(self) -> list[str]:
+        """Take the already split messages, so that the context does not keep them."""
+
+        messages = self.messages
+        self.messages = []
+
+        return messages
+
+    def cut_current_message(self) -> None:
+        """Move accumulated nodes of current message to finished messages and reopen the entities
+        of the stack in the next message.
+
+        Raises:
+            ImpossibleToSplitError: `current_message_nodes` empty.
+        """
+
+        if self.completed_message_length == 0:
+            raise ImpossibleToSplitError(parse_mode=self.parse_mode)
+
+        end_markers = [entity.end_marker for entity in reversed(self.stack)]
+        self.messages.append(''.join(self.current_message_nodes + end_markers))
+        self.current_message_nodes = []
+        self.current_message_length = 0
+
+        for entity in self.stack:
+            self.append_node(entity.start_marker)
+
+        self.is_reopened = True
+
+
+class MarkdownV2MessageSplitter(BaseMessageSplitter):
+    """A text splitter with MarkdownV2 markup for a list of messages not exceeding a given length
+    limit.
+
+    Opened entities (bold, italic, underline, strikethrough, spoiler, inline code, code blocks with
+    language, links, custom emoji and blockquotes, including expandable ones) are closed at the cut
+    points and reopened in the next message. Escape sequences are never split. The text is parsed in
+    a single pass; the only lookahead is the search for the end of a link and the language line of
+    a code block. The length of messages includes the markup.
+
+    Docs:
+        https://core.telegram.org/bots/api#markdownv2-style
+    """
+
+    _PARSE_MODE: ParseMode = 'MarkdownV2'
+    # Characters that may start markup outside of code.
+    _SPECIAL_CHARS = re.compile(r'[\\*_~|`\[\]!\n]')
+    # Characters that may start markup inside inline code and code blocks.
+    _CODE_SPECIAL_CHARS = re.compile(r'[\\`]')
+    # Characters that can be escaped with `\`. `None` means any character.
+    _ESCAPABLE_CHARS: str | None = None
+    # Markers of the entities that are opened and closed by the same markup. Two-character
+    # markers take precedence, so `__` is always treated as underline.
+    _MARKERS: dict[str, str] = {
+        '__': 'underline',
+        '||': 'spoiler',
+        '*': 'bold',
+        '_': 'italic',
+        '~': 'strikethrough',
+    }
+    _SUPPORTS_BLOCKQUOTES = True
+
+    def __init__(
+        self,
+        max_message_length: int = MAX_MESSAGE_LENGTH,
+        length_model: ILengthModel | dict[str, Any] | None = None,
+        boundary_lookback: int = 0,
+    ) -> None:
+        """
+        Args:
+            max_message_length: The maximum length of one message in the units of the length
+                model.
+            length_model: The way to measure the length of messages. If `None` (the default),
+                `Utf16LengthModel` is used. A dictionary can be specified to support configuration
+                from a file.
+            boundary_lookback: The maximum number of characters by which a cut inside text,
+                including the content of code blocks, can be moved back to end the message at
+                a line break or, failing that, at a space or a tab. `0` (the default) always cuts
+                at the limit.
+        """
+
+        super().__init__(
+            max_message_length = max_message_length,
+            parse_mode = self._PARSE_MODE,
+            length_model = length_model,
+            boundary_lookback = boundary_lookback,
+        )
+
+    @override
+    def split(self, text: str) -> list[str]:
+        """Split text into list of messages.
+
+        Raises:
+            ImpossibleToSplitError: Unable to split text - markup length alone exceeds limit.
+            InvalidMarkupError: Invalid markup or not escaped text.
+        """
+
+        return list(self.iter_split(text))
+
+    @override
+    def iter_split(self, text: str) -> Iterator[str]:
+        """Split text into messages lazily.
+
+        Raises:
+            ImpossibleToSplitError: Unable to split text - markup length alone exceeds limit.
+            InvalidMarkupError: Invalid markup or not escaped text.
+        """
+
+        context = MarkdownSplitContext(
+            parse_mode = self._parse_mode,
+            length_model = self._get_length_model(text),
+        )
+
+        position = 0
+        if self._SUPPORTS_BLOCKQUOTES:
+            position = self._handle_line_start(text, position, context)
+
+        while position < len(text):
+            if context.stack and context.stack[-1].kind in ('code', 'pre'):
+                match = self._CODE_SPECIAL_CHARS.search(text, position)
+            else:
+                match = self._SPECIAL_CHARS.search(text, position)
+
+            special_index = len(text) if match is None else match.start()
+            if special_index > position:
+                self._handle_text(text, position, special_index, context)
+                if context.messages:
+                    yield from context.pop_messages()
+
+            if match is None:
+                break
+
+            position = self._handle_special_char(text, special_index, context)
+            if context.messages:
+                yield from context.pop_messages()
+
+        # Create last message from rest.
+        context.cut_current_message()
+        yield from context.pop_messages()
+
+    def _handle_special_char(self, text: str, index: int, context: MarkdownSplitContext) -> int:
+        """Process a character that may start markup.
+
+        Args:
+            text: Source text.
+            index: Index of the character.
+            context: Splitter operation data.
+
+        Returns:
+            Index of the first unprocessed character.
+
+        Raises:
+            ImpossibleToSplitError: Unable to split text - markup length alone exceeds limit.
+            InvalidMarkupError: Invalid markup or not escaped text.
+        """
+
+        char = text[index]
+
+        if char == '\\':
+            return self._handle_escape(text, index, context)
+
+        if char == '`':
+            return self._handle_code(text, index, context)
+
+        if char == '\n':
+            return self._handle_new_line(text, index, context)
+
+        if char == '[' or (char == '!' and text.startswith('[', index + 1)):
+            return self._handle_link_start(text, index, context)
+
+        if char == ']':
+            link_index = context.find_entity('link')
+            if link_index != -1 and context.stack[link_index].end_index == index:
+                entity = context.pop_entity(link_index)
+                context.append_node(entity.end_marker)
+                return index + len(entity.end_marker)
+
+        marker = text[index:index + 2]
+        if marker not in self._MARKERS:
+            marker = char
+
+        kind = self._MARKERS.get(marker)
+        if kind is None:
+            # Not a markup, such as a single `|` or `!`.
+            self._handle_text(text, index, index + 1, context)
+            return index + 1
+
+        # `||` at the end of a line closes an expandable blockquote, unless a spoiler is opened.
+        if kind == 'spoiler' and context.find_entity('spoiler') == -1:
+            quote_index = context.find_entity('expandable_blockquote')
+            is_line_end = index + 2 == len(text) or text.startswith('\n', index + 2)
+
+            if quote_index != -1 and is_line_end:
+                context.pop_entity(quote_index)
+                context.append_node(marker)
+                return index + 2
+
+        entity_index = context.find_entity(kind)
+        if entity_index == -1:
+            self._open_entity(MarkdownEntity(kind, marker, marker), context)
+        else:
+            context.pop_entity(entity_index)
+            context.append_node(marker)
+
+        return index + len(marker)
+
+    def _handle_escape(self, text: str, index: int, context: MarkdownSplitContext) -> int:
+        """Process an escape sequence. It is never split between messages.
+
+        Args:
+            text: Source text.
+            index: Index of the `\\` character.
+            context: Splitter operation data.
+
+        Returns:
+            Index of the first unprocessed character.
+
+        Raises:
+            ImpossibleToSplitError: Unable to split text - markup length alone exceeds limit.
+            InvalidMarkupError: The text ends with `\\`.
+        """
+
+        if index + 1 == len(text):
+            raise InvalidMarkupError(parse_mode=self._parse_mode, char='\\', index=index, text=text)
+
+        if self._ESCAPABLE_CHARS is not None and text[index + 1] not in self._ESCAPABLE_CHARS:
+            # A plain backslash.
+            self._handle_text(text, index, index + 1, context)
+            return index + 1
+
+        self._handle_atom(text[index:index + 2], context)
+
+        return index + 2
+
+    def _handle_code(self, text: str, index: int, context: MarkdownSplitContext) -> int:
+        """Process a backtick that opens or closes inline code or a code block.
+
+        Args:
+            text: Source text.
+            index: Index of the backtick.
+            context: Splitter operation data.
+
+        Returns:
+            Index of the first unprocessed character.
+
+        Raises:
+            ImpossibleToSplitError: Unable to split text - markup length alone exceeds limit.
+        """
+
+        is_pre_marker = text.startswith('```', index)
+        top_kind = context.stack[-1].kind if context.stack else None
+
+        if top_kind == 'pre':
+            if not is_pre_marker:
+                # A backtick inside a code block.
+                self._handle_text(text, index, index + 1, context)
+                return index + 1
+
+            context.pop_entity()
+            context.append_node('```')
+            return index + 3
+
+        if top_kind == 'code':
+            context.pop_entity()
+            context.append_node('`')
+            return index + 1
+
+        if not is_pre_marker:
+            self._open_entity(MarkdownEntity('code', '`', '`'), context)
+            return index + 1
+
+        # The first line of a code block is its language, if the block does not end on it.
+        start_marker = '```'
+        line_end = text.find('\n', index + 3)
+        if line_end != -1:
+            block_end = text.find('```', index + 3, line_end)
+            if block_end == -1:
+                start_marker = text[index:line_end + 1]
+
+        self._open_entity(MarkdownEntity('pre', start_marker, '```'), context)
+
+        return index + len(start_marker)
+
+    def _handle_link_start(self, text: str, index: int, context: MarkdownSplitContext) -> int:
+        """Process the start of a link or a custom emoji.
+
+        The end of the link is found in advance, so that the link can be closed with its URL at
+        a cut point.
+
+        Args:
+            text: Source text.
+            index: Index of the `[` or `![` markup.
+            context: Splitter operation data.
+
+        Returns:
+            Index of the first unprocessed character.
+
+        Raises:
+            ImpossibleToSplitError: Unable to split text - markup length alone exceeds limit.
+            InvalidMarkupError: The link is not closed.
+        """
+
+        start_marker = '![' if text[index] == '!' else '['
+        text_end = self._find_unescaped(text, ']', index + len(start_marker))
+
+        url_end = -1
+        if text_end != -1 and text.startswith('(', text_end + 1):
+            url_end = self._find_unescaped(text, ')', text_end + 2)
+
+        if url_end == -1:
+            raise InvalidMarkupError(parse_mode=self._parse_mode, char='[', index=index, text=text)
+
+        entity = MarkdownEntity(
+            kind = 'link',
+            start_marker = start_marker,
+            end_marker = text[text_end:url_end + 1],
+            end_index = text_end,
+        )
+        self._open_entity(entity, context)
+
+        return index + len(start_marker)
+
+    def _handle_new_line(self, text: str, index: int, context: MarkdownSplitContext) -> int:
+        """Process a line break, which may continue or end a blockquote.
+
+        Args:
+            text: Source text.
+            index: Index of the line break.
+            context: Splitter operation data.
+
+        Returns:
+            Index of the first unprocessed character.
+
+        Raises:
+            ImpossibleToSplitError: Unable to split text - markup length alone exceeds limit.
+        """
+
+        quote_index = context.find_entity('blockquote')
+        if quote_index == -1:
+            quote_index = context.find_entity('expandable_blockquote')
+
+        if quote_index != -1:
+            if text.startswith('>', index + 1):
+                # The line break with the quote marker of the next line is not split. After a cut,
+                # the reopened blockquote already starts a new line, so they are dropped.
+                line_break = text[index:index + 2]
+                if self._get_available_length(context) < context.measure(line_break):
+                    context.cut_current_message()
+
+                if not context.is_reopened:
+                    context.append_node(line_break)
+
+                return index + 2
+
+            context.pop_entity(quote_index)
+
+        self._handle_text(text, index, index + 1, context)
+
+        return self._handle_line_start(text, index + 1, context)
+
+    def _handle_line_start(self, text: str, index: int, context: MarkdownSplitContext) -> int:
+        """Open a blockquote if the line starts with its markup.
+
+        Args:
+            text: Source text.
+            index: Index of the first character of the line.
+            context: Splitter operation data.
+
+        Returns:
+            Index of the first unprocessed character.
+
+        Raises:
+            ImpossibleToSplitError: Unable to split text - markup length alone exceeds limit.
+        """
+
+        if text.startswith('**>', index):
+            self._open_entity(MarkdownEntity('expandable_blockquote', '**>', '||'), context)
+            return index + 3
+
+        if text.startswith('>', index):
+            self._open_entity(MarkdownEntity('blockquote', '>', ''), context)
+            return index + 1
+
+        return index
+
+    def _open_entity(self, entity: MarkdownEntity, context: MarkdownSplitContext) -> None:
+        """Add an entity to the stack and its start marker to the current message.
+
+        If the current message exceeds the limit when opening and closing the entity, then make
+        a message cut.
+
+        Args:
+            entity: The opened entity.
+            context: Splitter operation data.
+
+        Raises:
+            ImpossibleToSplitError: Unable to split text - markup length alone exceeds limit.
+        """
+
+        context.push_entity(entity)
+        context.append_node(entity.start_marker)
+
+        if self._get_available_length(context) <= 0:
+            context.pop_entity()
+            context.pop_node()
+
+            context.cut_current_message()
+
+            context.push_entity(entity)
+            context.append_node(entity.start_marker)
+
+            if self._get_available_length(context) <= 0:
+                raise ImpossibleToSplitError(parse_mode=self._parse_mode)
+
+    def _handle_atom(self, atom: str, context: MarkdownSplitContext) -> None:
+        """Add a fragment that cannot be split, such as an escape sequence, to the current message.
+
+        Args:
+            atom: The fragment.
+            context: Splitter operation data.
+
+        Raises:
+            ImpossibleToSplitError: Unable to split text - markup length alone exceeds limit.
+        """
+
+        length = context.measure(atom)
+
+        if self._get_available_length(context) < length:
+            context.cut_current_message()
+
+            if self._get_available_length(context) < length:
+                raise ImpossibleToSplitError(parse_mode=self._parse_mode)
+
+        context.append_node(atom, length)
+
+    def _handle_text(self, text: str, start: int, end: int, context: MarkdownSplitContext) -> None:
+        """Process text without markup.
+
+        Args:
+            text: Source text.
+            start: Start index of the text.
+            end: End index of the text.
+            context: Splitter operation data.
+
+        Raises:
+            ImpossibleToSplitError: Unable to split text - markup length alone exceeds limit.
+        """
+
+        is_cut = False
+        length_model = context.length_model
+
+        while True:
+            available_length = self._get_available_length(context)
+
+            if context.counts_code_points and end - start <= available_length:
+                context.append_node(text[start:end], end - start)
+                return
+
+            fit_end, fit_length = length_model.fit(text, start, end, available_length)
+
+            if fit_end == end:
+                context.append_node(text[start:end], fit_length)
+                return
+
+            if fit_end > start:
+                # Escape sequences and markup are separate nodes, so the boundary is never inside
+                # them.
+                boundary = self._find_boundary(text, start, fit_end)
+                if boundary < fit_end:
+                    fit_length -= length_model.length(text[boundary:fit_end])
+                    fit_end = boundary
+
+                context.append_node(text[start:fit_end], fit_length)
+                start = fit_end
+                is_cut = False
+            elif is_cut:
+                # The reopened entities alone leave no room for the text.
+                raise ImpossibleToSplitError(parse_mode=self._parse_mode)
+
+            context.cut_current_message()
+            is_cut = True
+
+            start = self._skip_line_break_after_cut(text, start, context)
+            if start == end:
+                return
+
+    def _skip_line_break_after_cut(
+        self,
+        text: str,
+        index: int,
+        context: MarkdownSplitContext,
+    ) -> int:
+        """Drop the line break at the cut point inside a code block.
+
+        The reopened start marker of a code block ends with the line break of its language line,
+        so the line break of the text would add an empty line to the code in the next message.
+
+        Args:
+            text: Source text.
+            index: Index of the first character of the next message.
+            context: Splitter operation data.
+
+        Returns:
+            Index of the first character to add to the next message.
+        """
+
+        if (
+            context.stack
+            and context.stack[-1].kind == 'pre'
+            and context.stack[-1].start_marker.endswith('\n')
+            and text.startswith('\n', index)
+        ):
+            return index + 1
+
+        return index
+
+    def _get_available_length(self, context: MarkdownSplitContext) -> int:
+        """Get the length of text that can still be added to the current message.
+
+        Args:
+            context: Splitter operation data.
+        """
+
+        return self._max_message_length - context.completed_message_length
+
+    def _find_unescaped(self, text: str, char: str, start: int) -> int:
+        """Find the first occurrence of the character that is not escaped, or `-1`.
+
+        Args:
+            text: Source text.
+            char: The character to find.
+            start: Index to start the search from.
+        """
+
+        index = text.find(char, start)
+        if self._ESCAPABLE_CHARS is not None and char not in self._ESCAPABLE_CHARS:
+            return index
+
+        while index != -1:
+            # The character is escaped by an odd number of backslashes.
+            backslashes = 0
+            while index - backslashes > start and text[index - backslashes - 1] == '\\':
+                backslashes += 1
+
+            if backslashes % 2 == 0:
+                return index
+
+            index = text.find(char, index + 1)
+
+        return index
+
+
+class MarkdownMessageSplitter(MarkdownV2MessageSplitter):
+    """A text splitter with legacy Markdown markup for a list of messages not exceeding a given
+    length limit.
+
+    Supports bold, italic, inline code, code blocks with language and links. Characters `_`, `*`,
+    `` ` `` and `[` escaped with `\\` are never split from the backslash.
+
+    Docs:
+        https://core.telegram.org/bots/api#markdown-style
+    """
+
+    _PARSE_MODE: ParseMode = 'Markdown'
+    _SPECIAL_CHARS = re.compile(r'[\\*_`\[\]]')
+    # Legacy Markdown has no escaping inside code.
+    _CODE_SPECIAL_CHARS = re.compile(r'`')
+    _ESCAPABLE_CHARS = '_*`['
+    _MARKERS = {
+        '*': 'bold',
+        '_': 'italic',
+    }
+    _SUPPORTS_BLOCKQUOTES = False
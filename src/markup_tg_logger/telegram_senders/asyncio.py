@@ -0,0 +1,332 @@
+import asyncio
+import json
+import selectors
+import ssl
+from typing import Any, override
+from urllib.parse import urlparse
+
+from ..config import MAX_MESSAGE_LENGTH, TELEGRAM_SEND_MESSAGE_URL
+from ..interfaces import IAsyncTelegramSender
+from ..exceptions import SenderError, TelegramApiError
+
+
+_Connection = tuple[asyncio.AbstractEventLoop, asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class AsyncioTelegramSender(IAsyncTelegramSender):
+    """Implementation of Telegram Bot API method `sendMessage` on `asyncio` streams.
+
+    Uses only the standard library: HTTP/1.1 requests are written directly to connections opened
+    with `asyncio.open_connection()`. Connections are kept alive and reused between requests.
+    A connection closed by the server while idle is transparently replaced with a new one. Requests
+    are never repeated after they have been written completely, so a message is not delivered
+    twice.
+
+    Docs:
+        https://core.telegram.org/bots/api#sendmessage
+    """
+
+    _MAX_MESSAGE_LENGTH: int = MAX_MESSAGE_LENGTH
+    _STATUS_CODE_OK = 200
+    _CONTENT_TYPE_JSON = 'application/json'
+    _ENCODING = 'utf-8'
+    _HEADER_ENCODING = 'latin-1'
+    _PROTOCOL_TO_PORT = {'http': 80, 'https': 443}
+
+    def __init__(
+        self,
+        url: str = TELEGRAM_SEND_MESSAGE_URL,
+        connect_timeout: float | None = 10.0,
+        read_timeout: float | None = 30.0,
+        max_idle_connections: int = 4,
+    ) -> None:
+        """
+        Args:
+            url: Telegram Bot API URL for the `sendMessage` method. Contains one required parameter
+                `{bot_token}`. Use default value. Overridden for tests only.
+            connect_timeout: Timeout in seconds for establishing a connection. If `None`, wait
+                indefinitely.
+            read_timeout: Timeout in seconds for sending a request and receiving a response.
+                If `None`, wait indefinitely.
+            max_idle_connections: The maximum number of idle keep-alive connections kept for reuse
+                for each host. If `0`, a new connection is created for each request.
+        """
+
+        self._url = url
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._max_idle_connections = max_idle_connections
+        self._ssl_context = ssl.create_default_context()
+        self._idle_connections: dict[tuple[str, str, int], list[_Connection]] = {}
+
+    @override
+    async def send(
+        self,
+        bot_token: str,
+        chat_id: int | str,
+        text: str,
+        parse_mode: str = '',
+        disable_notification: bool = False,
+        **params: Any
+    ) -> None:
+        # The message limit applies to the text after parsing entities, so only the text without
+        # markup can be checked before sending.
+        if not parse_mode and len(text) > self._MAX_MESSAGE_LENGTH:
+            raise SenderError('Text exceeds message character limit')
+
+        url = self._url.format(bot_token=bot_token)
+        parsed_url = urlparse(url)
+        protocol = parsed_url.scheme
+        host = parsed_url.hostname or ''
+
+        if protocol not in self._PROTOCOL_TO_PORT:
+            raise SenderError(f'Unsupported protocol: "{protocol}"')
+
+        port = parsed_url.port or self._PROTOCOL_TO_PORT[protocol]
+
+        payload: dict[str, Any] = {
+            'chat_id': chat_id,
+            'text': text,
+            'parse_mode': parse_mode,
+            'disable_notification': disable_notification,
+        }
+        payload.update(params)
+
+        body = json.dumps(payload).encode(self._ENCODING)
+        request_head = (
+            f'POST {parsed_url.path} HTTP/1.1\r\n'
+            f'Host: {parsed_url.netloc}\r\n'
+            f'Content-Type: {self._CONTENT_TYPE_JSON}\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f'Connection: keep-alive\r\n'
+            f'\r\n'
+        )
+
+        status, headers, response_body = await self._request(
+            key = (protocol, host, port),
+            request = request_head.encode(self._HEADER_ENCODING) + body,
+        )
+
+        if status != self._STATUS_CODE_OK:
+            if headers.get('content-type') == self._CONTENT_TYPE_JSON:
+                json_data = json.loads(response_body.decode(self._ENCODING))
+                raise TelegramApiError(
+                    f'Error interacting with Telegram Bot API: {json_data}',
+                    json_data,
+                )
+            else:
+                raise SenderError(f'Error sending HTTP request. Status Code: {status}')
+
+    @override
+    async def close(self) -> None:
+        """Close idle keep-alive connections."""
+
+        idle_connections = [
+            connection
+            for connections in self._idle_connections.values()
+            for connection in connections
+        ]
+        self._idle_connections = {}
+
+        for loop, _, writer in idle_connections:
+            if loop is asyncio.get_running_loop():
+                writer.close()
+
+    async def _request(
+        self,
+        key: tuple[str, str, int],
+        request: bytes,
+    ) -> tuple[int, dict[str, str], bytes]:
+        """Send a request over a pooled connection and read the whole response.
+
+        If a connection taken from the pool turns out to be closed by the server while the request
+        is being written, the request is repeated once over a new connection. Failures after the
+        request has been written are not retried, even if the connection was reused: the server may
+        have handled the request before the connection dropped, and repeating a non-idempotent
+        `sendMessage` request would deliver the message twice. Idle connections closed by the
+        server are detected before reuse, so such failures are rare.
+
+        Args:
+            key: Protocol, host and port of the server.
+            request: Raw HTTP request.
+
+        Returns:
+            Status code, headers with lowercase names and the body of the response.
+
+        Raises:
+            SenderError: Connection failure or timeout.
+        """
+
+        # The timeout covers both sending the request and receiving the response.
+        loop = asyncio.get_running_loop()
+        deadline = None if self._read_timeout is None else loop.time() + self._read_timeout
+
+        connection, reused = self._acquire(key), True
+        if connection is None:
+            connection, reused = await self._connect(key), False
+
+        _, reader, writer = connection
+
+        while True:
+            try:
+                async with asyncio.timeout_at(deadline):
+                    writer.write(request)
+                    await writer.drain()
+            except ConnectionError as e:
+                writer.close()
+                if not reused:
+                    raise SenderError(f'Error sending HTTP request: {e}')
+
+                # The connection was closed by the server before the request was written, so the
+                # server has not handled it. Retry over a fresh connection.
+                connection, reused = await self._connect(key), False
+                _, reader, writer = connection
+                continue
+            except Exception as e:
+                writer.close()
+                raise SenderError(f'Error sending HTTP request: {e!r}')
+
+            break
+
+        try:
+            async with asyncio.timeout_at(deadline):
+                status, headers, body, keep_alive = await self._read_response(reader)
+        except Exception as e:
+            writer.close()
+            raise SenderError(f'Error receiving HTTP response: {e!r}')
+
+        if keep_alive:
+            self._release(key, connection)
+        else:
+            writer.close()
+
+        return status, headers, body
+
+    def _acquire(self, key: tuple[str, str, int]) -> _Connection | None:
+        """Take an idle connection of the current event loop from the pool."""
+
+        loop = asyncio.get_running_loop()
+        idle_connections = self._idle_connections.get(key, [])
+
+        while idle_connections:
+            connection = idle_connections.pop()
+            # Connections of another event loop cannot be used or closed from this one.
+            if connection[0] is not loop:
+                continue
+
+            if not self._is_dropped(connection):
+                return connection
+
+            connection[2].close()
+
+        return None
+
+    def _release(self, key: tuple[str, str, int], connection: _Connection) -> None:
+        """Return the connection to the pool or close it if the pool is full."""
+
+        idle_connections = self._idle_connections.setdefault(key, [])
+        if len(idle_connections) < self._max_idle_connections:
+            idle_connections.append(connection)
+        else:
+            connection[2].close()
+
+    @staticmethod
+    def _is_dropped(connection: _Connection) -> bool:
+        """Check whether the idle connection has been closed by the server.
+
+        An idle keep-alive connection has nothing to read, so the end of the stream or a readable
+        socket means that the server has closed the connection or sent unexpected data.
+        """
+
+        _, reader, writer = connection
+        if writer.is_closing() or reader.at_eof() or reader.exception() is not None:
+            return True
+
+        sock = writer.get_extra_info('socket')
+        if sock is None:
+            return True
+
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(sock, selectors.EVENT_READ)
+                return bool(selector.select(timeout=0))
+        except (OSError, ValueError):
+            return True
+
+    async def _connect(self, key: tuple[str, str, int]) -> _Connection:
+        """Open a new connection.
+
+        Raises:
+            SenderError: Connection failure or timeout.
+        """
+
+        protocol, host, port = key
+
+        try:
+            async with asyncio.timeout(self._connect_timeout):
+                reader, writer = await asyncio.open_connection(
+                    host = host,
+                    port = port,
+                    ssl = self._ssl_context if protocol == 'https' else None,
+                )
+        except Exception as e:
+            raise SenderError(f'Error connecting to "{host}:{port}": {e!r}')
+
+        return asyncio.get_running_loop(), reader, writer
+
+    async def _read_response(
+        self,
+        reader: asyncio.StreamReader,
+    ) -> tuple[int, dict[str, str], bytes, bool]:
+        """Read HTTP response from the stream.
+
+        Returns:
+            Status code, headers with lowercase names, body and the flag whether the connection
+            can be reused.
+
+        Raises:
+            ConnectionResetError: The server closed the connection without a response.
+            ValueError: Malformed status line.
+        """
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Server closed the connection without a response')
+
+        # The reason phrase is optional, for example `HTTP/1.1 200`.
+        status_parts = status_line.decode(self._HEADER_ENCODING).split(maxsplit=2)
+        if len(status_parts) < 2:
+            raise ValueError(f'Malformed HTTP status line: {status_line!r}')
+
+        version, status = status_parts[0], status_parts[1]
+
+        headers: dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+
+            name, _, value = line.decode(self._HEADER_ENCODING).partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks: list[bytes] = []
+            while True:
+                size = int((await reader.readline()).split(b';', 1)[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:
+            body = await reader.read()
+            keep_alive = False
+
+        return int(status), headers, body, keep_alive
@@ -0,0 +1,145 @@
+from http.client import HTTPConnection, HTTPSConnection
+import selectors
+import threading
+
+from ..exceptions import SenderError
+
+
+HttpConnection = HTTPConnection | HTTPSConnection
+
+
+class HttpConnectionPool:
+    """Thread-safe pool of reusable keep-alive `http.client` connections.
+
+    Idle connections are stored separately for each protocol and host. A connection is taken from
+    the pool for the duration of one request, so it is never used by two threads at once.
+    Connections that the server has announced to close are not returned to the pool, and idle
+    connections that the server has closed without announcement are discarded when taken from it.
+    """
+
+    _PROTOCOL_TO_CONNECTION_CLASS: dict[str, type[HttpConnection]] = {
+        'http': HTTPConnection,
+        'https': HTTPSConnection,
+    }
+
+    def __init__(
+        self,
+        max_idle_connections: int = 4,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+    ) -> None:
+        """
+        Args:
+            max_idle_connections: The maximum number of idle connections kept for each host.
+                Extra connections are closed after use. If `0`, connections are not reused.
+            connect_timeout: Timeout in seconds for establishing a connection. If `None`, wait
+                indefinitely.
+            read_timeout: Timeout in seconds for socket operations on an established connection.
+                If `None`, wait indefinitely.
+        """
+
+        self._max_idle_connections = max_idle_connections
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._idle_connections: dict[tuple[str, str], list[HttpConnection]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, protocol: str, host: str) -> tuple[HttpConnection, bool]:
+        """Take an idle connection from the pool or create a new one.
+
+        Args:
+            protocol: `'http'` or `'https'`.
+            host: Host with optional port, for example `'api.telegram.org'`.
+
+        Returns:
+            The connection and the flag that it was reused from the pool. Idle connections already
+            closed by the server are discarded, but a reused connection may still be closed by the
+            server at any moment.
+
+        Raises:
+            SenderError: Unsupported protocol or connection failure.
+        """
+
+        while True:
+            with self._lock:
+                idle_connections = self._idle_connections.get((protocol, host))
+                if not idle_connections:
+                    break
+                connection = idle_connections.pop()
+
+            if not self._is_dropped(connection):
+                return connection, True
+
+            connection.close()
+
+        return self.connect(protocol, host), False
+
+    def release(self, protocol: str, host: str, connection: HttpConnection) -> None:
+        """Return the connection to the pool after the response has been read completely.
+
+        The connection is closed if the pool for the host is full.
+        """
+
+        with self._lock:
+            idle_connections = self._idle_connections.setdefault((protocol, host), [])
+            if len(idle_connections) < self._max_idle_connections:
+                idle_connections.append(connection)
+                return
+
+        connection.close()
+
+    def connect(self, protocol: str, host: str) -> HttpConnection:
+        """Create and open a new connection bypassing the pool.
+
+        Raises:
+            SenderError: Unsupported protocol or connection failure.
+        """
+
+        if not protocol in self._PROTOCOL_TO_CONNECTION_CLASS:
+            raise SenderError(f'Unsupported protocol: "{protocol}"')
+
+        connection_class = self._PROTOCOL_TO_CONNECTION_CLASS[protocol]
+        connection = connection_class(host, timeout=self._connect_timeout)
+
+        try:
+            connection.connect()
+        except Exception as e:
+            connection.close()
+            raise SenderError(f'Error connecting to "{host}": {e}')
+
+        if connection.sock is not None:
+            connection.sock.settimeout(self._read_timeout)
+
+        return connection
+
+    def close(self) -> None:
+        """Close all idle connections. The pool remains usable."""
+
+        with self._lock:
+            idle_connections = [
+                connection
+                for connections in self._idle_connections.values()
+                for connection in connections
+            ]
+            self._idle_connections = {}
+
+        for connection in idle_connections:
+            connection.close()
+
+    @staticmethod
+    def _is_dropped(connection: HttpConnection) -> bool:
+        """Check whether the idle connection has been closed by the server.
+
+        An idle keep-alive connection has nothing to read, so a readable socket means that the
+        server has closed the connection or sent unexpected data.
+        """
+
+        if connection.sock is None:
+            return True
+
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(connection.sock, selectors.EVENT_READ)
+                return bool(selector.select(timeout=0))
+        except (OSError, ValueError):
+            return True
@@ -1,34 +1,70 @@
-from http.client import HTTPConnection, HTTPSConnection
+from http.client import HTTPResponse
 import json
 from typing import Any, override
 from urllib.parse import urlparse
 
-from ..config import MAX_MESSAGE_LENGTH, TELEGRAM_SEND_MESSAGE_URL
+from ..config import (
+    MAX_CAPTION_LENGTH, MAX_DOCUMENT_SIZE, MAX_MESSAGE_LENGTH,
+    TELEGRAM_SEND_DOCUMENT_URL, TELEGRAM_SEND_MESSAGE_URL,
+)
 from ..interfaces import ITelegramSender
 from ..exceptions import SenderError, TelegramApiError
+from .connection_pool import HttpConnectionPool
+from .multipart import build_multipart_body
 
 
 class HttpClientTelegramSender(ITelegramSender):
-    """Implementation of Telegram Bot API method `sendMessage` using `http.client`.
-    
+    """Implementation of Telegram Bot API methods `sendMessage` and `sendDocument` using
+    `http.client`.
+
+    Connections are kept alive and reused between requests. A connection closed by the server while
+    idle is transparently replaced with a new one. Requests are never repeated after they have been
+    written completely, so a message is not delivered twice. Documents are uploaded as
+    `multipart/form-data` directly from the given bytes, without copying them into the request body.
+
     Docs:
         https://core.telegram.org/bots/api#sendmessage
+        https://core.telegram.org/bots/api#senddocument
     """
 
     _MAX_MESSAGE_LENGTH: int = MAX_MESSAGE_LENGTH
+    _MAX_CAPTION_LENGTH: int = MAX_CAPTION_LENGTH
+    _MAX_DOCUMENT_SIZE: int = MAX_DOCUMENT_SIZE
     _STATUS_CODE_OK = 200
     _CONTENT_TYPE_HEADER = 'Content-Type'
     _CONTENT_TYPE_JSON = 'application/json'
+    _CONTENT_LENGTH_HEADER = 'Content-Length'
     _ENCODING = 'utf-8'
 
-    def __init__(self, url: str = TELEGRAM_SEND_MESSAGE_URL) -> None:
+    def __init__(
+        self,
+        url: str = TELEGRAM_SEND_MESSAGE_URL,
+        connect_timeout: float | None = 10.0,
+        read_timeout: float | None = 30.0,
+        max_idle_connections: int = 4,
+        document_url: str = TELEGRAM_SEND_DOCUMENT_URL,
+    ) -> None:
         """
         Args:
             url: Telegram Bot API URL for the `sendMessage` method. Contains one required parameter
                 `{bot_token}`. Use default value. Overridden for tests only.
+            connect_timeout: Timeout in seconds for establishing a connection. If `None`, wait
+                indefinitely.
+            read_timeout: Timeout in seconds for sending a request and receiving a response.
+                If `None`, wait indefinitely.
+            max_idle_connections: The maximum number of idle keep-alive connections kept for reuse.
+                If `0`, a new connection is created for each request.
+            document_url: Telegram Bot API URL for the `sendDocument` method. Contains one required
+                parameter `{bot_token}`. Use default value. Overridden for tests only.
         """
 
         self._url = url
+        self._document_url = document_url
+        self._pool = HttpConnectionPool(
+            max_idle_connections = max_idle_connections,
+            connect_timeout = connect_timeout,
+            read_timeout = read_timeout,
+        )
 
     @override
     def send(
@@ -40,14 +76,10 @@ class HttpClientTelegramSender(ITelegramSender):
         disable_notification: bool = False,
         **params: dict[str, Any]
     ) -> None:
-        if len(text) > self._MAX_MESSAGE_LENGTH:
-            raise ValueError('Text exceeds message character limit')
-        
-        url = self._url.format(bot_token=bot_token)
-        parsed_url = urlparse(url)
-        protocol = parsed_url.scheme
-        host = parsed_url.netloc
-        endpoint = parsed_url.path
+        # The message limit applies to the text after parsing entities, so only the text without
+        # markup can be checked before sending.
+        if not parse_mode and len(text) > self._MAX_MESSAGE_LENGTH:
+            raise SenderError('Text exceeds message character limit')
 
         payload: dict[str, Any] = {
             'chat_id': chat_id,
@@ -61,38 +93,146 @@ class HttpClientTelegramSender(ITelegramSender):
             self._CONTENT_TYPE_HEADER: self._CONTENT_TYPE_JSON,
         }
 
-        connection = self._make_connection(host=host, protocol=protocol)
-        try:
-            connection.request(
-                method = 'POST',
-                url = endpoint,
-                body = json.dumps(payload),
-                headers = headers,
-            )
-            response = connection.getresponse()
+        self._post(
+            url = self._url.format(bot_token=bot_token),
+            body = json.dumps(payload).encode(self._ENCODING),
+            headers = headers,
+        )
 
-        except Exception as e:
-            raise SenderError(f'Error sending HTTP request: {e}')
-        finally:
-            connection.close()
+    @override
+    def send_document(
+        self,
+        bot_token: str,
+        chat_id: int | str,
+        document: bytes,
+        filename: str,
+        caption: str = '',
+        parse_mode: str = '',
+        disable_notification: bool = False,
+        **params: Any
+    ) -> None:
+        if len(caption) > self._MAX_CAPTION_LENGTH:
+            raise SenderError('Caption exceeds character limit')
+        if len(document) > self._MAX_DOCUMENT_SIZE:
+            raise SenderError('Document exceeds size limit')
+
+        fields: dict[str, Any] = {
+            'chat_id': chat_id,
+            'caption': caption,
+            'parse_mode': parse_mode,
+            'disable_notification': disable_notification,
+        }
+        fields.update(params)
+
+        content_type, chunks = build_multipart_body(
+            fields = fields,
+            file_field = 'document',
+            filename = filename,
+            content = document,
+        )
+        headers = {
+            self._CONTENT_TYPE_HEADER: content_type,
+            self._CONTENT_LENGTH_HEADER: str(sum(map(len, chunks))),
+        }
+
+        self._post(
+            url = self._document_url.format(bot_token=bot_token),
+            body = chunks,
+            headers = headers,
+        )
+
+    @override
+    def close(self) -> None:
+        """Close idle keep-alive connections."""
+
+        self._pool.close()
+
+    def _post(self, url: str, body: bytes | list[bytes], headers: dict[str, str]) -> None:
+        """Send a POST request to Telegram Bot API and check the response.
+
+        Raises:
+            TelegramApiError: Telegram Bot API returned an error.
+            SenderError: Connection failure, timeout or unexpected response.
+        """
+
+        parsed_url = urlparse(url)
 
-        response_data = response.read().decode(self._ENCODING)
+        response, response_body = self._request(
+            protocol = parsed_url.scheme,
+            host = parsed_url.netloc,
+            endpoint = parsed_url.path,
+            body = body,
+            headers = headers,
+        )
+
+        response_data = response_body.decode(self._ENCODING)
         if response.status != self._STATUS_CODE_OK:
             if response.getheader(self._CONTENT_TYPE_HEADER) == self._CONTENT_TYPE_JSON:
                 json_data = json.loads(response_data)
-                raise TelegramApiError(f'Error interacting with Telegram Bot API: {json_data}')
+                raise TelegramApiError(
+                    f'Error interacting with Telegram Bot API: {json_data}',
+                    json_data,
+                )
             else:
                 raise SenderError(f'Error sending HTTP request. Status Code: {response.status}')
-            
-    def _make_connection(self, host: str, protocol: str) -> HTTPConnection | HTTPSConnection:
-        """Create a connection instance depending on the protocol."""
 
-        protocol_to_connection_class: dict[str, type[HTTPConnection | HTTPSConnection]] = {
-            'http': HTTPConnection,
-            'https': HTTPSConnection,
-        }
+    def _request(
+        self,
+        protocol: str,
+        host: str,
+        endpoint: str,
+        body: bytes | list[bytes],
+        headers: dict[str, str],
+    ) -> tuple[HTTPResponse, bytes]:
+        """Send a POST request over a pooled connection and read the whole response.
+
+        The body can be a list of chunks, which are sent one by one. In this case the
+        `Content-Length` header must be specified.
+
+        If a connection taken from the pool turns out to be closed by the server while the request
+        is being written, the request is repeated once over a new connection. An incompletely
+        written request cannot have been handled by the server. Failures after the request has been
+        written are not retried, even if the connection was reused: the server may have handled the
+        request before the connection dropped, and repeating a non-idempotent `sendMessage` request
+        would deliver the message twice. Idle connections closed by the server are detected by
+        the pool before reuse, so such failures are rare.
+
+        Returns:
+            The response and its body.
+
+        Raises:
+            SenderError: Connection failure or timeout.
+        """
+
+        connection, reused = self._pool.acquire(protocol, host)
+
+        while True:
+            try:
+                connection.request(method='POST', url=endpoint, body=body, headers=headers)
+            except ConnectionError as e:
+                connection.close()
+                if not reused:
+                    raise SenderError(f'Error sending HTTP request: {e}')
+
+                # The idle connection was closed by the server, retry over a fresh one.
+                connection, reused = self._pool.connect(protocol, host), False
+                continue
+            except Exception as e:
+                connection.close()
+                raise SenderError(f'Error sending HTTP request: {e}')
+
+            break
+
+        try:
+            response = connection.getresponse()
+            response_body = response.read()
+        except Exception as e:
+            connection.close()
+            raise SenderError(f'Error sending HTTP request: {e}')
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._pool.release(protocol, host, connection)
 
-        if not protocol in protocol_to_connection_class:
-            raise SenderError(f'Unsupported protocol: "{host}"')
-        
-        return protocol_to_connection_class[protocol](host)
+        return response, response_body
@@ -0,0 +1,62 @@
+import json
+import secrets
+from typing import Any
+
+
+_ENCODING = 'utf-8'
+
+
+def format_form_field(value: Any) -> str:
+    """Convert a Telegram Bot API parameter to the value of a `multipart/form-data` field.
+
+    Strings are passed as is, booleans are converted to `true` or `false`, other values, such as
+    numbers and objects, are serialized to JSON.
+    """
+
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+
+    return json.dumps(value)
+
+
+def build_multipart_body(
+    fields: dict[str, Any],
+    file_field: str,
+    filename: str,
+    content: bytes,
+) -> tuple[str, list[bytes]]:
+    """Build the body of a `multipart/form-data` request with one file.
+
+    The body is returned as a list of chunks, so the file contents are sent without being copied
+    into a single buffer.
+
+    Args:
+        fields: Form fields. Values are converted by `format_form_field()`.
+        file_field: Name of the field with the file.
+        filename: Name of the file.
+        content: Contents of the file.
+
+    Returns:
+        The value of the `Content-Type` header and the chunks of the body.
+    """
+
+    boundary = secrets.token_hex(16)
+    quoted_filename = filename.replace('"', '%22').replace('\r', '').replace('\n', '')
+
+    head = ''.join(
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+        f'{format_form_field(value)}\r\n'
+        for name, value in fields.items()
+    )
+    head += (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="{file_field}"; filename="{quoted_filename}"\r\n'
+        f'Content-Type: application/octet-stream\r\n\r\n'
+    )
+
+    chunks = [head.encode(_ENCODING), content, f'\r\n--{boundary}--\r\n'.encode(_ENCODING)]
+
+    return f'multipart/form-data; boundary={boundary}', chunks
@@ -0,0 +1,299 @@
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+import threading
+import time
+from typing import Any, override
+
+from ..interfaces import ITelegramSender
+from ..exceptions import TelegramApiError
+from ..resolve_object_from_config import resolve_object_from_config
+
+
+class TokenBucket:
+    """Token bucket rate limiting algorithm.
+
+    Tokens are added at a constant `rate` up to `capacity`. Each message consumes one token.
+    The balance can go negative: this reserves tokens that will be added in the future, so
+    concurrent callers are served in the order of reservation. Not thread-safe.
+    """
+
+    def __init__(self, rate: float, capacity: float, now: float) -> None:
+        """
+        Args:
+            rate: The number of tokens added per second.
+            capacity: The maximum number of accumulated tokens, i.e. the allowed burst size.
+            now: The current time in seconds. The bucket is created full.
+        """
+
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated_at = now
+
+    def get_delay(self, now: float) -> float:
+        """Get the number of seconds until a token becomes available."""
+
+        self._refill(now)
+        if self._tokens >= 1:
+            return 0.0
+
+        return (1 - self._tokens) / self._rate
+
+    def consume(self, now: float) -> None:
+        """Take one token, possibly reserving it in advance."""
+
+        self._refill(now)
+        self._tokens -= 1
+
+    def block(self, now: float, duration: float) -> None:
+        """Make sure no tokens are available for the next `duration` seconds."""
+
+        self._refill(now)
+        self._tokens = min(self._tokens, 1 - duration * self._rate)
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated_at)
+        self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+        self._updated_at = now
+
+
+@dataclass
+class RateLimiterStats:
+    """Counters of `RateLimitedTelegramSender`.
+
+    Attributes:
+        messages: The number of messages passed to the wrapped sender, including retries.
+        delayed_messages: The number of messages that had to wait for the rate limit.
+        retries: The number of messages repeated after a flood control error (code 429).
+        total_wait_time: Total time in seconds spent waiting.
+        max_wait_time: The longest single wait in seconds.
+    """
+
+    messages: int = 0
+    delayed_messages: int = 0
+    retries: int = 0
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+
+
+class RateLimitedTelegramSender(ITelegramSender):
+    """Wrapper over any `ITelegramSender` that keeps sending within the Telegram flood limits.
+
+    Messages are delayed by token buckets:
+    - a global bucket for all messages of the sender (by default 30 messages per second);
+    - a bucket for each chat (by default 1 message per second);
+    - an additional bucket for each group or channel (by default 20 messages per minute). Chats
+    with a negative ID or an `@username` are considered groups or channels.
+
+    If Telegram still rejects a message with code 429, the recipient is paused for the number of
+    seconds in the `retry_after` parameter of the response and the message is sent again.
+
+    Documents uploaded with `send_document()` are counted and retried in the same way as messages.
+
+    Waiting blocks the calling thread, so it is recommended to combine the wrapper with the
+    queued delivery mode of `TelegramHandler`. Thread-safe.
+
+    Docs:
+        https://core.telegram.org/bots/faq#my-bot-is-hitting-limits-how-do-i-avoid-this
+    """
+
+    _TOO_MANY_REQUESTS_CODE = 429
+    _SECONDS_PER_MINUTE = 60
+
+    def __init__(
+        self,
+        sender: ITelegramSender | dict[str, Any],
+        messages_per_second: float = 30.0,
+        chat_messages_per_second: float = 1.0,
+        group_messages_per_minute: float = 20.0,
+        chat_burst: int = 1,
+        max_retries: int = 3,
+        max_retry_after: float = 60.0,
+    ) -> None:
+        """
+        Args:
+            sender: The wrapped sender. A dictionary can be specified to support configuration
+                from a file.
+            messages_per_second: Global limit of messages per second for all chats.
+            chat_messages_per_second: Limit of messages per second for one chat.
+            group_messages_per_minute: Limit of messages per minute for one group or channel.
+            chat_burst: The number of messages that can be sent to one chat without a delay after
+                a period of inactivity.
+            max_retries: The maximum number of repetitions of one message after flood control
+                errors. If `0`, errors are raised immediately, but still pause the recipient.
+            max_retry_after: If Telegram asks to wait longer than this number of seconds,
+                the error is raised without waiting and the recipient is not paused.
+        """
+
+        if isinstance(sender, dict):
+            self._sender = resolve_object_from_config(
+                sender,
+                ITelegramSender, # type: ignore[type-abstract]
+                                 # https://github.com/python/mypy/issues/4717
+            )
+        else:
+            self._sender = sender
+
+        self._chat_rate = chat_messages_per_second
+        self._group_rate = group_messages_per_minute / self._SECONDS_PER_MINUTE
+        self._group_burst = group_messages_per_minute
+        self._chat_burst = chat_burst
+        self._max_retries = max_retries
+        self._max_retry_after = max_retry_after
+
+        self._clock = time.monotonic
+        self._sleep = time.sleep
+        self._lock = threading.Lock()
+        self._stats = RateLimiterStats()
+        self._global_bucket = TokenBucket(
+            rate = messages_per_second,
+            capacity = messages_per_second,
+            now = self._clock(),
+        )
+        self._chat_buckets: dict[int | str, list[TokenBucket]] = {}
+
+    @property
+    def stats(self) -> RateLimiterStats:
+        """A snapshot of the counters."""
+
+        with self._lock:
+            return replace(self._stats)
+
+    @override
+    def send(
+        self,
+        bot_token: str,
+        chat_id: int | str,
+        text: str,
+        parse_mode: str = '',
+        disable_notification: bool = False,
+        **params: Any
+    ) -> None:
+        self._call_with_retries(
+            chat_id,
+            lambda: self._sender.send(
+                bot_token = bot_token,
+                chat_id = chat_id,
+                text = text,
+                parse_mode = parse_mode,
+                disable_notification = disable_notification,
+                **params
+            ),
+        )
+
+    @override
+    def send_document(
+        self,
+        bot_token: str,
+        chat_id: int | str,
+        document: bytes,
+        filename: str,
+        caption: str = '',
+        parse_mode: str = '',
+        disable_notification: bool = False,
+        **params: Any
+    ) -> None:
+        self._call_with_retries(
+            chat_id,
+            lambda: self._sender.send_document(
+                bot_token = bot_token,
+                chat_id = chat_id,
+                document = document,
+                filename = filename,
+                caption = caption,
+                parse_mode = parse_mode,
+                disable_notification = disable_notification,
+                **params
+            ),
+        )
+
+    @override
+    def close(self) -> None:
+        """Close the wrapped sender."""
+
+        self._sender.close()
+
+    def _call_with_retries(self, chat_id: int | str, request: Callable[[], None]) -> None:
+        """Make a request to the chat within the limits, repeating it after flood control errors."""
+
+        retries = 0
+
+        while True:
+            self._wait(chat_id)
+
+            try:
+                request()
+                return
+            except TelegramApiError as e:
+                retry_after = self._get_retry_after(e)
+                if retry_after is None or retry_after > self._max_retry_after:
+                    raise
+
+                self._block(chat_id, retry_after)
+                if retries >= self._max_retries:
+                    raise
+
+            retries += 1
+            with self._lock:
+                self._stats.retries += 1
+
+    def _wait(self, chat_id: int | str) -> None:
+        """Reserve a token in every bucket of the chat and sleep until it becomes available."""
+
+        with self._lock:
+            now = self._clock()
+            buckets = [self._global_bucket, *self._get_chat_buckets(chat_id, now)]
+
+            delay = max(bucket.get_delay(now) for bucket in buckets)
+            for bucket in buckets:
+                bucket.consume(now)
+
+            self._stats.messages += 1
+            if delay > 0:
+                self._stats.delayed_messages += 1
+                self._stats.total_wait_time += delay
+                self._stats.max_wait_time = max(self._stats.max_wait_time, delay)
+
+        if delay > 0:
+            self._sleep(delay)
+
+    def _block(self, chat_id: int | str, duration: float) -> None:
+        """Pause sending to the chat for `duration` seconds."""
+
+        with self._lock:
+            now = self._clock()
+            for bucket in self._get_chat_buckets(chat_id, now):
+                bucket.block(now, duration)
+
+    def _get_chat_buckets(self, chat_id: int | str, now: float) -> list[TokenBucket]:
+        """Get or create the buckets of the chat. Called under the lock."""
+
+        buckets = self._chat_buckets.get(chat_id)
+        if buckets is not None:
+            return buckets
+
+        buckets = [TokenBucket(rate=self._chat_rate, capacity=self._chat_burst, now=now)]
+        if self._is_group(chat_id):
+            buckets.append(
+                TokenBucket(rate=self._group_rate, capacity=self._group_burst, now=now)
+            )
+
+        self._chat_buckets[chat_id] = buckets
+        return buckets
+
+    def _get_retry_after(self, error: TelegramApiError) -> float | None:
+        """Get the number of seconds to wait if the error is caused by flood control."""
+
+        if error.error_code != self._TOO_MANY_REQUESTS_CODE:
+            return None
+
+        return error.retry_after or 1.0
+
+    @staticmethod
+    def _is_group(chat_id: int | str) -> bool:
+        """Check whether the chat is a group or a channel."""
+
+        if isinstance(chat_id, str):
+            return chat_id.startswith('@') or chat_id.startswith('-')
+
+        return chat_id < 0
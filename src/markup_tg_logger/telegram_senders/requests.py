@@ -1,32 +1,73 @@
 from typing import Any, override
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from ..config import MAX_MESSAGE_LENGTH, TELEGRAM_SEND_MESSAGE_URL
+from ..config import (
+    MAX_CAPTION_LENGTH, MAX_DOCUMENT_SIZE, MAX_MESSAGE_LENGTH,
+    TELEGRAM_SEND_DOCUMENT_URL, TELEGRAM_SEND_MESSAGE_URL,
+)
 from ..interfaces import ITelegramSender
 from ..exceptions import SenderError, TelegramApiError
+from .multipart import format_form_field
 
 
 class RequestsTelegramSender(ITelegramSender):
-    """Implementation of Telegram Bot API method `sendMessage` on the `requests` library.
-    
+    """Implementation of Telegram Bot API methods `sendMessage` and `sendDocument` on the
+    `requests` library.
+
+    Requests are sent through an owned `requests.Session`, so connections are pooled and reused
+    between messages.
+
     Docs:
         https://core.telegram.org/bots/api#sendmessage
+        https://core.telegram.org/bots/api#senddocument
     """
 
     _MAX_MESSAGE_LENGTH: int = MAX_MESSAGE_LENGTH
+    _MAX_CAPTION_LENGTH: int = MAX_CAPTION_LENGTH
+    _MAX_DOCUMENT_SIZE: int = MAX_DOCUMENT_SIZE
     _STATUS_CODE_OK = 200
     _CONTENT_TYPE_HEADER = 'Content-Type'
     _CONTENT_TYPE_JSON = 'application/json'
 
-    def __init__(self, url: str = TELEGRAM_SEND_MESSAGE_URL) -> None:
+    def __init__(
+        self,
+        url: str = TELEGRAM_SEND_MESSAGE_URL,
+        connect_timeout: float | None = 10.0,
+        read_timeout: float | None = 30.0,
+        pool_connections: int = 1,
+        pool_maxsize: int = 10,
+        document_url: str = TELEGRAM_SEND_DOCUMENT_URL,
+    ) -> None:
         """
         Args:
             url: Telegram Bot API URL for the `sendMessage` method. Contains one required parameter
                 `{bot_token}`. Use default value. Overridden for tests only.
+            connect_timeout: Timeout in seconds for establishing a connection. If `None`, wait
+                indefinitely.
+            read_timeout: Timeout in seconds for waiting for the server response. If `None`, wait
+                indefinitely.
+            pool_connections: The number of hosts for which connection pools are cached. Parameter
+                of `requests.adapters.HTTPAdapter`.
+            pool_maxsize: The maximum number of connections kept in the pool of one host. Should
+                not be less than the number of threads sending messages simultaneously. Parameter
+                of `requests.adapters.HTTPAdapter`.
+            document_url: Telegram Bot API URL for the `sendDocument` method. Contains one required
+                parameter `{bot_token}`. Use default value. Overridden for tests only.
+
+        Docs:
+            https://requests.readthedocs.io/en/latest/api/#requests.adapters.HTTPAdapter
         """
 
         self._url = url
+        self._document_url = document_url
+        self._timeout = (connect_timeout, read_timeout)
+
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self._session = requests.Session()
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
 
     @override
     def send(
@@ -38,9 +79,11 @@ class RequestsTelegramSender(ITelegramSender):
         disable_notification: bool = False,
         **params: dict[str, Any]
     ) -> None:
-        if len(text) > self._MAX_MESSAGE_LENGTH:
+        # The message limit applies to the text after parsing entities, so only the text without
+        # markup can be checked before sending.
+        if not parse_mode and len(text) > self._MAX_MESSAGE_LENGTH:
             raise SenderError('Text exceeds message character limit')
-        
+
         url = self._url.format(bot_token=bot_token)
 
         payload: dict[str, Any] = {
@@ -52,14 +95,75 @@ class RequestsTelegramSender(ITelegramSender):
         payload.update(params)
 
         try:
-            response = requests.post(url, json=payload)
+            response = self._session.post(url, json=payload, timeout=self._timeout)
+        except Exception as e:
+            raise SenderError(f'Error sending HTTP request: {e}')
+
+        self._check_response(response)
+
+    @override
+    def send_document(
+        self,
+        bot_token: str,
+        chat_id: int | str,
+        document: bytes,
+        filename: str,
+        caption: str = '',
+        parse_mode: str = '',
+        disable_notification: bool = False,
+        **params: Any
+    ) -> None:
+        if len(caption) > self._MAX_CAPTION_LENGTH:
+            raise SenderError('Caption exceeds character limit')
+        if len(document) > self._MAX_DOCUMENT_SIZE:
+            raise SenderError('Document exceeds size limit')
+
+        url = self._document_url.format(bot_token=bot_token)
+
+        fields: dict[str, Any] = {
+            'chat_id': chat_id,
+            'caption': caption,
+            'parse_mode': parse_mode,
+            'disable_notification': disable_notification,
+        }
+        fields.update(params)
+        data = {name: format_form_field(value) for name, value in fields.items()}
+
+        try:
+            response = self._session.post(
+                url,
+                data = data,
+                files = {'document': (filename, document)},
+                timeout = self._timeout,
+            )
         except Exception as e:
             raise SenderError(f'Error sending HTTP request: {e}')
-        
+
+        self._check_response(response)
+
+    @override
+    def close(self) -> None:
+        """Close pooled connections of the session.
+
+        The session remains usable, new connections will be opened on the next request.
+        """
+
+        self._session.close()
+
+    def _check_response(self, response: requests.Response) -> None:
+        """Raise an exception if Telegram Bot API returned an error.
+
+        Raises:
+            TelegramApiError: Telegram Bot API returned an error.
+            SenderError: Unexpected response.
+        """
+
         if response.status_code != self._STATUS_CODE_OK:
             if response.headers.get(self._CONTENT_TYPE_HEADER) == self._CONTENT_TYPE_JSON:
                 json_data = response.json()
-                raise TelegramApiError(f'Error interacting with Telegram Bot API: {json_data}')
+                raise TelegramApiError(
+                    f'Error interacting with Telegram Bot API: {json_data}',
+                    json_data,
+                )
             else:
                 raise SenderError(f'Error sending HTTP request. Status Code: {response.status_code}')
-        
@@ -10,3 +10,4 @@ ParseMode: TypeAlias = Literal['', 'HTML', 'Markdown', 'MarkdownV2']
 SysExcInfoType: TypeAlias = (
     tuple[type[BaseException], BaseException, TracebackType | None] | tuple[None, None, None]
 )
+OverflowPolicy: TypeAlias = Literal['drop_oldest', 'drop_newest', 'block']
@@ -0,0 +1,51 @@
+"""Test the `AdmissionChain`."""
+
+import logging
+from logging import LogRecord
+from typing import override
+
+import pytest
+
+from markup_tg_logger.admissions.chain import AdmissionChain
+from markup_tg_logger.exceptions import MarkupTgLoggerException
+from markup_tg_logger.interfaces import IAdmission
+
+
+class FakeAdmission(IAdmission):
+    def __init__(self, result: bool) -> None:
+        self.result = result
+        self.calls = 0
+
+    @override
+    def admit(self, record: LogRecord) -> bool:
+        self.calls += 1
+        return self.result
+
+
+@pytest.mark.unit()
+def test_admit() -> None:
+    record = logging.makeLogRecord({'msg': 'text'})
+
+    assert AdmissionChain([]).admit(record)
+    assert AdmissionChain([FakeAdmission(True), FakeAdmission(True)]).admit(record)
+    assert not AdmissionChain([FakeAdmission(True), FakeAdmission(False)]).admit(record)
+
+@pytest.mark.unit()
+def test_rejection_stops_chain() -> None:
+    first, second = FakeAdmission(False), FakeAdmission(True)
+    chain = AdmissionChain([first, second])
+
+    assert not chain.admit(logging.makeLogRecord({'msg': 'text'}))
+    assert first.calls == 1
+    assert second.calls == 0
+
+@pytest.mark.unit()
+def test_init_from_config() -> None:
+    chain = AdmissionChain([{'()': 'markup_tg_logger.RateAdmission', 'max_records': 1}])
+    record = logging.makeLogRecord({'msg': 'text'})
+
+    assert chain.admit(record)
+    assert not chain.admit(record)
+
+    with pytest.raises(MarkupTgLoggerException):
+        AdmissionChain([{'()': 'markup_tg_logger.StaticNotifier'}])
@@ -0,0 +1,69 @@
+"""Test the `RateAdmission`."""
+
+import logging
+from logging import LogRecord
+
+import pytest
+
+from markup_tg_logger.admissions.rate import RateAdmission
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def time(self) -> float:
+        return self.now
+
+
+def make_record(level: int = logging.INFO) -> LogRecord:
+    return logging.makeLogRecord({'msg': 'text', 'levelno': level})
+
+def make_admission(clock: FakeClock, **params) -> RateAdmission:
+    admission = RateAdmission(**params)
+    admission._clock = clock.time
+    admission._updated_at = clock.now
+
+    return admission
+
+@pytest.mark.unit()
+def test_burst() -> None:
+    admission = make_admission(FakeClock(), max_records=3, period=60)
+
+    assert [admission.admit(make_record()) for _ in range(5)] == [True, True, True, False, False]
+    assert admission.rejected_count == 2
+
+@pytest.mark.unit()
+def test_refill() -> None:
+    clock = FakeClock()
+    admission = make_admission(clock, max_records=3, period=60)
+
+    for _ in range(3):
+        admission.admit(make_record())
+
+    clock.now = 19
+    assert not admission.admit(make_record())
+
+    clock.now = 20
+    assert admission.admit(make_record())
+    assert not admission.admit(make_record())
+
+    clock.now = 1000
+    assert [admission.admit(make_record()) for _ in range(4)] == [True, True, True, False]
+
+@pytest.mark.unit()
+def test_bypass_level() -> None:
+    admission = make_admission(FakeClock(), max_records=1, bypass_level='ERROR')
+
+    assert admission.admit(make_record())
+    assert not admission.admit(make_record(logging.WARNING))
+    assert admission.admit(make_record(logging.ERROR))
+    assert admission.admit(make_record(logging.CRITICAL))
+
+@pytest.mark.unit()
+def test_invalid_parameters() -> None:
+    with pytest.raises(ValueError):
+        RateAdmission(max_records=0)
+
+    with pytest.raises(ValueError):
+        RateAdmission(period=0)
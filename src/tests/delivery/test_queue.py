@@ -0,0 +1,266 @@
+"""Test the `DeliveryQueue`."""
+
+import logging
+import threading
+import time
+
+import pytest
+
+from markup_tg_logger.delivery import DeliveryQueue, DeliveryTask
+from markup_tg_logger.types import ParseMode
+
+
+def make_task(
+    text: str,
+    parse_mode: ParseMode = '',
+    disable_notification: bool = False,
+) -> DeliveryTask:
+    return DeliveryTask(
+        record = logging.makeLogRecord({'msg': text}),
+        text = text,
+        parse_mode = parse_mode,
+        disable_notification = disable_notification,
+    )
+
+
+class BlockingConsumer:
+    """Consumer that waits for permission before processing each task."""
+
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+        self.tasks: list[DeliveryTask] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, task: DeliveryTask) -> None:
+        self.started.set()
+        self.release.wait()
+        self.texts.append(task.text)
+        self.tasks.append(task)
+
+
+@pytest.mark.unit()
+def test_flush_delivers_all_tasks() -> None:
+    texts: list[str] = []
+    delivery_queue = DeliveryQueue()
+    delivery_queue.start(lambda task: texts.append(task.text))
+
+    for index in range(100):
+        delivery_queue.put(make_task(str(index)))
+
+    assert delivery_queue.flush()
+    assert texts == [str(index) for index in range(100)]
+
+    delivery_queue.close()
+    assert not delivery_queue.is_running
+
+@pytest.mark.unit()
+def test_drop_oldest() -> None:
+    consumer = BlockingConsumer()
+    delivery_queue = DeliveryQueue(maxsize=2, overflow_policy='drop_oldest')
+    delivery_queue.start(consumer)
+
+    delivery_queue.put(make_task('in progress'))
+    consumer.started.wait()
+
+    assert delivery_queue.put(make_task('1'))
+    assert delivery_queue.put(make_task('2'))
+    assert delivery_queue.put(make_task('3'))
+
+    consumer.release.set()
+    delivery_queue.close()
+
+    assert consumer.texts == ['in progress', '2', '3']
+    assert delivery_queue.dropped_count == 1
+
+@pytest.mark.unit()
+def test_drop_newest() -> None:
+    consumer = BlockingConsumer()
+    delivery_queue = DeliveryQueue(maxsize=2, overflow_policy='drop_newest')
+    delivery_queue.start(consumer)
+
+    delivery_queue.put(make_task('in progress'))
+    consumer.started.wait()
+
+    assert delivery_queue.put(make_task('1'))
+    assert delivery_queue.put(make_task('2'))
+    assert not delivery_queue.put(make_task('3'))
+
+    consumer.release.set()
+    delivery_queue.close()
+
+    assert consumer.texts == ['in progress', '1', '2']
+    assert delivery_queue.dropped_count == 1
+
+@pytest.mark.unit()
+def test_block_with_timeout() -> None:
+    consumer = BlockingConsumer()
+    delivery_queue = DeliveryQueue(maxsize=1, overflow_policy='block', block_timeout=0.01)
+    delivery_queue.start(consumer)
+
+    delivery_queue.put(make_task('in progress'))
+    consumer.started.wait()
+
+    assert delivery_queue.put(make_task('1'))
+    assert not delivery_queue.put(make_task('2'))
+
+    consumer.release.set()
+    delivery_queue.close()
+
+    assert consumer.texts == ['in progress', '1']
+    assert delivery_queue.dropped_count == 1
+
+@pytest.mark.unit()
+def test_flush_timeout() -> None:
+    consumer = BlockingConsumer()
+    delivery_queue = DeliveryQueue(flush_timeout=0.01)
+    delivery_queue.start(consumer)
+
+    delivery_queue.put(make_task('in progress'))
+
+    assert not delivery_queue.flush()
+
+    consumer.release.set()
+    delivery_queue.close()
+
+    assert consumer.texts == ['in progress']
+
+@pytest.mark.unit()
+def test_consumer_error_does_not_stop_worker() -> None:
+    texts: list[str] = []
+
+    def consumer(task: DeliveryTask) -> None:
+        if task.text == 'error':
+            raise RuntimeError('consumer error')
+        texts.append(task.text)
+
+    delivery_queue = DeliveryQueue()
+    delivery_queue.start(consumer)
+
+    delivery_queue.put(make_task('error'))
+    delivery_queue.put(make_task('ok'))
+    delivery_queue.close()
+
+    assert texts == ['ok']
+
+@pytest.mark.unit()
+def test_coalesce_queued_tasks() -> None:
+    consumer = BlockingConsumer()
+    delivery_queue = DeliveryQueue(coalesce_window=0, coalesce_separator='\n')
+    delivery_queue.start(consumer)
+
+    delivery_queue.put(make_task('in progress'))
+    consumer.started.wait()
+
+    delivery_queue.put(make_task('1', disable_notification=True))
+    delivery_queue.put(make_task('2'))
+    delivery_queue.put(make_task('3', parse_mode='HTML'))
+    delivery_queue.put(make_task('4', parse_mode='HTML'))
+
+    consumer.release.set()
+    delivery_queue.close()
+
+    assert consumer.texts == ['in progress', '1\n2', '3\n4']
+    assert [task.parse_mode for task in consumer.tasks] == ['', '', 'HTML']
+    assert not consumer.tasks[1].disable_notification
+    assert consumer.tasks[1].record.msg == '1'
+
+@pytest.mark.unit()
+def test_coalesce_max_length() -> None:
+    consumer = BlockingConsumer()
+    delivery_queue = DeliveryQueue(
+        coalesce_window = 0,
+        coalesce_max_length = 5,
+        coalesce_separator = '\n',
+    )
+    delivery_queue.start(consumer)
+
+    delivery_queue.put(make_task('in progress'))
+    consumer.started.wait()
+
+    for text in ['1', '2', '3', '4', 'long text', '5']:
+        delivery_queue.put(make_task(text))
+
+    consumer.release.set()
+    delivery_queue.close()
+
+    assert consumer.texts == ['in progress', '1\n2\n3', '4', 'long text', '5']
+
+@pytest.mark.unit()
+def test_coalesce_window() -> None:
+    texts: list[str] = []
+    delivery_queue = DeliveryQueue(coalesce_window=10, coalesce_max_length=4)
+    delivery_queue.start(lambda task: texts.append(task.text))
+
+    delivery_queue.put(make_task('1'))
+    delivery_queue.put(make_task('2'))
+
+    # The batch is full before the window expires.
+    assert delivery_queue.flush()
+    assert texts == ['1\n\n2']
+
+    delivery_queue.close()
+
+@pytest.mark.unit()
+def test_close_full_queue_with_stuck_worker() -> None:
+    consumer = BlockingConsumer()
+    delivery_queue = DeliveryQueue(maxsize=1, overflow_policy='block', flush_timeout=0.05)
+    delivery_queue.start(consumer)
+
+    delivery_queue.put(make_task('in progress'))
+    consumer.started.wait()
+    delivery_queue.put(make_task('1'))
+
+    started_at = time.monotonic()
+    delivery_queue.close()
+
+    assert time.monotonic() - started_at < 5
+    consumer.release.set()
+
+@pytest.mark.unit()
+def test_put_after_close_is_discarded() -> None:
+    texts: list[str] = []
+    delivery_queue = DeliveryQueue()
+    delivery_queue.start(lambda task: texts.append(task.text))
+    delivery_queue.close()
+
+    assert not delivery_queue.put(make_task('late'))
+    assert delivery_queue.dropped_count == 1
+    assert texts == []
+
+@pytest.mark.unit()
+def test_close_wakes_blocked_producer() -> None:
+    consumer = BlockingConsumer()
+    delivery_queue = DeliveryQueue(maxsize=1, overflow_policy='block', flush_timeout=0.05)
+    delivery_queue.start(consumer)
+
+    delivery_queue.put(make_task('in progress'))
+    consumer.started.wait()
+    delivery_queue.put(make_task('1'))
+
+    results: list[bool] = []
+    producer = threading.Thread(target=lambda: results.append(delivery_queue.put(make_task('2'))))
+    producer.start()
+
+    delivery_queue.close()
+    producer.join(5)
+
+    assert results == [False]
+    consumer.release.set()
+
+@pytest.mark.unit()
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        DeliveryQueue(maxsize=0)
+
+    with pytest.raises(ValueError):
+        DeliveryQueue(workers=0)
+
+    with pytest.raises(ValueError):
+        DeliveryQueue(overflow_policy='unknown') # type: ignore[arg-type]
+
+    with pytest.raises(ValueError):
+        DeliveryQueue(coalesce_window=-1)
+
+    with pytest.raises(ValueError):
+        DeliveryQueue(coalesce_max_length=0)
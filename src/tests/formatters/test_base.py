@@ -39,3 +39,24 @@ def test_level_names() -> None:
 
     assert debug_text == DEBUG
     assert warning_text == WARNING_DEFAULT
+
+@pytest.mark.unit()
+def test_record_is_not_modified() -> None:
+    record = logging.makeLogRecord({
+        'levelno': logging.DEBUG,
+        'levelname': logging._levelToName[logging.DEBUG],
+        'msg': 'text %s',
+        'args': ('arg', ),
+    })
+
+    formatter = BaseMarkupFormatter(
+        fmt = '{levelname} {message}',
+        style = '{',
+        level_names = {logging.DEBUG: 'test_debug'},
+    )
+
+    assert formatter.format(record) == 'test_debug text arg'
+    assert record.levelname == 'DEBUG'
+    assert record.msg == 'text %s'
+    assert record.args == ('arg', )
+    assert not hasattr(record, 'message')
@@ -50,6 +50,18 @@ def test_escape_message_stack_and_exception() -> None:
     assert stack_text == '\n' + ESCAPED_TEXT
     assert exc_text == '\nValueError: ' + ESCAPED_TEXT
 
+@pytest.mark.unit()
+def test_escape_message_with_args() -> None:
+    formatter = EscapeMarkupFormatter(
+        fmt = '{message}',
+        style = '{',
+        escape_func = lambda text: html.escape(text, quote=False),
+    )
+
+    record = logging.makeLogRecord({'msg': '<code>%s %d</code>', 'args': ('test', 1)})
+
+    assert formatter.format(record) == '&lt;code&gt;test 1&lt;/code&gt;'
+
 @pytest.mark.unit()
 def test_no_escape_message_stack_and_exception() -> None:
     formatter = EscapeMarkupFormatter(
@@ -131,3 +143,43 @@ def test_result_template() -> None:
     expected_text = f'{PLAIN_TEXT}\nValueError: {PLAIN_TEXT}\n{PLAIN_TEXT}'
 
     assert text == HTML_TEMPLATE.format(text=expected_text)
+
+class CountingArgument:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __str__(self) -> str:
+        self.calls += 1
+        return '<arg>'
+
+
+@pytest.mark.unit()
+def test_message_is_interpolated_once() -> None:
+    formatter = EscapeMarkupFormatter(
+        fmt = '{message}',
+        style = '{',
+        escape_func = lambda text: html.escape(text, quote=False),
+    )
+
+    argument = CountingArgument()
+    record = logging.makeLogRecord({'msg': 'text %s', 'args': (argument, )})
+
+    assert formatter.format(record) == 'text &lt;arg&gt;'
+    assert argument.calls == 1
+
+@pytest.mark.unit()
+def test_record_is_not_modified() -> None:
+    formatter = EscapeMarkupFormatter(
+        fmt = '{message}',
+        style = '{',
+        escape_func = lambda text: html.escape(text, quote=False),
+        exception_template = HTML_TEMPLATE,
+    )
+
+    record = make_log_record(msg=HTML_TEXT, exc_info=HTML_TEXT)
+    expected_text = f'{ESCAPED_TEXT}\n<tag>ValueError: {ESCAPED_TEXT}</tag>'
+
+    assert formatter.format(record) == expected_text
+    assert formatter.format(record) == expected_text
+    assert record.msg == HTML_TEXT
+    assert logging.Formatter().format(record) == f'{HTML_TEXT}\nValueError: {HTML_TEXT}'
@@ -0,0 +1,105 @@
+"""Test the `FormatPlan` and `compile_template`."""
+
+import logging
+from typing import override
+
+import pytest
+
+from markup_tg_logger.formatters.base import BaseMarkupFormatter
+from markup_tg_logger.formatters.format_plan import FormatPlan, compile_template
+
+
+def make_record() -> logging.LogRecord:
+    return logging.makeLogRecord({'name': 'test_logger', 'msg': 'text', 'lineno': 7})
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    'fmt, style',
+    [
+        ('%(name)s:%(lineno)d %(name)s', '%'),
+        ('{name}:{lineno:>{width}} {name}', '{'),
+        ('${name}:$lineno ${name}', '$'),
+    ],
+)
+def test_fields(fmt: str, style: str) -> None:
+    plan = FormatPlan(fmt, style, defaults={'width': 1})  # type: ignore[arg-type]
+
+    assert plan.fields[:2] == ('name', 'lineno')
+    assert plan.uses('name')
+    assert not plan.uses('asctime')
+    assert plan.render(make_record()) == 'test_logger:7 test_logger'
+
+@pytest.mark.unit()
+def test_str_format_attribute_access() -> None:
+    plan = FormatPlan('{args[0]} {name.upper}', '{')
+
+    assert plan.fields == ('args', 'name')
+
+@pytest.mark.unit()
+def test_missing_field() -> None:
+    record = make_record()
+
+    assert FormatPlan('{ip} {name}', '{', defaults={'ip': '-'}).render(record) == '- test_logger'
+
+    with pytest.raises(ValueError):
+        FormatPlan('{ip} {name}', '{').render(record)
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    'fmt, fields',
+    [
+        ('%%(foo)s %(name)s', ('name', )),
+        ('100%% %%%(name)s', ('name', )),
+        ('%%%%(foo)s %(lineno)d', ('lineno', )),
+    ],
+)
+def test_escaped_percent_is_not_a_field(fmt: str, fields: tuple[str, ...]) -> None:
+    record = make_record()
+
+    assert FormatPlan(fmt, '%').fields == fields
+    assert BaseMarkupFormatter(fmt).format(record) == logging.Formatter(fmt).format(record)
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    'template, expected',
+    [
+        ('<b>{text}</b>', '<b>a</b>'),
+        ('{text}|{text}', 'a|a'),
+        ('{{{text}}}', '{a}'),
+        ('{text!r}', "'a'"),
+        ('no text', 'no text'),
+    ],
+)
+def test_compile_template(template: str, expected: str) -> None:
+    markup = compile_template(template)
+
+    assert markup is not None
+    assert markup('a') == expected
+
+@pytest.mark.unit()
+def test_compile_identity_template() -> None:
+    assert compile_template('{text}') is None
+
+
+class CountingFormatter(BaseMarkupFormatter):
+    def __init__(self, fmt: str) -> None:
+        super().__init__(fmt, style='{')
+        self.time_calls = 0
+
+    @override
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        self.time_calls += 1
+        return super().formatTime(record, datefmt)
+
+
+@pytest.mark.unit()
+def test_asctime_is_computed_only_if_used() -> None:
+    formatter = CountingFormatter('{message}')
+    formatter.format(make_record())
+
+    assert formatter.time_calls == 0
+
+    formatter = CountingFormatter('{asctime} {message}')
+    formatter.format(make_record())
+
+    assert formatter.time_calls == 1
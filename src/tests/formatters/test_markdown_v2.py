@@ -0,0 +1,83 @@
+"""Test the `MarkdownV2Formatter`."""
+
+import logging
+import pytest
+
+from markup_tg_logger.defaults import MARKDOWN_V2_PYTHON_TEMPLATE
+from markup_tg_logger.formatters.markdown_v2 import MarkdownV2Formatter
+from markup_tg_logger.message_splitters.markdown import MarkdownV2MessageSplitter
+
+
+MARKDOWN_TEXT = 'value = f(x) * 2.5'
+ESCAPED_TEXT = 'value \\= f\\(x\\) \\* 2\\.5'
+
+
+def make_log_record(msg: str = '', stack_info: str = '', exc_info: str = '') -> logging.LogRecord:
+    """Make a `LogRecord` for tests."""
+
+    return logging.makeLogRecord({
+        'name': 'test.logger',
+        'levelno': logging.INFO,
+        'levelname': logging._levelToName[logging.INFO],
+        'msg': msg,
+        'stack_info': stack_info,
+        'exc_info': (ValueError, ValueError(exc_info), None) if exc_info else '',
+    })
+
+@pytest.mark.unit()
+def test_parse_mode() -> None:
+    assert MarkdownV2Formatter().parse_mode == 'MarkdownV2'
+
+@pytest.mark.unit()
+def test_escape_message() -> None:
+    formatter = MarkdownV2Formatter(fmt='*{levelname}* `{name}` {message}', style='{')
+
+    text = formatter.format(make_log_record(msg=MARKDOWN_TEXT))
+
+    assert text == f'*⬜️ INFO ⬜️* `test.logger` {ESCAPED_TEXT}'
+
+@pytest.mark.unit()
+def test_escape_inside_code_block() -> None:
+    formatter = MarkdownV2Formatter(
+        fmt = '{message}',
+        style = '{',
+        stack_info_template = MARKDOWN_V2_PYTHON_TEMPLATE,
+        exception_template = '`{text}`',
+    )
+
+    record = make_log_record(msg=MARKDOWN_TEXT, stack_info='a.b(`c`)', exc_info='x.y')
+    text = formatter.format(record)
+
+    assert text == (
+        f'{ESCAPED_TEXT}\n'
+        '`ValueError: x.y`\n'
+        '```python\na.b(\\`c\\`)\n```'
+    )
+
+@pytest.mark.unit()
+def test_escape_outside_code() -> None:
+    formatter = MarkdownV2Formatter(
+        fmt = '{message}',
+        style = '{',
+        exception_template = '```python\nx```\n_{text}_',
+    )
+
+    text = formatter.format(make_log_record(exc_info='x.y'))
+
+    assert text == '\n```python\nx```\n_ValueError: x\\.y_'
+
+@pytest.mark.unit()
+def test_result_is_split_by_markdown_v2_splitter() -> None:
+    formatter = MarkdownV2Formatter(
+        fmt = '*{levelname}* {message}',
+        style = '{',
+        exception_template = MARKDOWN_V2_PYTHON_TEMPLATE,
+    )
+    splitter = MarkdownV2MessageSplitter(max_message_length=50)
+
+    record = make_log_record(msg=MARKDOWN_TEXT * 5, exc_info='`line`\n' * 10)
+    messages = splitter.split(formatter.format(record))
+
+    assert len(messages) > 1
+    assert all(len(message) <= 50 for message in messages)
+    assert all(message.count('```') % 2 == 0 for message in messages)
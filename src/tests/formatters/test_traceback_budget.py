@@ -0,0 +1,121 @@
+"""Test the `TracebackBudget`."""
+
+import logging
+import sys
+
+import pytest
+
+from markup_tg_logger.formatters.html import HtmlFormatter
+from markup_tg_logger.formatters.traceback_budget import TracebackBudget
+from markup_tg_logger.types import SysExcInfoType
+
+
+def recurse(depth: int, message: str = 'error') -> None:
+    if depth == 0:
+        raise ValueError(message)
+
+    recurse(depth - 1, message)
+
+def make_exc_info(depth: int, message: str = 'error') -> SysExcInfoType:
+    try:
+        recurse(depth, message)
+    except ValueError:
+        return sys.exc_info()
+
+    raise AssertionError('The exception was not raised')
+
+def count_frames(text: str) -> int:
+    return text.count('  File "')
+
+@pytest.mark.unit()
+def test_short_traceback_is_not_changed() -> None:
+    exc_info = make_exc_info(depth=3)
+
+    text = TracebackBudget().format_exception(exc_info)
+
+    assert text == logging.Formatter().formatException(exc_info)
+
+@pytest.mark.unit()
+def test_frames_are_omitted() -> None:
+    exc_info = make_exc_info(depth=100)
+
+    text = TracebackBudget(head_frames=2, tail_frames=3).format_exception(exc_info)
+
+    assert count_frames(text) == 5
+    assert '  [... 97 frames omitted ...]' in text
+    assert text.endswith('ValueError: error')
+
+@pytest.mark.unit()
+def test_chained_exceptions_are_limited() -> None:
+    try:
+        try:
+            recurse(50)
+        except ValueError as error:
+            raise KeyError('key') from error
+    except KeyError:
+        exc_info = sys.exc_info()
+
+    text = TracebackBudget(head_frames=1, tail_frames=2).format_exception(exc_info)
+
+    assert 'The above exception was the direct cause' in text
+    assert count_frames(text) == 4
+    assert text.endswith("KeyError: 'key'")
+
+@pytest.mark.unit()
+def test_long_lines_are_cut() -> None:
+    exc_info = make_exc_info(depth=1, message='a' * 1000)
+
+    text = TracebackBudget(max_line_length=50).format_exception(exc_info)
+
+    assert all(len(line) <= 50 for line in text.split('\n'))
+    assert text.endswith('a...')
+
+@pytest.mark.unit()
+def test_total_length_is_limited() -> None:
+    exc_info = make_exc_info(depth=100)
+
+    text = TracebackBudget(head_frames=50, tail_frames=50, max_length=1000).format_exception(exc_info)
+
+    head, omitted, tail = text.partition(' characters omitted ...]\n')
+    assert omitted
+    assert len(head) + len(tail) <= 1000 + len('\n[... 10000')
+    assert text.startswith('Traceback (most recent call last):')
+    assert text.endswith('ValueError: error')
+
+@pytest.mark.unit()
+def test_captured_locals_are_limited() -> None:
+    def fail(value: str) -> None:
+        raise ValueError('error')
+
+    try:
+        fail('v' * 1000)
+    except ValueError:
+        exc_info = sys.exc_info()
+
+    text = TracebackBudget(capture_locals=True, max_local_length=20).format_exception(exc_info)
+
+    assert "    value = 'vvvvvvv...vvvvvvvv'" in text
+
+@pytest.mark.unit()
+def test_invalid_parameters() -> None:
+    with pytest.raises(ValueError):
+        TracebackBudget(tail_frames=0)
+
+    with pytest.raises(ValueError):
+        TracebackBudget(max_line_length=3)
+
+@pytest.mark.unit()
+def test_budget_is_applied_before_escaping() -> None:
+    formatter = HtmlFormatter(
+        fmt = '{message}',
+        style = '{',
+        traceback_budget = {
+            '()': 'markup_tg_logger.TracebackBudget',
+            'max_line_length': 40,
+        },
+    )
+    exc_info = make_exc_info(depth=1, message='<' * 100)
+
+    text = formatter.format(logging.makeLogRecord({'msg': 'text', 'exc_info': exc_info}))
+
+    assert text.endswith('ValueError: ' + '&lt;' * 25 + '...')
@@ -0,0 +1,130 @@
+"""Test the `TracebackCache`."""
+
+import gc
+import html
+import logging
+import sys
+from typing import override
+
+import pytest
+
+from markup_tg_logger.formatters.escape import EscapeMarkupFormatter
+from markup_tg_logger.formatters.traceback_cache import TracebackCache
+from markup_tg_logger.types import SysExcInfoType
+
+
+KEY = 'key'
+
+
+class CustomError(Exception):
+    pass
+
+
+def raise_error(error: BaseException) -> SysExcInfoType:
+    try:
+        raise error
+    except BaseException:
+        return sys.exc_info()
+
+def reraise(exc_info: SysExcInfoType) -> SysExcInfoType:
+    try:
+        assert exc_info[1] is not None
+        raise exc_info[1]
+    except BaseException:
+        return sys.exc_info()
+
+@pytest.mark.unit()
+def test_get_and_put() -> None:
+    cache = TracebackCache()
+    exc_info = raise_error(ValueError('text'))
+
+    assert cache.get(exc_info, KEY) is None
+
+    cache.put(exc_info, KEY, 'traceback')
+
+    assert cache.get(exc_info, KEY) == 'traceback'
+    assert cache.get(exc_info, 'other key') is None
+    assert cache.get(raise_error(ValueError('text')), KEY) is None
+
+@pytest.mark.unit()
+def test_reraised_exception_is_not_hit() -> None:
+    cache = TracebackCache()
+    exc_info = raise_error(ValueError('text'))
+    cache.put(exc_info, KEY, 'traceback')
+
+    reraised_exc_info = reraise(exc_info)
+
+    assert cache.get(reraised_exc_info, KEY) is None
+    # The old traceback is no longer the traceback of the exception.
+    assert cache.get(exc_info, KEY) is None
+
+@pytest.mark.unit()
+def test_eviction() -> None:
+    cache = TracebackCache(max_size=2)
+    exc_infos = [raise_error(ValueError(index)) for index in range(3)]
+
+    for exc_info in exc_infos:
+        cache.put(exc_info, KEY, 'traceback')
+
+    assert len(cache) == 2
+    assert cache.get(exc_infos[0], KEY) is None
+    assert cache.get(exc_infos[2], KEY) == 'traceback'
+
+@pytest.mark.unit()
+def test_exception_is_not_kept_alive() -> None:
+    cache = TracebackCache()
+    exc_info = raise_error(CustomError('text'))
+    cache.put(exc_info, KEY, 'traceback')
+
+    entry = next(iter(cache._entries.values()))
+    del exc_info
+    gc.collect()
+
+    assert entry.get_exception() is None
+
+
+class CountingFormatter(EscapeMarkupFormatter):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(fmt='{message}', style='{', **kwargs)
+        self._traceback_cache = TracebackCache()
+        self.calls = 0
+
+    @override
+    def formatException(self, ei: SysExcInfoType) -> str:
+        self.calls += 1
+        return super().formatException(ei)
+
+
+@pytest.mark.unit()
+def test_formatter_renders_traceback_once() -> None:
+    formatter = CountingFormatter(escape_func=lambda text: html.escape(text, quote=False))
+    exc_info = raise_error(ValueError('<value>'))
+
+    texts = [
+        formatter.format(logging.makeLogRecord({'msg': 'text', 'exc_info': exc_info}))
+        for _ in range(3)
+    ]
+
+    assert formatter.calls == 1
+    assert texts[0] == texts[1] == texts[2]
+    assert texts[0].endswith('ValueError: &lt;value&gt;')
+
+    formatter.format(logging.makeLogRecord({'msg': 'text', 'exc_info': reraise(exc_info)}))
+
+    assert formatter.calls == 2
+
+@pytest.mark.unit()
+def test_formatter_configuration_is_part_of_key() -> None:
+    cache = TracebackCache()
+    escaping_formatter = EscapeMarkupFormatter(
+        escape_func = lambda text: html.escape(text, quote=False),
+    )
+    plain_formatter = EscapeMarkupFormatter(escape_exception=False)
+    escaping_formatter._traceback_cache = plain_formatter._traceback_cache = cache
+
+    exc_info = raise_error(ValueError('<value>'))
+    record = logging.makeLogRecord({'msg': 'text', 'exc_info': exc_info})
+
+    assert escaping_formatter.format(record).endswith('ValueError: &lt;value&gt;')
+    assert plain_formatter.format(record).endswith('ValueError: <value>')
+    assert escaping_formatter.format(record).endswith('ValueError: &lt;value&gt;')
@@ -2,6 +2,7 @@
 
 import pytest
 
+from markup_tg_logger.exceptions import SplitterException
 from markup_tg_logger.message_splitters.base import BaseMessageSplitter
 
 
@@ -27,3 +28,80 @@ def test_split_less_then_limit() -> None:
     messages = splitter.split(text)
 
     assert messages[0] == text
+
+@pytest.mark.unit()
+def test_split_utf16() -> None:
+    limit = 5
+    text = '🟥🟥🟥a🟥🟥'
+
+    splitter = BaseMessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['🟥🟥', '🟥a🟥', '🟥']
+
+@pytest.mark.unit()
+def test_split_code_points() -> None:
+    limit = 2
+    text = '🟥🟥🟥'
+
+    splitter = BaseMessageSplitter(
+        max_message_length = limit,
+        length_model = {
+            '()': 'markup_tg_logger.message_splitters.length_models.CodePointLengthModel',
+        },
+    )
+    messages = splitter.split(text)
+
+    assert messages == ['🟥🟥', '🟥']
+
+@pytest.mark.unit()
+def test_character_does_not_fit() -> None:
+    splitter = BaseMessageSplitter(max_message_length=1)
+
+    with pytest.raises(SplitterException):
+        splitter.split('a🟥')
+
+@pytest.mark.unit()
+def test_boundary_prefers_new_line() -> None:
+    text = 'aa bb\ncc dd ee'
+
+    splitter = BaseMessageSplitter(max_message_length=10, boundary_lookback=10)
+    messages = splitter.split(text)
+
+    assert messages == ['aa bb\n', 'cc dd ee']
+
+@pytest.mark.unit()
+def test_boundary_whitespace() -> None:
+    text = 'aaa bbb ccc'
+
+    splitter = BaseMessageSplitter(max_message_length=6, boundary_lookback=3)
+    messages = splitter.split(text)
+
+    assert messages == ['aaa ', 'bbb ', 'ccc']
+
+@pytest.mark.unit()
+def test_boundary_outside_lookback() -> None:
+    text = 'a bbbbbbbbb'
+
+    splitter = BaseMessageSplitter(max_message_length=6, boundary_lookback=3)
+    messages = splitter.split(text)
+
+    assert messages == ['a bbbb', 'bbbbb']
+
+@pytest.mark.unit()
+@pytest.mark.parametrize('text', ['a' * 25, '🟥🟥🟥a🟥🟥' * 3, 'aa bb\ncc dd ee ff'])
+@pytest.mark.parametrize('boundary_lookback', [0, 5])
+def test_iter_split(text: str, boundary_lookback: int) -> None:
+    splitter = BaseMessageSplitter(max_message_length=10, boundary_lookback=boundary_lookback)
+
+    assert list(splitter.iter_split(text)) == splitter.split(text)
+
+@pytest.mark.unit()
+def test_iter_split_is_lazy() -> None:
+    splitter = BaseMessageSplitter(max_message_length=1)
+    messages = splitter.iter_split('aa🟥')
+
+    assert next(messages) == 'a'
+    assert next(messages) == 'a'
+    with pytest.raises(SplitterException):
+        next(messages)
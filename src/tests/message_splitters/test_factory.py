@@ -6,6 +6,10 @@ from typing import override
 from markup_tg_logger.exceptions import NotMappedSplitterError
 from markup_tg_logger.interfaces import IMessageSplitter
 from markup_tg_logger.message_splitters.factory import MessageSplitterFactory
+from markup_tg_logger.message_splitters.markdown import (
+    MarkdownMessageSplitter,
+    MarkdownV2MessageSplitter,
+)
 from markup_tg_logger.types import ParseMode
 
 
@@ -40,3 +44,10 @@ def test_factory_get() -> None:
 
     with pytest.raises(NotMappedSplitterError):
         factory.get(parse_mode='Markdown')
+
+@pytest.mark.unit()
+def test_default_factory() -> None:
+    factory = MessageSplitterFactory()
+
+    assert isinstance(factory.get(parse_mode='Markdown'), MarkdownMessageSplitter)
+    assert isinstance(factory.get(parse_mode='MarkdownV2'), MarkdownV2MessageSplitter)
@@ -115,3 +115,181 @@ def test_invalid_markup() -> None:
 
     with pytest.raises(SplitterException):
         splitter.split('sample text tag> sample text')
+
+@pytest.mark.unit()
+def test_long_text_node() -> None:
+    limit = 100
+    text = '<b>' + 'a' * 1000 + '</b>' + 'b' * 1000
+
+    splitter = HtmlMessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert all(len(message) <= limit for message in messages)
+    assert ''.join(messages).replace('<b>', '').replace('</b>', '') == 'a' * 1000 + 'b' * 1000
+
+@pytest.mark.unit()
+def test_utf16() -> None:
+    limit = 11
+    text = '<b>🟥🟥🟥</b>🟥'
+
+    splitter = HtmlMessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['<b>🟥🟥</b>', '<b>🟥</b>🟥']
+
+@pytest.mark.unit()
+def test_utf16_long_text_node() -> None:
+    limit = 100
+    text = '<b>' + '🟥a' * 1000 + '</b>'
+
+    splitter = HtmlMessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert all(len(message.encode('utf-16-le')) // 2 <= limit for message in messages)
+    assert ''.join(messages).replace('<b>', '').replace('</b>', '') == '🟥a' * 1000
+
+@pytest.mark.unit()
+def test_visible_length_excludes_tags() -> None:
+    limit = 10
+    text = '<b>12345</b><i>12345</i>'
+
+    splitter = HtmlMessageSplitter(max_message_length=limit, count_visible_length=True)
+    messages = splitter.split(text)
+
+    assert messages == [text]
+
+@pytest.mark.unit()
+def test_visible_length_entities() -> None:
+    limit = 5
+    text = '&lt;' * 6
+
+    splitter = HtmlMessageSplitter(max_message_length=limit, count_visible_length=True)
+    messages = splitter.split(text)
+
+    assert messages == ['&lt;' * 5, '&lt;']
+
+@pytest.mark.unit()
+def test_visible_length_entity_is_not_split() -> None:
+    limit = 3
+    text = '<b>ab&amp;cd</b>'
+
+    splitter = HtmlMessageSplitter(max_message_length=limit, count_visible_length=True)
+    messages = splitter.split(text)
+
+    assert messages == ['<b>ab&amp;</b>', '<b>cd</b>']
+
+@pytest.mark.unit()
+def test_visible_length_utf16_entity() -> None:
+    limit = 4
+    text = '&#128997;' * 3
+
+    splitter = HtmlMessageSplitter(max_message_length=limit, count_visible_length=True)
+    messages = splitter.split(text)
+
+    assert messages == ['&#128997;' * 2, '&#128997;']
+
+@pytest.mark.unit()
+def test_visible_length_payload_limit() -> None:
+    limit = 100
+    payload_limit = 10
+    text = '<b>' + 'a' * 10 + '</b>'
+
+    splitter = HtmlMessageSplitter(
+        max_message_length = limit,
+        count_visible_length = True,
+        max_payload_length = payload_limit,
+    )
+    messages = splitter.split(text)
+
+    assert messages == ['<b>aaa</b>', '<b>aaa</b>', '<b>aaa</b>', '<b>a</b>']
+
+@pytest.mark.unit()
+def test_visible_length_payload_is_not_limited_by_default() -> None:
+    text = '<b>a</b>' * 3
+
+    splitter = HtmlMessageSplitter(max_message_length=3, count_visible_length=True)
+    messages = splitter.split(text)
+
+    assert messages == [text]
+
+@pytest.mark.unit()
+def test_payload_limit_in_default_mode() -> None:
+    text = 'a' * 10
+
+    splitter = HtmlMessageSplitter(max_message_length=100, max_payload_length=5)
+    messages = splitter.split(text)
+
+    assert messages == ['a' * 5, 'a' * 5]
+
+@pytest.mark.unit()
+def test_boundary_in_text_node() -> None:
+    text = '<b>aaa\nbbb ccc</b>'
+
+    splitter = HtmlMessageSplitter(max_message_length=16, boundary_lookback=10)
+    messages = splitter.split(text)
+
+    assert messages == ['<b>aaa\n</b>', '<b>bbb ccc</b>']
+
+@pytest.mark.unit()
+def test_boundary_visible_length() -> None:
+    text = 'a&lt;b c&amp;d&gt;e'
+
+    splitter = HtmlMessageSplitter(
+        max_message_length = 6,
+        count_visible_length = True,
+        boundary_lookback = 10,
+    )
+    messages = splitter.split(text)
+
+    assert messages == ['a&lt;b ', 'c&amp;d&gt;e']
+
+@pytest.mark.unit()
+@pytest.mark.parametrize('boundary_lookback', [0, 5])
+def test_entity_before_limit_is_not_split(boundary_lookback: int) -> None:
+    text = '<u>abc&amp;def</u>'
+
+    splitter = HtmlMessageSplitter(max_message_length=12, boundary_lookback=boundary_lookback)
+    messages = splitter.split(text)
+
+    assert messages == ['<u>abc</u>', '<u>&amp;</u>', '<u>def</u>']
+
+@pytest.mark.unit()
+def test_entity_longer_than_limit_is_cut() -> None:
+    splitter = HtmlMessageSplitter(max_message_length=3)
+
+    assert splitter.split('&amp;') == ['&am', 'p;']
+
+@pytest.mark.unit()
+def test_iter_split() -> None:
+    text = 'sample text <b>bold <i>italic</i></b> <a href="url">link</a> sample text'
+
+    splitter = HtmlMessageSplitter(max_message_length=20)
+
+    assert list(splitter.iter_split(text)) == splitter.split(text)
+
+@pytest.mark.unit()
+def test_iter_split_is_lazy() -> None:
+    text = '<b>' + 'a' * 20 + '</b> sample text tag> sample text'
+
+    splitter = HtmlMessageSplitter(max_message_length=10)
+    messages = splitter.iter_split(text)
+
+    assert next(messages) == '<b>aaa</b>'
+    with pytest.raises(SplitterException):
+        list(messages)
+
+@pytest.mark.unit()
+def test_quoted_attributes() -> None:
+    text = '<a href="https://x/?a=b&amp;c=d" title=\'two words\'>link</a> text'
+
+    splitter = HtmlMessageSplitter(max_message_length=100)
+    messages = splitter.split(text)
+
+    assert messages == ['<a href="https://x/?a=b&amp;c=d" title="two words">link</a> text']
+
+@pytest.mark.unit()
+def test_unescaped_less_than() -> None:
+    splitter = HtmlMessageSplitter(max_message_length=100)
+
+    with pytest.raises(SplitterException):
+        splitter.split('a < b <i>c</i>')
@@ -0,0 +1,84 @@
+"""Test the `ILengthModel` implementations."""
+
+import pytest
+
+from markup_tg_logger.message_splitters.length_models import (
+    CodePointLengthModel,
+    Utf16LengthModel,
+)
+
+
+EMOJI = '🟥'
+# The emoji as two separate code points.
+SURROGATE_PAIR = '\ud83d\udfe5'
+SURROGATE_PAIR_TEXT = 'a' + SURROGATE_PAIR + 'b'
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(('text', 'length'), [
+    ('', 0),
+    ('abc', 3),
+    ('абв', 3),
+    (EMOJI, 2),
+    (f'a{EMOJI}b{EMOJI}', 6),
+    (SURROGATE_PAIR_TEXT, 4),
+])
+def test_utf16_length(text: str, length: int) -> None:
+    assert Utf16LengthModel().length(text) == length
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(('text', 'result'), [
+    ('abc', True),
+    ('абв', True),
+    (f'a{EMOJI}', False),
+    (SURROGATE_PAIR_TEXT, False),
+])
+def test_utf16_counts_code_points(text: str, result: bool) -> None:
+    assert Utf16LengthModel().counts_code_points(text) is result
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(('limit', 'result'), [
+    (0, (0, 0)),
+    (1, (1, 1)),
+    (2, (1, 1)),
+    (3, (2, 3)),
+    (4, (3, 4)),
+    (6, (4, 6)),
+    (100, (4, 6)),
+])
+def test_utf16_fit(limit: int, result: tuple[int, int]) -> None:
+    text = f'a{EMOJI}b{EMOJI}'
+
+    assert Utf16LengthModel().fit(text, 0, len(text), limit) == result
+
+@pytest.mark.unit()
+def test_utf16_fit_fragment() -> None:
+    text = EMOJI * 10
+
+    assert Utf16LengthModel().fit(text, 3, 8, 7) == (6, 6)
+
+@pytest.mark.unit()
+def test_utf16_fit_long_text() -> None:
+    text = (EMOJI + 'a') * 1000
+    model = Utf16LengthModel()
+
+    stop, length = model.fit(text, 0, len(text), 1001)
+
+    assert length == model.length(text[:stop]) == 1001
+    assert model.length(text[:stop + 1]) > 1001
+
+@pytest.mark.unit()
+def test_utf16_fit_surrogate_pair() -> None:
+    assert Utf16LengthModel().fit(SURROGATE_PAIR_TEXT, 0, 4, 2) == (1, 1)
+
+@pytest.mark.unit()
+def test_code_point_length() -> None:
+    assert CodePointLengthModel().length(f'a{EMOJI}') == 2
+
+@pytest.mark.unit()
+def test_code_point_fit() -> None:
+    model = CodePointLengthModel()
+
+    assert model.fit('abcdef', 1, 6, 3) == (4, 3)
+    assert model.fit('abcdef', 1, 6, 0) == (1, 0)
+    assert model.fit(SURROGATE_PAIR_TEXT, 0, 4, 2) == (1, 1)
@@ -0,0 +1,262 @@
+"""Test the `MarkdownV2MessageSplitter` and `MarkdownMessageSplitter`."""
+
+import pytest
+
+from markup_tg_logger.exceptions import ImpossibleToSplitError, InvalidMarkupError
+from markup_tg_logger.message_splitters.markdown import (
+    MarkdownMessageSplitter,
+    MarkdownV2MessageSplitter,
+)
+
+
+@pytest.mark.unit()
+def test_no_markup() -> None:
+    limit = 10
+
+    text_1 = 'a' * limit
+    text_2 = 'b' * limit
+    text_3 = 'c' * (limit // 2)
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text_1 + text_2 + text_3)
+
+    assert messages == [text_1, text_2, text_3]
+
+@pytest.mark.unit()
+def test_bold() -> None:
+    limit = 10
+    text = '12345*12345*12345'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['12345*123*', '*45*12345']
+
+@pytest.mark.unit()
+def test_nested_entities() -> None:
+    limit = 12
+    text = '*bold _italic ~strike~_*'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['*bold _ita_*', '*_lic ~st~_*', '*_~rike~_*']
+
+@pytest.mark.unit()
+def test_underline_and_spoiler() -> None:
+    limit = 9
+    text = '__under__||spoiler||'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['__under__', '||spoil||', '||er||']
+
+@pytest.mark.unit()
+def test_escape_is_not_split() -> None:
+    limit = 3
+    text = 'ab\\*cd\\*ef'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['ab', '\\*c', 'd\\*', 'ef']
+
+@pytest.mark.unit()
+def test_escaped_markers_are_text() -> None:
+    text = '\\*not bold\\* \\_not italic\\_ \\[not link\\]'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=len(text))
+    messages = splitter.split(text)
+
+    assert messages == [text]
+
+@pytest.mark.unit()
+def test_inline_code() -> None:
+    limit = 8
+    text = '`a*b_c\\`d`'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['`a*b_c`', '`\\`d`']
+
+@pytest.mark.unit()
+def test_code_block_with_language() -> None:
+    limit = 22
+    text = '```python\nprint(1)\nprint(2)\n```'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['```python\nprint(1)\n```', '```python\nprint(2)\n```']
+
+@pytest.mark.unit()
+def test_code_block_cut_at_line_break_adds_no_empty_line() -> None:
+    limit = 21
+    text = '```python\nprint(1)\nprint(2)\nprint(3)```'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == [
+        '```python\nprint(1)```',
+        '```python\nprint(2)```',
+        '```python\nprint(3)```',
+    ]
+
+@pytest.mark.unit()
+def test_code_block_boundary_lookback() -> None:
+    limit = 36
+    text = '```python\n' + ''.join(f'print({index})\n' for index in range(4)) + '```'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit, boundary_lookback=20)
+    messages = splitter.split(text)
+
+    assert messages == [
+        '```python\nprint(0)\nprint(1)\n```',
+        '```python\nprint(2)\nprint(3)\n```',
+    ]
+
+@pytest.mark.unit()
+def test_text_boundary_lookback() -> None:
+    text = '*bold words here*'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=14, boundary_lookback=6)
+    messages = splitter.split(text)
+
+    assert messages == ['*bold words *', '*here*']
+
+@pytest.mark.unit()
+def test_link() -> None:
+    limit = 32
+    text = 'see [link text](https://a.io/\\)) now'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['see [link text](https://a.io/\\))', ' now']
+
+@pytest.mark.unit()
+def test_link_split() -> None:
+    limit = 20
+    text = '[link text](https://a.io)'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['[link](https://a.io)', '[ tex](https://a.io)', '[t](https://a.io)']
+
+@pytest.mark.unit()
+def test_custom_emoji() -> None:
+    limit = 40
+    text = 'hi ![👍](tg://emoji?id=5368324170671202286)'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['hi ', '![👍](tg://emoji?id=5368324170671202286)']
+
+@pytest.mark.unit()
+def test_blockquote() -> None:
+    limit = 12
+    text = '>line one\n>line two\nafter'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['>line one\n>l', '>ine two\naft', 'er']
+
+@pytest.mark.unit()
+def test_blockquote_cut_at_line_break() -> None:
+    limit = 9
+    text = '>line one\n>line two'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['>line one', '>line two']
+
+@pytest.mark.unit()
+def test_expandable_blockquote() -> None:
+    limit = 16
+    text = '**>line one\n>line two||\nafter'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['**>line one\n>l||', '**>ine two||\naft', 'er']
+
+@pytest.mark.unit()
+def test_unclosed_link() -> None:
+    splitter = MarkdownV2MessageSplitter(max_message_length=100)
+
+    with pytest.raises(InvalidMarkupError):
+        splitter.split('[link text(https://a.io)')
+
+@pytest.mark.unit()
+def test_limit_too_small() -> None:
+    text = '*_~a~_*'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=6)
+
+    with pytest.raises(ImpossibleToSplitError):
+        splitter.split(text)
+
+@pytest.mark.unit()
+def test_utf16() -> None:
+    limit = 6
+    text = '*🟥🟥🟥*'
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['*🟥🟥*', '*🟥*']
+
+@pytest.mark.unit()
+def test_long_text() -> None:
+    limit = 100
+    text = '*bold _italic_ \\*escaped\\* `code`* [link](https://a.io)\n' * 100
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert all(len(message) <= limit for message in messages)
+    assert len(messages) > 1
+
+@pytest.mark.unit()
+def test_legacy_markdown() -> None:
+    limit = 8
+    text = '*bold text* _it_ `code x` \\_x'
+
+    splitter = MarkdownMessageSplitter(max_message_length=limit)
+    messages = splitter.split(text)
+
+    assert messages == ['*bold t*', '*ext* ', '_it_ `c`', '`ode x` ', '\\_x']
+
+@pytest.mark.unit()
+def test_legacy_markdown_ignores_markdown_v2() -> None:
+    text = '~a~ ||b|| __c__ \\~'
+
+    splitter = MarkdownMessageSplitter(max_message_length=len(text))
+    messages = splitter.split(text)
+
+    assert messages == [text]
+    assert splitter.parse_mode == 'Markdown'
+
+@pytest.mark.unit()
+def test_iter_split() -> None:
+    text = '*bold _italic_* `code` [link](http://url) ' * 3
+
+    splitter = MarkdownV2MessageSplitter(max_message_length=20)
+
+    assert list(splitter.iter_split(text)) == splitter.split(text)
+
+@pytest.mark.unit()
+def test_iter_split_is_lazy() -> None:
+    splitter = MarkdownV2MessageSplitter(max_message_length=10)
+    messages = splitter.iter_split('a' * 20 + ' [link text(https://a.io)')
+
+    assert next(messages) == 'a' * 10
+    with pytest.raises(InvalidMarkupError):
+        list(messages)
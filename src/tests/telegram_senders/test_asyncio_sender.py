@@ -0,0 +1,138 @@
+"""Test the `AsyncioTelegramSender`."""
+
+import asyncio
+import pytest
+
+from ..test_utils.telegram_server import (
+    JsonHub, HOST, PORT, SAVE_JSON_ENDPOINT, BAD_REQUEST_ENDPOINT, CLOSE_CONNECTION_ENDPOINT,
+    DROP_REQUEST_ENDPOINT, TOO_MANY_REQUESTS_ENDPOINT, RETRY_AFTER,
+)
+
+from markup_tg_logger.exceptions import SenderError, TelegramApiError
+from markup_tg_logger.telegram_senders.asyncio import AsyncioTelegramSender
+
+
+CHAT_ID = 123
+TEXT = 'test message'
+PARSE_MODE = 'HTML'
+URL = f'http://{HOST}:{PORT}' + '{bot_token}'
+
+
+async def wait_idle_connections_dropped(sender: AsyncioTelegramSender) -> None:
+    """Wait until the client notices that the server has closed the pooled connections."""
+
+    connections = [
+        connection
+        for connections in sender._idle_connections.values()
+        for connection in connections
+    ]
+
+    async with asyncio.timeout(5):
+        while not all(sender._is_dropped(connection) for connection in connections):
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.unit()
+def test_json(telegram_server_json_hub: JsonHub) -> None:
+    telegram_server_json_hub.reset_saved_json()
+    sender = AsyncioTelegramSender(url=URL)
+
+    async def main() -> None:
+        await sender.send(
+            bot_token = SAVE_JSON_ENDPOINT,
+            chat_id = CHAT_ID,
+            text = TEXT,
+            parse_mode = PARSE_MODE,
+        )
+        await sender.close()
+
+    asyncio.run(main())
+
+    data = telegram_server_json_hub.get_last_received_json()
+
+    assert data is not None
+    assert data['chat_id'] == CHAT_ID
+    assert data['text'] == TEXT
+    assert data['parse_mode'] == PARSE_MODE
+
+@pytest.mark.unit()
+def test_bad_request(telegram_server_json_hub: JsonHub) -> None:
+    sender = AsyncioTelegramSender(url=URL)
+
+    with pytest.raises(SenderError):
+        asyncio.run(sender.send(bot_token=BAD_REQUEST_ENDPOINT, chat_id=CHAT_ID, text=TEXT))
+
+@pytest.mark.unit()
+def test_retry_after(telegram_server_json_hub: JsonHub) -> None:
+    sender = AsyncioTelegramSender(url=URL)
+
+    with pytest.raises(TelegramApiError) as exc_info:
+        asyncio.run(
+            sender.send(bot_token=TOO_MANY_REQUESTS_ENDPOINT, chat_id=CHAT_ID, text=TEXT)
+        )
+
+    assert exc_info.value.error_code == 429
+    assert exc_info.value.retry_after == RETRY_AFTER
+
+@pytest.mark.unit()
+def test_http_error(telegram_server_json_hub: JsonHub) -> None:
+    sender = AsyncioTelegramSender(url=URL)
+
+    with pytest.raises(SenderError):
+        asyncio.run(
+            sender.send(bot_token='/wrong-endpoint-for-http-error', chat_id=CHAT_ID, text=TEXT)
+        )
+
+@pytest.mark.unit()
+def test_keep_alive_and_reconnect(telegram_server_json_hub: JsonHub) -> None:
+    sender = AsyncioTelegramSender(url=URL)
+    addresses = []
+
+    async def main() -> None:
+        for endpoint in (SAVE_JSON_ENDPOINT, CLOSE_CONNECTION_ENDPOINT, SAVE_JSON_ENDPOINT):
+            await sender.send(bot_token=endpoint, chat_id=CHAT_ID, text=TEXT)
+            addresses.append(telegram_server_json_hub.get_last_client_address())
+            if endpoint == CLOSE_CONNECTION_ENDPOINT:
+                await wait_idle_connections_dropped(sender)
+        await sender.close()
+
+    asyncio.run(main())
+
+    assert addresses[0] == addresses[1]
+    assert addresses[1] != addresses[2]
+
+@pytest.mark.unit()
+def test_request_is_not_repeated_after_it_was_written(telegram_server_json_hub: JsonHub) -> None:
+    sender = AsyncioTelegramSender(url=URL)
+
+    async def main() -> int:
+        # The connection of the first request is reused for the second one.
+        await sender.send(bot_token=SAVE_JSON_ENDPOINT, chat_id=CHAT_ID, text=TEXT)
+        request_count = telegram_server_json_hub.get_request_count()
+
+        with pytest.raises(SenderError):
+            await sender.send(bot_token=DROP_REQUEST_ENDPOINT, chat_id=CHAT_ID, text=TEXT)
+
+        await sender.close()
+
+        return telegram_server_json_hub.get_request_count() - request_count
+
+    assert asyncio.run(main()) == 1
+
+@pytest.mark.unit()
+@pytest.mark.parametrize('status_line', [b'HTTP/1.1 200 OK\r\n', b'HTTP/1.1 200\r\n'])
+def test_status_line_reason_is_optional(status_line: bytes) -> None:
+    sender = AsyncioTelegramSender(url=URL)
+
+    async def main() -> tuple[int, dict[str, str], bytes, bool]:
+        reader = asyncio.StreamReader()
+        reader.feed_data(status_line + b'Content-Length: 2\r\n\r\n{}')
+        reader.feed_eof()
+
+        return await sender._read_response(reader)
+
+    status, _, body, keep_alive = asyncio.run(main())
+
+    assert status == 200
+    assert body == b'{}'
+    assert keep_alive
@@ -1,14 +1,19 @@
 """Test the `HttpClientTelegramSender`."""
 
 from collections.abc import Generator
+import time
+from typing import Any
+
 import pytest
 
 from ..test_utils.telegram_server import (
-    JsonHub, HOST, PORT, SAVE_JSON_ENDPOINT, BAD_REQUEST_ENDPOINT,
+    JsonHub, HOST, PORT, SAVE_JSON_ENDPOINT, SAVE_DOCUMENT_ENDPOINT, BAD_REQUEST_ENDPOINT,
+    CLOSE_CONNECTION_ENDPOINT, TOO_MANY_REQUESTS_ENDPOINT, RETRY_AFTER,
 )
 
-from markup_tg_logger.exceptions import SenderError
+from markup_tg_logger.exceptions import SenderError, TelegramApiError
 from markup_tg_logger.interfaces import ITelegramSender
+from markup_tg_logger.telegram_senders.connection_pool import HttpConnectionPool
 from markup_tg_logger.telegram_senders.http_client import HttpClientTelegramSender
 
 
@@ -17,13 +22,30 @@ TEXT = 'test message'
 PARSE_MODE = 'HTML'
 
 @pytest.fixture()
-def sender() -> Generator[ITelegramSender, None, None]:
+def sender() -> Generator[HttpClientTelegramSender, None, None]:
     sender = HttpClientTelegramSender(
         url = f'http://{HOST}:{PORT}' + '{bot_token}',
+        document_url = f'http://{HOST}:{PORT}' + '{bot_token}',
     )
 
     yield sender
 
+    sender.close()
+
+def wait_idle_connections_dropped(sender: HttpClientTelegramSender) -> None:
+    """Wait until the client can see that the server has closed the pooled connections."""
+
+    connections = [
+        connection
+        for connections in sender._pool._idle_connections.values()
+        for connection in connections
+    ]
+
+    deadline = time.monotonic() + 5
+    while not all(HttpConnectionPool._is_dropped(connection) for connection in connections):
+        assert time.monotonic() < deadline, 'The server has not closed the connection'
+        time.sleep(0.01)
+
 @pytest.mark.unit()
 def test_json(telegram_server_json_hub: JsonHub, sender: ITelegramSender) -> None:
     telegram_server_json_hub.reset_saved_json()
@@ -42,6 +64,28 @@ def test_json(telegram_server_json_hub: JsonHub, sender: ITelegramSender) -> Non
     assert data['text'] == TEXT
     assert data['parse_mode'] == PARSE_MODE
 
+@pytest.mark.unit()
+def test_document(telegram_server_json_hub: JsonHub, sender: ITelegramSender) -> None:
+    telegram_server_json_hub.reset_saved_json()
+
+    sender.send_document(
+        bot_token = SAVE_DOCUMENT_ENDPOINT,
+        chat_id = CHAT_ID,
+        document = 'document text 🟥'.encode(),
+        filename = 'log.html',
+        caption = TEXT,
+        disable_notification = True,
+    )
+
+    data = telegram_server_json_hub.get_last_received_json()
+
+    assert data is not None
+    assert data['chat_id'] == str(CHAT_ID)
+    assert data['document'] == 'document text 🟥'
+    assert data['filename'] == 'log.html'
+    assert data['caption'] == TEXT
+    assert data['disable_notification'] == 'true'
+
 @pytest.mark.unit()
 def test_bad_request(sender: ITelegramSender) -> None:
     with pytest.raises(SenderError):
@@ -51,6 +95,18 @@ def test_bad_request(sender: ITelegramSender) -> None:
             text = TEXT,
         )
 
+@pytest.mark.unit()
+def test_retry_after(sender: ITelegramSender) -> None:
+    with pytest.raises(TelegramApiError) as exc_info:
+        sender.send(
+            bot_token = TOO_MANY_REQUESTS_ENDPOINT,
+            chat_id = CHAT_ID,
+            text = TEXT,
+        )
+
+    assert exc_info.value.error_code == 429
+    assert exc_info.value.retry_after == RETRY_AFTER
+
 @pytest.mark.unit()
 def test_http_error(sender: ITelegramSender) -> None:
     with pytest.raises(SenderError):
@@ -59,3 +115,88 @@ def test_http_error(sender: ITelegramSender) -> None:
             chat_id = CHAT_ID,
             text = TEXT,
         )
+
+@pytest.mark.unit()
+def test_keep_alive(telegram_server_json_hub: JsonHub, sender: ITelegramSender) -> None:
+    sender.send(bot_token=SAVE_JSON_ENDPOINT, chat_id=CHAT_ID, text=TEXT)
+    first_address = telegram_server_json_hub.get_last_client_address()
+
+    sender.send(bot_token=SAVE_JSON_ENDPOINT, chat_id=CHAT_ID, text=TEXT)
+    second_address = telegram_server_json_hub.get_last_client_address()
+
+    assert first_address == second_address
+
+@pytest.mark.unit()
+def test_reconnect_after_server_close(
+    telegram_server_json_hub: JsonHub,
+    sender: HttpClientTelegramSender,
+) -> None:
+    sender.send(bot_token=CLOSE_CONNECTION_ENDPOINT, chat_id=CHAT_ID, text=TEXT)
+    first_address = telegram_server_json_hub.get_last_client_address()
+
+    # The server closes the connection right after the response. An idle connection times out
+    # long before it is reused, so wait for the close to reach the client.
+    wait_idle_connections_dropped(sender)
+
+    telegram_server_json_hub.reset_saved_json()
+    sender.send(bot_token=SAVE_JSON_ENDPOINT, chat_id=CHAT_ID, text=TEXT)
+    second_address = telegram_server_json_hub.get_last_client_address()
+
+    assert first_address != second_address
+    assert telegram_server_json_hub.get_last_received_json() is not None
+
+@pytest.mark.unit()
+def test_connection_error() -> None:
+    sender = HttpClientTelegramSender(url='http://localhost:1/{bot_token}', connect_timeout=1)
+
+    with pytest.raises(SenderError):
+        sender.send(bot_token=SAVE_JSON_ENDPOINT, chat_id=CHAT_ID, text=TEXT)
+
+class FakeConnection:
+    """Reused connection that fails at the given stage of the request."""
+
+    def __init__(self, fail_on_request: bool) -> None:
+        self.fail_on_request = fail_on_request
+        self.closed = False
+
+    def request(self, **kwargs: Any) -> None:
+        if self.fail_on_request:
+            raise ConnectionResetError('Connection reset by peer')
+
+    def getresponse(self) -> None:
+        raise ConnectionResetError('Connection reset by peer')
+
+    def close(self) -> None:
+        self.closed = True
+
+@pytest.mark.unit()
+def test_retry_when_request_is_not_written(
+    telegram_server_json_hub: JsonHub,
+    sender: HttpClientTelegramSender,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    connection = FakeConnection(fail_on_request=True)
+    monkeypatch.setattr(sender._pool, 'acquire', lambda protocol, host: (connection, True))
+
+    sender.send(bot_token=SAVE_JSON_ENDPOINT, chat_id=CHAT_ID, text=TEXT)
+
+    assert connection.closed
+    assert telegram_server_json_hub.get_last_received_json() is not None
+
+@pytest.mark.unit()
+def test_no_retry_after_request_is_written(
+    sender: HttpClientTelegramSender,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    connection = FakeConnection(fail_on_request=False)
+    monkeypatch.setattr(sender._pool, 'acquire', lambda protocol, host: (connection, True))
+    monkeypatch.setattr(
+        sender._pool,
+        'connect',
+        lambda protocol, host: pytest.fail('The request was repeated'),
+    )
+
+    with pytest.raises(SenderError):
+        sender.send(bot_token=SAVE_JSON_ENDPOINT, chat_id=CHAT_ID, text=TEXT)
+
+    assert connection.closed
@@ -0,0 +1,220 @@
+"""Test the `RateLimitedTelegramSender`."""
+
+from typing import Any, override
+
+import pytest
+
+from markup_tg_logger.exceptions import TelegramApiError
+from markup_tg_logger.interfaces import ITelegramSender
+from markup_tg_logger.telegram_senders.http_client import HttpClientTelegramSender
+from markup_tg_logger.telegram_senders.rate_limited import RateLimitedTelegramSender
+
+
+BOT_TOKEN = 'test-bot-token'
+CHAT_ID = 123
+GROUP_CHAT_ID = -100123
+TEXT = 'test message'
+RETRY_AFTER = 5
+
+
+class FakeClock:
+    """Virtual time that advances only when sleeping."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeSender(ITelegramSender):
+    def __init__(self, clock: FakeClock, errors: list[TelegramApiError] | None = None) -> None:
+        self.clock = clock
+        self.errors = errors or []
+        self.sent: list[tuple[int | str, float]] = []
+        self.closed = False
+
+    @override
+    def send(
+        self,
+        bot_token: str,
+        chat_id: int | str,
+        text: str,
+        parse_mode: str = '',
+        disable_notification: bool = False,
+        **params: Any
+    ) -> None:
+        if self.errors:
+            raise self.errors.pop(0)
+
+        self.sent.append((chat_id, self.clock.now))
+
+    @override
+    def send_document(
+        self,
+        bot_token: str,
+        chat_id: int | str,
+        document: bytes,
+        filename: str,
+        caption: str = '',
+        parse_mode: str = '',
+        disable_notification: bool = False,
+        **params: Any
+    ) -> None:
+        self.send(bot_token=bot_token, chat_id=chat_id, text=caption)
+
+    @override
+    def close(self) -> None:
+        self.closed = True
+
+
+def make_sender(
+    clock: FakeClock,
+    inner: ITelegramSender,
+    **params: Any,
+) -> RateLimitedTelegramSender:
+    sender = RateLimitedTelegramSender(inner, **params)
+    sender._clock = clock.time
+    sender._sleep = clock.sleep
+    sender._global_bucket._updated_at = clock.now
+
+    return sender
+
+def flood_error(retry_after: float = RETRY_AFTER) -> TelegramApiError:
+    return TelegramApiError('Too Many Requests', {
+        'ok': False,
+        'error_code': 429,
+        'description': f'Too Many Requests: retry after {retry_after}',
+        'parameters': {'retry_after': retry_after},
+    })
+
+@pytest.mark.unit()
+def test_chat_limit() -> None:
+    clock = FakeClock()
+    inner = FakeSender(clock)
+    sender = make_sender(clock, inner)
+
+    for _ in range(3):
+        sender.send(bot_token=BOT_TOKEN, chat_id=CHAT_ID, text=TEXT)
+
+    assert [time for _, time in inner.sent] == [0.0, 1.0, 2.0]
+    assert sender.stats.delayed_messages == 2
+    assert sender.stats.total_wait_time == 2.0
+
+@pytest.mark.unit()
+def test_chats_are_independent() -> None:
+    clock = FakeClock()
+    inner = FakeSender(clock)
+    sender = make_sender(clock, inner)
+
+    for chat_id in range(10):
+        sender.send(bot_token=BOT_TOKEN, chat_id=chat_id, text=TEXT)
+
+    assert clock.now == 0.0
+    assert sender.stats.delayed_messages == 0
+
+@pytest.mark.unit()
+def test_global_limit() -> None:
+    clock = FakeClock()
+    inner = FakeSender(clock)
+    sender = make_sender(clock, inner, messages_per_second=2)
+
+    for chat_id in range(4):
+        sender.send(bot_token=BOT_TOKEN, chat_id=chat_id, text=TEXT)
+
+    assert [time for _, time in inner.sent] == [0.0, 0.0, 0.5, 1.0]
+
+@pytest.mark.unit()
+def test_group_limit() -> None:
+    clock = FakeClock()
+    inner = FakeSender(clock)
+    sender = make_sender(clock, inner, group_messages_per_minute=2)
+
+    for _ in range(3):
+        sender.send(bot_token=BOT_TOKEN, chat_id=GROUP_CHAT_ID, text=TEXT)
+
+    assert [time for _, time in inner.sent] == pytest.approx([0.0, 1.0, 30.0])
+
+@pytest.mark.unit()
+def test_retry_after() -> None:
+    clock = FakeClock()
+    inner = FakeSender(clock, errors=[flood_error()])
+    sender = make_sender(clock, inner)
+
+    sender.send(bot_token=BOT_TOKEN, chat_id=CHAT_ID, text=TEXT)
+
+    assert inner.sent == [(CHAT_ID, RETRY_AFTER)]
+    assert sender.stats.retries == 1
+    assert sender.stats.messages == 2
+
+@pytest.mark.unit()
+def test_document_is_limited() -> None:
+    clock = FakeClock()
+    inner = FakeSender(clock)
+    sender = make_sender(clock, inner)
+
+    sender.send(bot_token=BOT_TOKEN, chat_id=CHAT_ID, text=TEXT)
+    inner.errors.append(flood_error())
+    sender.send_document(bot_token=BOT_TOKEN, chat_id=CHAT_ID, document=b'', filename='log.txt')
+
+    assert inner.sent == [(CHAT_ID, 0.0), (CHAT_ID, 1.0 + RETRY_AFTER)]
+    assert sender.stats.retries == 1
+
+@pytest.mark.unit()
+def test_max_retries() -> None:
+    clock = FakeClock()
+    inner = FakeSender(clock, errors=[flood_error(), flood_error()])
+    sender = make_sender(clock, inner, max_retries=1)
+
+    with pytest.raises(TelegramApiError):
+        sender.send(bot_token=BOT_TOKEN, chat_id=CHAT_ID, text=TEXT)
+
+    # The recipient is still paused after the error.
+    sender.send(bot_token=BOT_TOKEN, chat_id=CHAT_ID, text=TEXT)
+
+    assert inner.sent == [(CHAT_ID, 2 * RETRY_AFTER)]
+
+@pytest.mark.unit()
+def test_max_retry_after() -> None:
+    clock = FakeClock()
+    inner = FakeSender(clock, errors=[flood_error(retry_after=3600)])
+    sender = make_sender(clock, inner, max_retry_after=60)
+
+    with pytest.raises(TelegramApiError):
+        sender.send(bot_token=BOT_TOKEN, chat_id=CHAT_ID, text=TEXT)
+
+    assert clock.now == 0.0
+
+@pytest.mark.unit()
+def test_other_api_errors_are_not_retried() -> None:
+    clock = FakeClock()
+    error = TelegramApiError('Bad Request', {'ok': False, 'error_code': 400})
+    inner = FakeSender(clock, errors=[error])
+    sender = make_sender(clock, inner)
+
+    with pytest.raises(TelegramApiError):
+        sender.send(bot_token=BOT_TOKEN, chat_id=CHAT_ID, text=TEXT)
+
+    assert sender.stats.retries == 0
+
+@pytest.mark.unit()
+def test_close() -> None:
+    inner = FakeSender(FakeClock())
+    sender = RateLimitedTelegramSender(inner)
+
+    sender.close()
+
+    assert inner.closed
+
+@pytest.mark.unit()
+def test_config() -> None:
+    sender = RateLimitedTelegramSender(
+        sender = {
+            '()': 'markup_tg_logger.telegram_senders.http_client.HttpClientTelegramSender',
+        },
+    )
+
+    assert isinstance(sender._sender, HttpClientTelegramSender)
@@ -4,10 +4,11 @@ from collections.abc import Generator
 import pytest
 
 from ..test_utils.telegram_server import (
-    JsonHub, HOST, PORT, SAVE_JSON_ENDPOINT, BAD_REQUEST_ENDPOINT,
+    JsonHub, HOST, PORT, SAVE_JSON_ENDPOINT, SAVE_DOCUMENT_ENDPOINT, BAD_REQUEST_ENDPOINT, TOO_MANY_REQUESTS_ENDPOINT,
+    RETRY_AFTER,
 )
 
-from markup_tg_logger.exceptions import SenderError
+from markup_tg_logger.exceptions import SenderError, TelegramApiError
 from markup_tg_logger.interfaces import ITelegramSender
 from markup_tg_logger.telegram_senders.requests import RequestsTelegramSender
 
@@ -20,10 +21,13 @@ PARSE_MODE = 'HTML'
 def sender() -> Generator[ITelegramSender, None, None]:
     sender = RequestsTelegramSender(
         url = f'http://{HOST}:{PORT}' + '{bot_token}',
+        document_url = f'http://{HOST}:{PORT}' + '{bot_token}',
     )
 
     yield sender
 
+    sender.close()
+
 @pytest.mark.unit()
 def test_json(telegram_server_json_hub: JsonHub, sender: ITelegramSender) -> None:
     telegram_server_json_hub.reset_saved_json()
@@ -42,6 +46,28 @@ def test_json(telegram_server_json_hub: JsonHub, sender: ITelegramSender) -> Non
     assert data['text'] == TEXT
     assert data['parse_mode'] == PARSE_MODE
 
+@pytest.mark.unit()
+def test_document(telegram_server_json_hub: JsonHub, sender: ITelegramSender) -> None:
+    telegram_server_json_hub.reset_saved_json()
+
+    sender.send_document(
+        bot_token = SAVE_DOCUMENT_ENDPOINT,
+        chat_id = CHAT_ID,
+        document = 'document text 🟥'.encode(),
+        filename = 'log.html',
+        caption = TEXT,
+        disable_notification = True,
+    )
+
+    data = telegram_server_json_hub.get_last_received_json()
+
+    assert data is not None
+    assert data['chat_id'] == str(CHAT_ID)
+    assert data['document'] == 'document text 🟥'
+    assert data['filename'] == 'log.html'
+    assert data['caption'] == TEXT
+    assert data['disable_notification'] == 'true'
+
 @pytest.mark.unit()
 def test_bad_request(sender: ITelegramSender) -> None:
     with pytest.raises(SenderError):
@@ -51,6 +77,18 @@ def test_bad_request(sender: ITelegramSender) -> None:
             text = TEXT,
         )
 
+@pytest.mark.unit()
+def test_retry_after(sender: ITelegramSender) -> None:
+    with pytest.raises(TelegramApiError) as exc_info:
+        sender.send(
+            bot_token = TOO_MANY_REQUESTS_ENDPOINT,
+            chat_id = CHAT_ID,
+            text = TEXT,
+        )
+
+    assert exc_info.value.error_code == 429
+    assert exc_info.value.retry_after == RETRY_AFTER
+
 @pytest.mark.unit()
 def test_http_error(sender: ITelegramSender) -> None:
     with pytest.raises(SenderError):
@@ -59,3 +97,27 @@ def test_http_error(sender: ITelegramSender) -> None:
             chat_id = CHAT_ID,
             text = TEXT,
         )
+
+@pytest.mark.unit()
+def test_keep_alive(telegram_server_json_hub: JsonHub, sender: ITelegramSender) -> None:
+    sender.send(bot_token=SAVE_JSON_ENDPOINT, chat_id=CHAT_ID, text=TEXT)
+    first_address = telegram_server_json_hub.get_last_client_address()
+
+    sender.send(bot_token=SAVE_JSON_ENDPOINT, chat_id=CHAT_ID, text=TEXT)
+    second_address = telegram_server_json_hub.get_last_client_address()
+
+    assert first_address == second_address
+
+@pytest.mark.unit()
+def test_send_after_close(telegram_server_json_hub: JsonHub, sender: ITelegramSender) -> None:
+    sender.send(bot_token=SAVE_JSON_ENDPOINT, chat_id=CHAT_ID, text=TEXT)
+    first_address = telegram_server_json_hub.get_last_client_address()
+
+    sender.close()
+
+    telegram_server_json_hub.reset_saved_json()
+    sender.send(bot_token=SAVE_JSON_ENDPOINT, chat_id=CHAT_ID, text=TEXT)
+    second_address = telegram_server_json_hub.get_last_client_address()
+
+    assert first_address != second_address
+    assert telegram_server_json_hub.get_last_received_json() is not None
@@ -0,0 +1,305 @@
+"""Test the `AsyncTelegramHandler`."""
+
+import asyncio
+import logging
+import threading
+from typing import Any, override
+
+import pytest
+
+from markup_tg_logger.async_handler import AsyncTelegramHandler
+from markup_tg_logger.deduplicator import RecordDeduplicator
+from markup_tg_logger.exceptions import SenderError
+from markup_tg_logger.interfaces import IAsyncTelegramSender
+from markup_tg_logger.message_splitters.base import BaseMessageSplitter
+
+
+BOT_TOKEN = 'test-bot-token'
+CHAT_IDS = ['chat-1', 'chat-2', 'chat-3']
+TEXT = '1234567890'
+
+
+class FakeAsyncSender(IAsyncTelegramSender):
+    """Sender that records messages and tracks the number of simultaneous requests."""
+
+    def __init__(self, failing_chat_id: str | None = None) -> None:
+        self.messages: list[tuple[int | str, str]] = []
+        self.active = 0
+        self.max_active = 0
+        self.closed = False
+        self._failing_chat_id = failing_chat_id
+
+    @override
+    async def send(
+        self,
+        bot_token: str,
+        chat_id: int | str,
+        text: str,
+        parse_mode: str = '',
+        disable_notification: bool = False,
+        **params: Any
+    ) -> None:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+
+        if chat_id == self._failing_chat_id:
+            raise SenderError('test error')
+
+        self.messages.append((chat_id, text))
+
+    @override
+    async def close(self) -> None:
+        self.closed = True
+
+
+def make_handler(sender: IAsyncTelegramSender, **kwargs: Any) -> AsyncTelegramHandler:
+    return AsyncTelegramHandler(
+        bot_token = BOT_TOKEN,
+        chat_id = CHAT_IDS,
+        sender = sender,
+        message_splitter_factory = {'': BaseMessageSplitter(max_message_length=4)},
+        **kwargs
+    )
+
+def make_record(msg: str = TEXT) -> logging.LogRecord:
+    return logging.makeLogRecord({'name': 'test_logger', 'levelno': logging.INFO, 'msg': msg})
+
+
+@pytest.mark.unit()
+def test_concurrent_delivery() -> None:
+    sender = FakeAsyncSender()
+    handler = make_handler(sender)
+
+    async def main() -> None:
+        handler.emit(make_record())
+        await handler.aclose()
+
+    asyncio.run(main())
+
+    assert sender.closed
+    assert sender.max_active == len(CHAT_IDS)
+
+    for chat_id in CHAT_IDS:
+        parts = [text for message_chat_id, text in sender.messages if message_chat_id == chat_id]
+        assert parts == ['1234', '5678', '90']
+
+@pytest.mark.unit()
+def test_max_concurrency() -> None:
+    sender = FakeAsyncSender()
+    handler = make_handler(sender, max_concurrency=2)
+
+    async def main() -> None:
+        for _ in range(5):
+            handler.emit(make_record())
+        await handler.aflush()
+
+    asyncio.run(main())
+
+    assert sender.max_active == 2
+    assert len(sender.messages) == 5 * 3 * len(CHAT_IDS)
+
+@pytest.mark.unit()
+def test_error_interrupts_mailing(monkeypatch: pytest.MonkeyPatch) -> None:
+    errors: list[logging.LogRecord] = []
+    sender = FakeAsyncSender(failing_chat_id=CHAT_IDS[0])
+    handler = make_handler(sender)
+    monkeypatch.setattr(handler, 'handleError', errors.append)
+
+    async def main() -> None:
+        handler.emit(make_record())
+        await handler.aflush()
+
+    asyncio.run(main())
+
+    assert len(errors) == 1
+    assert len(sender.messages) < 3 * (len(CHAT_IDS) - 1)
+
+@pytest.mark.unit()
+def test_force_send_on_exception() -> None:
+    sender = FakeAsyncSender(failing_chat_id=CHAT_IDS[0])
+    handler = make_handler(sender, force_send_on_exception=True)
+
+    async def main() -> None:
+        handler.emit(make_record())
+        await handler.aflush()
+
+    asyncio.run(main())
+
+    assert len(sender.messages) == 3 * (len(CHAT_IDS) - 1)
+
+@pytest.mark.unit()
+def test_emit_from_other_thread() -> None:
+    sender = FakeAsyncSender()
+
+    async def main() -> None:
+        handler = make_handler(sender, loop=asyncio.get_running_loop())
+
+        thread = threading.Thread(target=lambda: handler.emit(make_record()))
+        thread.start()
+        await asyncio.to_thread(thread.join)
+        await handler.aclose()
+
+    asyncio.run(main())
+
+    assert len(sender.messages) == 3 * len(CHAT_IDS)
+
+@pytest.mark.unit()
+def test_max_pending_drop_newest() -> None:
+    sender = FakeAsyncSender()
+    handler = make_handler(sender, max_pending=2, overflow_policy='drop_newest')
+
+    async def main() -> None:
+        for index in range(4):
+            handler.emit(make_record(str(index)))
+        await handler.aflush()
+
+    asyncio.run(main())
+
+    assert sorted({text for _, text in sender.messages}) == ['0', '1']
+    assert handler.dropped_count == 2
+
+@pytest.mark.unit()
+def test_max_pending_drop_oldest() -> None:
+    sender = FakeAsyncSender()
+    handler = make_handler(sender, max_pending=1, overflow_policy='drop_oldest')
+
+    async def main() -> None:
+        for index in range(3):
+            handler.emit(make_record(str(index)))
+        await handler.aflush()
+
+    asyncio.run(main())
+
+    assert {text for _, text in sender.messages} == {'2'}
+    assert handler.dropped_count == 2
+
+@pytest.mark.unit()
+def test_max_pending_block_in_loop_thread_drops() -> None:
+    sender = FakeAsyncSender()
+    handler = make_handler(sender, max_pending=1, overflow_policy='block')
+
+    async def main() -> None:
+        handler.emit(make_record('0'))
+        handler.emit(make_record('1'))
+        await handler.aflush()
+
+    asyncio.run(main())
+
+    assert {text for _, text in sender.messages} == {'0'}
+    assert handler.dropped_count == 1
+
+@pytest.mark.unit()
+def test_max_pending_block_from_other_thread() -> None:
+    sender = FakeAsyncSender()
+
+    async def main() -> None:
+        handler = make_handler(
+            sender,
+            loop = asyncio.get_running_loop(),
+            max_pending = 1,
+            overflow_policy = 'block',
+        )
+
+        def log_from_thread() -> None:
+            for index in range(3):
+                handler.handle(make_record(f't{index}'))
+
+        thread = threading.Thread(target=log_from_thread)
+        thread.start()
+
+        # Logging in the loop thread is not blocked by the waiting thread.
+        while thread.is_alive():
+            handler.handle(make_record('loop'))
+            await asyncio.sleep(0.01)
+
+        thread.join()
+        await handler.aclose()
+
+    asyncio.run(main())
+
+    assert {'t0', 't1', 't2'} <= {text for _, text in sender.messages}
+
+@pytest.mark.unit()
+def test_close_from_other_thread_waits_for_delivery() -> None:
+    sender = FakeAsyncSender()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+
+    try:
+        handler = make_handler(sender, loop=loop)
+        handler.emit(make_record())
+        handler.close()
+
+        assert len(sender.messages) == 3 * len(CHAT_IDS)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+@pytest.mark.unit()
+def test_flush_timeout() -> None:
+    release = asyncio.Event()
+
+    class StuckSender(FakeAsyncSender):
+        @override
+        async def send(self, *args: Any, **kwargs: Any) -> None:
+            await release.wait()
+            await super().send(*args, **kwargs)
+
+    sender = StuckSender()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+
+    try:
+        handler = make_handler(sender, loop=loop, flush_timeout=0.05)
+        handler.emit(make_record('1234'))
+        handler.flush()
+
+        assert sender.messages == []
+
+        # The deliveries are not cancelled by the timeout.
+        loop.call_soon_threadsafe(release.set)
+        asyncio.run_coroutine_threadsafe(handler.aflush(), loop).result()
+
+        assert len(sender.messages) == len(CHAT_IDS)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+@pytest.mark.unit()
+def test_deduplicator_summary_is_emitted_without_new_records() -> None:
+    sender = FakeAsyncSender()
+
+    async def main() -> None:
+        handler = make_handler(
+            sender,
+            deduplicator = RecordDeduplicator(window=0.05, summary_format='{count}'),
+        )
+
+        for _ in range(3):
+            handler.handle(make_record('1234'))
+
+        async with asyncio.timeout(5):
+            while len(sender.messages) < 2 * len(CHAT_IDS):
+                await asyncio.sleep(0.01)
+
+        await handler.aclose()
+
+    asyncio.run(main())
+
+    texts = sorted(text for _, text in sender.messages)
+
+    assert texts == ['1234'] * len(CHAT_IDS) + ['2'] * len(CHAT_IDS)
+
+@pytest.mark.unit()
+def test_invalid_max_pending() -> None:
+    with pytest.raises(ValueError):
+        make_handler(FakeAsyncSender(), max_pending=0)
+
+    with pytest.raises(ValueError):
+        make_handler(FakeAsyncSender(), overflow_policy='unknown')
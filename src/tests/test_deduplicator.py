@@ -0,0 +1,146 @@
+"""Test the `RecordDeduplicator`."""
+
+import logging
+from logging import LogRecord
+
+import pytest
+
+from markup_tg_logger.deduplicator import RecordDeduplicator
+
+
+WINDOW = 60
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def time(self) -> float:
+        return self.now
+
+
+def make_record(msg: str = 'error %s', args: tuple = (1, ), lineno: int = 10) -> LogRecord:
+    return logging.makeLogRecord({
+        'name': 'test_logger',
+        'levelno': logging.ERROR,
+        'levelname': 'ERROR',
+        'pathname': 'test.py',
+        'lineno': lineno,
+        'msg': msg,
+        'args': args,
+    })
+
+def make_deduplicator(clock: FakeClock, **params) -> RecordDeduplicator:
+    deduplicator = RecordDeduplicator(window=WINDOW, **params)
+    deduplicator._clock = clock.time
+
+    return deduplicator
+
+@pytest.mark.unit()
+def test_suppress_duplicates() -> None:
+    clock = FakeClock()
+    deduplicator = make_deduplicator(clock)
+
+    assert deduplicator.admit(make_record(args=(1, )))
+    assert not deduplicator.admit(make_record(args=(2, )))
+    assert not deduplicator.admit(make_record(args=(3, )))
+
+    assert deduplicator.admit(make_record(lineno=20))
+    assert deduplicator.admit(make_record(msg='other error'))
+
+@pytest.mark.unit()
+def test_summary_after_window() -> None:
+    clock = FakeClock()
+    deduplicator = make_deduplicator(clock, summary_format='{count} {seconds:.0f} {message}')
+
+    deduplicator.admit(make_record(args=(1, )))
+    clock.now = 10
+    deduplicator.admit(make_record(args=(2, )))
+    clock.now = 20
+    deduplicator.admit(make_record(args=(3, )))
+
+    assert deduplicator.pop_summaries() == []
+
+    clock.now = WINDOW
+    summaries = deduplicator.pop_summaries()
+
+    assert len(summaries) == 1
+    assert summaries[0].getMessage() == '2 20 error 3'
+    assert summaries[0].levelno == logging.ERROR
+    assert deduplicator.admit(make_record())
+
+@pytest.mark.unit()
+def test_summary_on_next_occurrence() -> None:
+    clock = FakeClock()
+    deduplicator = make_deduplicator(clock)
+
+    deduplicator.admit(make_record())
+    deduplicator.admit(make_record())
+
+    clock.now = WINDOW
+    assert deduplicator.admit(make_record())
+    assert len(deduplicator.pop_summaries()) == 1
+
+@pytest.mark.unit()
+def test_no_summary_without_duplicates() -> None:
+    clock = FakeClock()
+    deduplicator = make_deduplicator(clock)
+
+    deduplicator.admit(make_record())
+
+    assert deduplicator.pop_summaries(force=True) == []
+
+@pytest.mark.unit()
+def test_force_summaries() -> None:
+    clock = FakeClock()
+    deduplicator = make_deduplicator(clock)
+
+    deduplicator.admit(make_record())
+    deduplicator.admit(make_record())
+
+    assert len(deduplicator.pop_summaries(force=True)) == 1
+    assert deduplicator.admit(make_record())
+
+@pytest.mark.unit()
+def test_max_size() -> None:
+    clock = FakeClock()
+    deduplicator = make_deduplicator(clock, max_size=2)
+
+    deduplicator.admit(make_record(lineno=1))
+    deduplicator.admit(make_record(lineno=1))
+    deduplicator.admit(make_record(lineno=2))
+    deduplicator.admit(make_record(lineno=3))
+
+    # The oldest window is closed to make room for the new one.
+    assert len(deduplicator.pop_summaries()) == 1
+    assert deduplicator.admit(make_record(lineno=1))
+
+@pytest.mark.unit()
+def test_summary_delay() -> None:
+    clock = FakeClock()
+    deduplicator = make_deduplicator(clock, max_size=2)
+
+    deduplicator.admit(make_record(lineno=1))
+    assert deduplicator.get_summary_delay() is None
+
+    clock.now = 10
+    deduplicator.admit(make_record(lineno=2))
+    deduplicator.admit(make_record(lineno=2))
+    assert deduplicator.get_summary_delay() == WINDOW
+
+    clock.now = WINDOW + 20
+    assert deduplicator.get_summary_delay() == 0
+
+    # The window closed to make room for a new one has its summary ready.
+    clock.now = 20
+    deduplicator.admit(make_record(lineno=3))
+    deduplicator.admit(make_record(lineno=4))
+    assert deduplicator.get_summary_delay() == 0
+
+@pytest.mark.unit()
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        RecordDeduplicator(window=-1)
+
+    with pytest.raises(ValueError):
+        RecordDeduplicator(max_size=0)
@@ -0,0 +1,97 @@
+"""Test the `DocumentFallback`."""
+
+import logging
+
+import pytest
+
+from markup_tg_logger.delivery import DeliveryTask
+from markup_tg_logger.document_fallback import DocumentFallback
+from markup_tg_logger.types import ParseMode
+
+
+def make_task(
+    text: str = 'text',
+    parse_mode: ParseMode = '',
+    msg: str = 'message',
+) -> DeliveryTask:
+    record = logging.makeLogRecord({
+        'name': 'app',
+        'levelno': logging.ERROR,
+        'levelname': 'ERROR',
+        'msg': msg,
+    })
+
+    return DeliveryTask(
+        record = record,
+        text = text,
+        parse_mode = parse_mode,
+        disable_notification = False,
+    )
+
+@pytest.mark.unit()
+def test_exceeds_size() -> None:
+    fallback = DocumentFallback(max_bytes=8)
+
+    assert not fallback.exceeds_size('a' * 8)
+    assert fallback.exceeds_size('a' * 9)
+    assert not fallback.exceeds_size('🟥' * 2)
+    assert fallback.exceeds_size('🟥' * 2 + 'a')
+    assert not DocumentFallback().exceeds_size('a' * 10**6)
+
+@pytest.mark.unit()
+def test_exceeds_messages() -> None:
+    fallback = DocumentFallback(max_messages=2)
+
+    assert not fallback.exceeds_messages(2)
+    assert fallback.exceeds_messages(3)
+    assert not DocumentFallback(max_messages=None).exceeds_messages(100)
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    'parse_mode, filename',
+    [('HTML', 'log.html'), ('MarkdownV2', 'log.md'), ('Markdown', 'log.md'), ('', 'log.txt')],
+)
+def test_filename(parse_mode: ParseMode, filename: str) -> None:
+    document = DocumentFallback().make_document(make_task(parse_mode=parse_mode))
+
+    assert document.filename == filename
+
+@pytest.mark.unit()
+def test_document() -> None:
+    fallback = DocumentFallback(filename='error', caption_format='{levelname} {name}: {message}')
+    document = fallback.make_document(make_task(text='<b>🟥</b>', msg='first line\nsecond line'))
+
+    assert document.content == '<b>🟥</b>'.encode()
+    assert document.filename == 'error.txt'
+    assert document.caption == 'ERROR app: first line'
+
+@pytest.mark.unit()
+def test_caption_is_truncated() -> None:
+    fallback = DocumentFallback(caption_format='{message}', max_caption_length=5)
+
+    assert fallback.make_document(make_task(msg='a' * 5)).caption == 'a' * 5
+    assert fallback.make_document(make_task(msg='a' * 6)).caption == 'aaaa…'
+
+@pytest.mark.unit()
+def test_no_caption() -> None:
+    fallback = DocumentFallback(caption_format=None)
+
+    assert fallback.make_document(make_task()).caption == ''
+
+@pytest.mark.unit()
+@pytest.mark.parametrize('caption_format', ['{user_id}: {message}', '{0}', '{name.missing}'])
+def test_invalid_caption_format_falls_back_to_plain_caption(caption_format: str) -> None:
+    fallback = DocumentFallback(caption_format=caption_format)
+
+    assert fallback.make_document(make_task(msg='first line\nsecond line')).caption == (
+        'ERROR: first line'
+    )
+
+@pytest.mark.unit()
+def test_invalid_params() -> None:
+    with pytest.raises(ValueError):
+        DocumentFallback(max_messages=0)
+    with pytest.raises(ValueError):
+        DocumentFallback(max_bytes=0)
+    with pytest.raises(ValueError):
+        DocumentFallback(max_caption_length=1025)
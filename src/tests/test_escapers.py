@@ -0,0 +1,86 @@
+"""Test the escape functions."""
+
+import html
+
+import pytest
+
+from markup_tg_logger.escapers import (
+    HTML_SPECIAL_CHARS,
+    MARKDOWN_SPECIAL_CHARS,
+    MARKDOWN_V2_SPECIAL_CHARS,
+    escape_html,
+    escape_markdown,
+    escape_markdown_v2,
+    escape_markdown_v2_code,
+    escape_markdown_v2_link_url,
+)
+from markup_tg_logger.types import EscapeFunc
+
+
+@pytest.mark.unit()
+def test_escape_markdown_v2() -> None:
+    assert escape_markdown_v2('a_b*c.d\\e') == 'a\\_b\\*c\\.d\\\\e'
+
+@pytest.mark.unit()
+def test_escape_markdown_v2_all_special_chars() -> None:
+    text = MARKDOWN_V2_SPECIAL_CHARS
+
+    assert len(text) == 18
+    assert escape_markdown_v2(text) == ''.join('\\' + char for char in text)
+
+@pytest.mark.unit()
+def test_escape_markdown_v2_plain_text() -> None:
+    text = 'plain text 123'
+
+    assert escape_markdown_v2(text) == text
+
+@pytest.mark.unit()
+def test_escape_markdown_v2_code() -> None:
+    assert escape_markdown_v2_code('print(`a` + "\\n") # 1.0') == 'print(\\`a\\` + "\\\\n") # 1.0'
+
+@pytest.mark.unit()
+def test_escape_markdown_v2_link_url() -> None:
+    assert escape_markdown_v2_link_url('https://a.io/(x)') == 'https://a.io/(x\\)'
+
+@pytest.mark.unit()
+def test_escape_markdown_v2_code_backslash_before_backtick() -> None:
+    assert escape_markdown_v2_code('\\`') == '\\\\\\`'
+
+@pytest.mark.unit()
+def test_escape_markdown_v2_link_url_backslash() -> None:
+    assert escape_markdown_v2_link_url('a\\b)') == 'a\\\\b\\)'
+
+@pytest.mark.unit()
+@pytest.mark.parametrize('text', [
+    'a < b & c > d',
+    '&amp; &lt;',
+    '"quotes" and \'apostrophes\'',
+    HTML_SPECIAL_CHARS * 3,
+    'юникод <тег> 🙂',
+    '',
+])
+def test_escape_html_matches_html_escape(text: str) -> None:
+    assert escape_html(text) == html.escape(text, quote=False)
+
+@pytest.mark.unit()
+def test_escape_markdown() -> None:
+    assert escape_markdown('a_b*c`d[e]f.g\\h') == 'a\\_b\\*c\\`d\\[e]f.g\\h'
+
+@pytest.mark.unit()
+def test_escape_markdown_all_special_chars() -> None:
+    text = MARKDOWN_SPECIAL_CHARS
+
+    assert escape_markdown(text) == ''.join('\\' + char for char in text)
+
+@pytest.mark.unit()
+@pytest.mark.parametrize('escape_func', [
+    escape_html,
+    escape_markdown,
+    escape_markdown_v2,
+    escape_markdown_v2_code,
+    escape_markdown_v2_link_url,
+])
+def test_text_without_special_chars_is_returned_as_is(escape_func: EscapeFunc) -> None:
+    text = ''.join(['plain text ', '123'])
+
+    assert escape_func(text) is text
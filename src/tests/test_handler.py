@@ -1,15 +1,29 @@
 """Test the `TelegramHandler`."""
 
+from collections.abc import Iterator
+import io
 import logging
 from logging import LogRecord
+import sys
+import threading
+import time
 from typing import Any, override, Literal
 
 import pytest
 
+from markup_tg_logger.admissions import RateAdmission
+from markup_tg_logger.deduplicator import RecordDeduplicator
+from markup_tg_logger.delivery import DeliveryQueue
+from markup_tg_logger.document_fallback import DocumentFallback
+from markup_tg_logger.exceptions import DeliveryError, SenderError
 from markup_tg_logger.formatters.base import BaseMarkupFormatter
+from markup_tg_logger.formatters.html import HtmlFormatter
+from markup_tg_logger.formatters.traceback_budget import TracebackBudget
 from markup_tg_logger.handler import TelegramHandler
-from markup_tg_logger.interfaces import IMessageSplitter, ITelegramSender, INotifier
+from markup_tg_logger.interfaces import IAdmission, IMessageSplitter, ITelegramSender, INotifier
+from markup_tg_logger.message_splitters.base import BaseMessageSplitter
 from markup_tg_logger.message_splitters.factory import MessageSplitterFactory
+from markup_tg_logger.telegram_senders.http_client import HttpClientTelegramSender
 from markup_tg_logger.types import ParseMode
 
 
@@ -21,6 +35,7 @@ LEVEL = logging.INFO
 DISABLE_NOTIFICATION = True
 BOT_TOKEN = 'test-bot-token'
 CHAT_ID = 'test-chat-id'
+CHAT_IDS = ['chat-1', 'chat-2', 'chat-3']
 
 
 class FakeMessageSplitter(IMessageSplitter):
@@ -71,6 +86,9 @@ class FakeFormatter(BaseMarkupFormatter):
 class FakeSender(ITelegramSender):
     def __init__(self) -> None:
         self.received_data: dict = {}
+        self.texts: list[str] = []
+        self.documents: list[dict[str, Any]] = []
+        self.closed = False
 
     @override
     def send(
@@ -90,6 +108,32 @@ class FakeSender(ITelegramSender):
             'disable_notification': disable_notification,
             **params,
         }
+        self.texts.append(text)
+
+    @override
+    def send_document(
+        self,
+        bot_token: str,
+        chat_id: int | str,
+        document: bytes,
+        filename: str,
+        caption: str = '',
+        parse_mode: str = '',
+        disable_notification: bool = False,
+        **params: Any
+    ) -> None:
+        self.documents.append({
+            'chat_id': chat_id,
+            'document': document,
+            'filename': filename,
+            'caption': caption,
+            'parse_mode': parse_mode,
+            'disable_notification': disable_notification,
+        })
+
+    @override
+    def close(self) -> None:
+        self.closed = True
         
 
 @pytest.mark.unit()
@@ -124,6 +168,437 @@ def test_emit() -> None:
     assert data['disable_notification'] == DISABLE_NOTIFICATION
 
 
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    'fallback, is_document',
+    [
+        (DocumentFallback(max_messages=len(SPLITTED_TEXT)), False),
+        (DocumentFallback(max_messages=len(SPLITTED_TEXT) - 1), True),
+        (DocumentFallback(max_messages=None, max_bytes=len(FORMATTED_TEXT)), False),
+        (DocumentFallback(max_messages=None, max_bytes=len(FORMATTED_TEXT) - 1), True),
+    ],
+)
+def test_document_fallback(fallback: DocumentFallback, is_document: bool) -> None:
+    sender = FakeSender()
+
+    handler = TelegramHandler(
+        bot_token = BOT_TOKEN,
+        chat_id = CHAT_ID,
+        disable_notification = FakeNotifier(),
+        message_splitter_factory = FakeMessageSplitterFactory(),
+        sender = sender,
+        document_fallback = fallback,
+    )
+    handler.setFormatter(FakeFormatter())
+
+    record = logging.makeLogRecord({
+        'levelno': LEVEL,
+        'levelname': logging.getLevelName(LEVEL),
+        'msg': SOURCE_TEXT,
+    })
+    handler.emit(record)
+
+    if not is_document:
+        assert sender.texts == SPLITTED_TEXT
+        assert sender.documents == []
+        return
+
+    assert sender.texts == []
+    assert sender.documents == [{
+        'chat_id': CHAT_ID,
+        'document': FORMATTED_TEXT.encode(),
+        'filename': 'log.html',
+        'caption': f'INFO: {SOURCE_TEXT}',
+        'parse_mode': '',
+        'disable_notification': DISABLE_NOTIFICATION,
+    }]
+
+
+class StreamingMessageSplitter(FakeMessageSplitter):
+    def __init__(self, sender: FakeSender, count: int | None = None) -> None:
+        self.sender = sender
+        self.count = count
+        self.produced = 0
+
+    @override
+    def iter_split(self, text: str) -> Iterator[str]:
+        while self.count is None or self.produced < self.count:
+            # The previous message has already been sent.
+            assert len(self.sender.texts) in (0, self.produced)
+
+            self.produced += 1
+            yield f'part {self.produced}'
+
+
+@pytest.mark.unit()
+def test_emit_streams_messages() -> None:
+    sender = FakeSender()
+    splitter = StreamingMessageSplitter(sender, count=3)
+
+    handler = TelegramHandler(
+        bot_token = BOT_TOKEN,
+        chat_id = CHAT_ID,
+        message_splitter_factory = {PARSE_MODE: splitter},
+        sender = sender,
+    )
+    handler.setFormatter(FakeFormatter())
+
+    handler.emit(logging.makeLogRecord({'levelno': LEVEL, 'msg': SOURCE_TEXT}))
+
+    assert sender.texts == ['part 1', 'part 2', 'part 3']
+
+
+@pytest.mark.unit()
+def test_document_fallback_splits_limited_number_of_messages() -> None:
+    sender = FakeSender()
+    splitter = StreamingMessageSplitter(sender)
+
+    handler = TelegramHandler(
+        bot_token = BOT_TOKEN,
+        chat_id = CHAT_ID,
+        message_splitter_factory = {PARSE_MODE: splitter},
+        sender = sender,
+        document_fallback = DocumentFallback(max_messages=2),
+    )
+    handler.setFormatter(FakeFormatter())
+
+    handler.emit(logging.makeLogRecord({'levelno': LEVEL, 'msg': SOURCE_TEXT}))
+
+    assert splitter.produced == 3
+    assert sender.texts == []
+    assert len(sender.documents) == 1
+
+
+@pytest.mark.unit()
+def test_document_fallback_caption_with_missing_field() -> None:
+    sender = FakeSender()
+
+    handler = TelegramHandler(
+        bot_token = BOT_TOKEN,
+        chat_id = CHAT_ID,
+        message_splitter_factory = FakeMessageSplitterFactory(),
+        sender = sender,
+        document_fallback = DocumentFallback(max_messages=1, caption_format='{user_id}'),
+    )
+    handler.setFormatter(FakeFormatter())
+
+    handler.emit(logging.makeLogRecord({
+        'levelno': LEVEL,
+        'levelname': logging.getLevelName(LEVEL),
+        'msg': SOURCE_TEXT,
+    }))
+
+    assert [document['caption'] for document in sender.documents] == [f'INFO: {SOURCE_TEXT}']
+
+
+@pytest.mark.unit()
+def test_oversized_document_is_handled_as_sender_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    class SmallDocumentSender(HttpClientTelegramSender):
+        _MAX_DOCUMENT_SIZE = len(FORMATTED_TEXT) - 1
+
+    errors: list[BaseException | None] = []
+    handler = TelegramHandler(
+        bot_token = BOT_TOKEN,
+        chat_id = CHAT_ID,
+        message_splitter_factory = FakeMessageSplitterFactory(),
+        sender = SmallDocumentSender(),
+        document_fallback = DocumentFallback(max_messages=1),
+    )
+    handler.setFormatter(FakeFormatter())
+    monkeypatch.setattr(handler, 'handleError', lambda record: errors.append(sys.exc_info()[1]))
+
+    handler.emit(logging.makeLogRecord({
+        'levelno': LEVEL,
+        'levelname': logging.getLevelName(LEVEL),
+        'msg': SOURCE_TEXT,
+    }))
+
+    assert len(errors) == 1
+    assert isinstance(errors[0], SenderError)
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize('telegram_first', [True, False])
+def test_traceback_budget_does_not_affect_other_handlers(telegram_first: bool) -> None:
+    sender = FakeSender()
+
+    telegram_handler = TelegramHandler(
+        bot_token = BOT_TOKEN,
+        chat_id = CHAT_ID,
+        sender = sender,
+    )
+    telegram_handler.setFormatter(
+        HtmlFormatter(
+            fmt = '{message}',
+            style = '{',
+            traceback_budget = TracebackBudget(head_frames=1, tail_frames=1),
+        )
+    )
+
+    stream = io.StringIO()
+    stream_handler = logging.StreamHandler(stream)
+
+    logger = logging.getLogger(f'test_traceback_budget_{telegram_first}')
+    logger.propagate = False
+    handlers: list[logging.Handler] = [telegram_handler, stream_handler]
+    for handler in handlers if telegram_first else reversed(handlers):
+        logger.addHandler(handler)
+
+    def recurse(depth: int) -> None:
+        if depth == 0:
+            raise ValueError('error')
+
+        recurse(depth - 1)
+
+    try:
+        try:
+            recurse(10)
+        except ValueError:
+            exc_info = sys.exc_info()
+            logger.exception('text')
+    finally:
+        for handler in handlers:
+            logger.removeHandler(handler)
+
+    telegram_text = ''.join(sender.texts)
+    stream_text = stream.getvalue()
+
+    assert 'frames omitted' in telegram_text
+    assert telegram_text.count('  File "') == 2
+    assert stream_text == f'text\n{logging.Formatter().formatException(exc_info)}\n'
+
+
+@pytest.mark.unit()
+def test_emit_with_deduplicator() -> None:
+    sender = FakeSender()
+
+    handler = TelegramHandler(
+        bot_token = BOT_TOKEN,
+        chat_id = CHAT_ID,
+        sender = sender,
+        deduplicator = RecordDeduplicator(summary_format='Repeated {count} times: {message}'),
+    )
+
+    handler.setFormatter(logging.Formatter('%(message)s'))
+
+    for index in range(100):
+        record = logging.makeLogRecord({'msg': 'error %d', 'args': (index, )})
+        handler.handle(record)
+
+    assert sender.texts == ['error 0']
+
+    handler.close()
+
+    assert sender.texts == ['error 0', 'Repeated 99 times: error 99']
+
+
+@pytest.mark.unit()
+def test_deduplicator_summary_is_emitted_without_new_records() -> None:
+    sender = FakeSender()
+
+    handler = TelegramHandler(
+        bot_token = BOT_TOKEN,
+        chat_id = CHAT_ID,
+        sender = sender,
+        deduplicator = RecordDeduplicator(
+            window = 0.05,
+            summary_format = 'Repeated {count} times: {message}',
+        ),
+    )
+
+    handler.setFormatter(logging.Formatter('%(message)s'))
+
+    for index in range(3):
+        handler.handle(logging.makeLogRecord({'msg': 'error %d', 'args': (index, )}))
+
+    deadline = time.monotonic() + 5
+    while len(sender.texts) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert sender.texts == ['error 0', 'Repeated 2 times: error 2']
+
+    handler.close()
+
+    assert sender.texts == ['error 0', 'Repeated 2 times: error 2']
+
+
+class CountingFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__('%(message)s')
+        self.calls = 0
+
+    @override
+    def format(self, record: LogRecord) -> str:
+        self.calls += 1
+        return super().format(record)
+
+
+class ErrorAdmission(IAdmission):
+    @override
+    def admit(self, record: LogRecord) -> bool:
+        return record.levelno >= logging.ERROR
+
+
+@pytest.mark.unit()
+def test_emit_with_admission() -> None:
+    sender = FakeSender()
+    formatter = CountingFormatter()
+
+    handler = TelegramHandler(
+        bot_token = BOT_TOKEN,
+        chat_id = CHAT_ID,
+        sender = sender,
+        admission = [ErrorAdmission(), RateAdmission(max_records=2)],
+        deduplicator = RecordDeduplicator(),
+    )
+
+    handler.setFormatter(formatter)
+
+    for index in range(10):
+        handler.handle(logging.makeLogRecord({'msg': f'info {index}', 'levelno': logging.INFO}))
+        handler.handle(logging.makeLogRecord({'msg': f'error {index}', 'levelno': logging.ERROR}))
+
+    assert sender.texts == ['error 0', 'error 1']
+    assert formatter.calls == 2
+
+    handler.close()
+
+    assert sender.texts == ['error 0', 'error 1']
+
+
+@pytest.mark.unit()
+def test_emit_with_delivery_queue() -> None:
+    sender = FakeSender()
+
+    handler = TelegramHandler(
+        bot_token = BOT_TOKEN,
+        chat_id = CHAT_ID,
+        disable_notification = FakeNotifier(),
+        message_splitter_factory = FakeMessageSplitterFactory(),
+        sender = sender,
+        delivery_queue = DeliveryQueue(),
+    )
+
+    handler.setFormatter(FakeFormatter())
+    
+    record = logging.makeLogRecord({
+        'name': 'test_logger',
+        'levelno': logging.INFO,
+        'levelname': logging._levelToName[logging.INFO],
+        'msg': SOURCE_TEXT,
+    })
+
+    handler.emit(record)
+    handler.flush()
+
+    data = sender.received_data
+
+    assert data['text'] == SPLITTED_TEXT[1]
+    assert data['disable_notification'] == DISABLE_NOTIFICATION
+
+    handler.close()
+
+
+class ConcurrentFakeSender(ITelegramSender):
+    """Thread-safe sender that tracks the number of simultaneous requests."""
+
+    def __init__(self, failing_chat_id: str | None = None) -> None:
+        self.messages: list[tuple[int | str, str]] = []
+        self.active = 0
+        self.max_active = 0
+        self._failing_chat_id = failing_chat_id
+        self._lock = threading.Lock()
+
+    @override
+    def send(
+        self,
+        bot_token: str,
+        chat_id: int | str,
+        text: str,
+        parse_mode: str = '',
+        disable_notification: bool = False,
+        **params: Any
+    ) -> None:
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+        time.sleep(0.02)
+
+        with self._lock:
+            self.active -= 1
+
+        if chat_id == self._failing_chat_id:
+            raise SenderError('test error')
+
+        with self._lock:
+            self.messages.append((chat_id, text))
+
+
+def make_fan_out_handler(sender: ITelegramSender, **kwargs: Any) -> TelegramHandler:
+    return TelegramHandler(
+        bot_token = BOT_TOKEN,
+        chat_id = CHAT_IDS,
+        sender = sender,
+        message_splitter_factory = {'': BaseMessageSplitter(max_message_length=4)},
+        fan_out_workers = len(CHAT_IDS),
+        **kwargs
+    )
+
+@pytest.mark.unit()
+def test_fan_out() -> None:
+    sender = ConcurrentFakeSender()
+    handler = make_fan_out_handler(sender)
+
+    handler.emit(logging.makeLogRecord({'msg': '1234567890'}))
+    handler.close()
+
+    assert sender.max_active == len(CHAT_IDS)
+
+    for chat_id in CHAT_IDS:
+        parts = [text for message_chat_id, text in sender.messages if message_chat_id == chat_id]
+        assert parts == ['1234', '5678', '90']
+
+@pytest.mark.unit()
+def test_fan_out_error_interrupts_mailing(monkeypatch: pytest.MonkeyPatch) -> None:
+    errors: list[BaseException | None] = []
+    sender = ConcurrentFakeSender(failing_chat_id=CHAT_IDS[0])
+    handler = make_fan_out_handler(sender)
+    monkeypatch.setattr(handler, 'handleError', lambda record: errors.append(sys.exc_info()[1]))
+
+    handler.emit(logging.makeLogRecord({'msg': '1234567890'}))
+    handler.close()
+
+    assert len(errors) == 1
+    assert isinstance(errors[0], DeliveryError)
+    assert list(errors[0].errors) == [CHAT_IDS[0]]
+    assert len(sender.messages) < 3 * (len(CHAT_IDS) - 1)
+
+@pytest.mark.unit()
+def test_fan_out_force_send_on_exception(monkeypatch: pytest.MonkeyPatch) -> None:
+    errors: list[BaseException | None] = []
+    sender = ConcurrentFakeSender(failing_chat_id=CHAT_IDS[0])
+    handler = make_fan_out_handler(sender, force_send_on_exception=True)
+    monkeypatch.setattr(handler, 'handleError', lambda record: errors.append(sys.exc_info()[1]))
+
+    handler.emit(logging.makeLogRecord({'msg': '1234567890'}))
+    handler.close()
+
+    assert len(errors) == 1
+    assert isinstance(errors[0], DeliveryError)
+    assert len(sender.messages) == 3 * (len(CHAT_IDS) - 1)
+
+
+@pytest.mark.unit()
+def test_close_releases_sender() -> None:
+    sender = FakeSender()
+    handler = TelegramHandler(bot_token=BOT_TOKEN, chat_id=CHAT_ID, sender=sender)
+
+    handler.close()
+
+    assert sender.closed
+
+
 def test_init_from_valid_config() -> None:
     config: dict[str, Any] = {
         'bot_token': BOT_TOKEN,
@@ -140,9 +615,29 @@ def test_init_from_valid_config() -> None:
         'sender': {
             '()': 'markup_tg_logger.telegram_senders.requests.RequestsTelegramSender',
         },
+        'delivery_queue': {
+            '()': 'markup_tg_logger.delivery.DeliveryQueue',
+            'maxsize': 10,
+            'overflow_policy': 'drop_newest',
+        },
+        'deduplicator': {
+            '()': 'markup_tg_logger.RecordDeduplicator',
+            'window': 10,
+        },
+        'document_fallback': {
+            '()': 'markup_tg_logger.DocumentFallback',
+            'max_messages': 3,
+        },
+        'admission': [
+            {
+                '()': 'markup_tg_logger.RateAdmission',
+                'max_records': 10,
+                'bypass_level': 'ERROR',
+            },
+        ],
     }
 
-    TelegramHandler(**config)
+    TelegramHandler(**config).close()
 
 
 @pytest.mark.unit()
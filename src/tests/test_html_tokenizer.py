@@ -0,0 +1,102 @@
+"""Test the `tokenize_html()`."""
+
+import pytest
+
+from markup_tg_logger.exceptions import InvalidMarkupError
+from markup_tg_logger.html_tokenizer import HtmlTagContainer, tokenize_html
+
+
+@pytest.mark.unit()
+def test_tokens() -> None:
+    text = 'a <b>bold</b> c'
+
+    tokens = [(kind, text[start:end]) for kind, start, end, _ in tokenize_html(text)]
+
+    assert tokens == [
+        ('text', 'a '),
+        ('start_tag', '<b>'),
+        ('text', 'bold'),
+        ('end_tag', '</b>'),
+        ('text', ' c'),
+    ]
+
+@pytest.mark.unit()
+def test_no_markup() -> None:
+    assert [token[:3] for token in tokenize_html('text &lt; text')] == [('text', 0, 14)]
+    assert list(tokenize_html('')) == []
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    'tag_text, attrs',
+    [
+        ('<a href="https://x/?a=b">', (('href', 'https://x/?a=b'),)),
+        ('<a title="a > b">', (('title', 'a > b'),)),
+        ("<a title='two words'>", (('title', 'two words'),)),
+        ('<a href=url>', (('href', 'url'),)),
+        ('<blockquote expandable>', (('expandable', None),)),
+        ('<span  class = "tg-spoiler" >', (('class', 'tg-spoiler'),)),
+        (
+            '<pre><code class="language-python" data-x=\'1\' hidden>',
+            (('class', 'language-python'), ('data-x', '1'), ('hidden', None)),
+        ),
+    ],
+)
+def test_attributes(tag_text: str, attrs: tuple) -> None:
+    *_, tag_container = list(tokenize_html(tag_text))[-1]
+
+    assert tag_container is not None
+    assert tag_container.attrs == attrs
+
+@pytest.mark.unit()
+def test_end_tag() -> None:
+    ((kind, start, end, tag_container),) = tokenize_html('</code>')
+
+    assert (kind, start, end) == ('end_tag', 0, 7)
+    assert tag_container is not None
+    assert tag_container.tag_name == 'code'
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    'text',
+    ['a < b', 'a > b', '<>', '</>', '<a href="x>', 'a <<b>', '<b>>', '<b', 'a >< b'],
+)
+def test_invalid_markup(text: str) -> None:
+    with pytest.raises(InvalidMarkupError):
+        list(tokenize_html(text))
+
+@pytest.mark.unit()
+def test_tags_are_interned() -> None:
+    first = list(tokenize_html('<b>'))[0][3]
+    second = list(tokenize_html('text <b>'))[1][3]
+
+    assert first is second
+
+@pytest.mark.unit()
+def test_tag_container() -> None:
+    tag_container = HtmlTagContainer(
+        'a',
+        [('href', 'url'), ('title', 'say "hi"'), ('download', None)],
+    )
+
+    assert tag_container.start_tag == '<a href="url" title="say &quot;hi&quot;" download>'
+    assert tag_container.end_tag == '</a>'
+    assert tag_container.start_tag_length == len(tag_container.start_tag)
+    assert tag_container.end_tag_length == len(tag_container.end_tag)
+
+    with pytest.raises(AttributeError):
+        tag_container.extra = None # type: ignore[attr-defined]
+
+@pytest.mark.unit()
+def test_tag_with_greater_than_in_attribute_is_not_cached() -> None:
+    text = '<a title="a > b">x</a><a title="a > b">y</a>'
+
+    tokens = [(kind, text[start:end]) for kind, start, end, _ in tokenize_html(text)]
+
+    assert tokens == [
+        ('start_tag', '<a title="a > b">'),
+        ('text', 'x'),
+        ('end_tag', '</a>'),
+        ('start_tag', '<a title="a > b">'),
+        ('text', 'y'),
+        ('end_tag', '</a>'),
+    ]
@@ -1,4 +1,6 @@
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import json
 from socket import socket
 from socketserver import BaseServer
@@ -9,7 +11,12 @@ from urllib.parse import urlparse
 HOST = 'localhost'
 PORT = 8080
 SAVE_JSON_ENDPOINT = '/save-json'
+SAVE_DOCUMENT_ENDPOINT = '/save-document'
 BAD_REQUEST_ENDPOINT = '/bad-reqest'
+CLOSE_CONNECTION_ENDPOINT = '/close-connection'
+DROP_REQUEST_ENDPOINT = '/drop-request'
+TOO_MANY_REQUESTS_ENDPOINT = '/too-many-requests'
+RETRY_AFTER = 3
 
 _ENCODING = 'utf-8'
 _CONTENT_TYPE_HEADER = 'Content-type'
@@ -24,12 +31,37 @@ class JsonHub:
 
     def __init__(self) -> None:
         self._data: dict[str, Any] | None = None
+        self._client_address: _RetAddress = None
+        self._request_count = 0
 
     def set_received_json(self, data: dict[str, Any]) -> None:
         """Store the JSON received by the server inside a class."""
 
         self._data = data
 
+    def set_client_address(self, client_address: _RetAddress) -> None:
+        """Store the address of the client that made the last request."""
+
+        self._client_address = client_address
+
+    def count_request(self) -> None:
+        """Increase the number of requests received by the server."""
+
+        self._request_count += 1
+
+    def get_request_count(self) -> int:
+        """Get the number of requests received by the server since it was started."""
+
+        return self._request_count
+
+    def get_last_client_address(self) -> _RetAddress:
+        """Get the address of the client that made the last request.
+
+        Different addresses for two requests from the same client mean different connections.
+        """
+
+        return self._client_address
+
     def get_last_received_json(self, auto_reset: bool = True) -> dict[str, Any] | None:
         """Get the last saved JSON.
         
@@ -55,9 +87,24 @@ class MockTelegramHandler(BaseHTTPRequestHandler):
     Endpoints:
         - `SAVE_JSON_ENDPOINT`: Accepts a POST request and stores the submitted JSON,
            which can then be retrieved through the installed `JsonHub` instance. Response: 200.
+        - `SAVE_DOCUMENT_ENDPOINT`: Accepts a `multipart/form-data` POST request and stores its
+           fields as JSON. The uploaded file is stored as `document` (decoded text) and `filename`
+           fields. Response: 200.
         - `BAD_REQUEST_ENDPOINT`: Always returns 400 Bad Request.
+        - `CLOSE_CONNECTION_ENDPOINT`: Returns 200 and closes the keep-alive connection without
+           notifying the client, as the server does when an idle connection times out.
+        - `DROP_REQUEST_ENDPOINT`: Reads the request and closes the connection without a response,
+           as happens when the connection drops after the server has handled the request.
+        - `TOO_MANY_REQUESTS_ENDPOINT`: Always returns 429 Too Many Requests with `retry_after`
+           parameter equal to `RETRY_AFTER`, as Telegram does when flood limits are exceeded.
+
+    Uses HTTP/1.1, so connections are kept alive between requests. Nagle's algorithm is disabled,
+    otherwise a response body written after the headers waits for the delayed ACK of the client.
     """
 
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
     def __init__(
         self,
         request: _RequestType,
@@ -72,45 +119,105 @@ class MockTelegramHandler(BaseHTTPRequestHandler):
         """Process HTTP POST request and generate response."""
 
         path = urlparse(self.path).path
+        content_length = int(self.headers.get('Content-Length', 0))
+        post_data = self.rfile.read(content_length)
+
+        self._json_hub.set_client_address(self.client_address)
+        self._json_hub.count_request()
 
         if path == SAVE_JSON_ENDPOINT:
-            self._save_json()
+            self._save_json(post_data)
+        elif path == SAVE_DOCUMENT_ENDPOINT:
+            self._save_document(post_data)
         elif path == BAD_REQUEST_ENDPOINT:
             self._bad_request()
+        elif path == CLOSE_CONNECTION_ENDPOINT:
+            self._send_json(200, {'status': 'success'})
+            self.close_connection = True
+        elif path == DROP_REQUEST_ENDPOINT:
+            self.close_connection = True
+        elif path == TOO_MANY_REQUESTS_ENDPOINT:
+            self._too_many_requests()
         else:
-            self.send_response(404)
-            self.end_headers()
-            self.wfile.write(json.dumps({'error': 'Not Found'}).encode(_ENCODING))
+            self._send_json(404, {'error': 'Not Found'}, content_type=None)
 
-    def _save_json(self) -> None:
+    def _save_json(self, post_data: bytes) -> None:
         """Save JSON data from the request to `JsonHub` and generate a response."""
 
-        content_length = int(self.headers['Content-Length'])
-        post_data = self.rfile.read(content_length)
         try:
             json_data = json.loads(post_data.decode(_ENCODING))
             self._json_hub.set_received_json(json_data)
-            self.send_response(200)
-            self.send_header(_CONTENT_TYPE_HEADER, _CONTENT_TYPE_JSON)
-            self.end_headers()
-            self.wfile.write(json.dumps({'status': 'success'}).encode(_ENCODING))
+            self._send_json(200, {'status': 'success'})
         except json.JSONDecodeError:
-            self.send_response(400)
-            self.send_header(_CONTENT_TYPE_HEADER, _CONTENT_TYPE_JSON)
-            self.end_headers()
-            self.wfile.write(json.dumps({'error': 'Invalid JSON'}).encode(_ENCODING))
+            self._send_json(400, {'error': 'Invalid JSON'})
+
+    def _save_document(self, post_data: bytes) -> None:
+        """Save the fields of a multipart form to `JsonHub` and generate a response."""
+
+        content_type = self.headers.get('Content-Type', '')
+        message = BytesParser(policy=HTTP).parsebytes(
+            f'Content-Type: {content_type}\r\n\r\n'.encode(_ENCODING) + post_data
+        )
+
+        if not message.is_multipart():
+            self._bad_request()
+            return
+
+        data: dict[str, Any] = {}
+        for part in message.iter_parts():
+            name = part.get_param('name', header='content-disposition')
+            payload = part.get_payload(decode=True)
+            assert isinstance(name, str) and isinstance(payload, bytes)
+
+            data[name] = payload.decode(_ENCODING)
+            filename = part.get_filename()
+            if filename is not None:
+                data['filename'] = filename
+
+        self._json_hub.set_received_json(data)
+        self._send_json(200, {'status': 'success'})
 
     def _bad_request(self) -> None:
         """Generate HTTP BadRequest response."""
 
-        self.send_response(400)
-        self.send_header(_CONTENT_TYPE_HEADER, _CONTENT_TYPE_JSON)
+        self._send_json(400, {'error': 'Bad Request'})
+
+    def _too_many_requests(self) -> None:
+        """Generate Telegram Bot API flood control error response."""
+
+        self._send_json(429, {
+            'ok': False,
+            'error_code': 429,
+            'description': f'Too Many Requests: retry after {RETRY_AFTER}',
+            'parameters': {'retry_after': RETRY_AFTER},
+        })
+
+    def _send_json(
+        self,
+        status: int,
+        data: dict[str, Any],
+        content_type: str | None = _CONTENT_TYPE_JSON,
+    ) -> None:
+        """Send a response with JSON body and `Content-Length` header required by keep-alive."""
+
+        body = json.dumps(data).encode(_ENCODING)
+
+        self.send_response(status)
+        if content_type is not None:
+            self.send_header(_CONTENT_TYPE_HEADER, content_type)
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps({'error': 'Bad Request'}).encode(_ENCODING))
+        self.wfile.write(body)
+
 
+class MockTelegramServer(ThreadingHTTPServer):
+    """Simulated Telegram server for testing based on `http.server`.
+    
+    Each connection is handled in a separate thread, so idle keep-alive connections of one client
+    do not block other clients.
+    """
 
-class MockTelegramServer(HTTPServer):
-    """Simulated Telegram server for testing based on `http.server`."""
+    daemon_threads = True
 
     def __init__(
         self,